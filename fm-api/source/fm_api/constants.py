@@ -1,5 +1,5 @@
 #
-# Copyright (c) 2013-2024 Wind River Systems, Inc.
+# Copyright (c) 2013-2026 Wind River Systems, Inc.
 #
 # SPDX-License-Identifier: Apache-2.0
 #
@@ -624,6 +624,20 @@ FM_CLIENT_GET_FAULTS_BY_ID = "/usr/local/bin/fmClientCli -A "
 FM_CLIENT_CLEAR_ALL = "/usr/local/bin/fmClientCli -D "
 FM_CLIENT_STR_SEP = "###"
 
+# Client side alarm state cache (FaultAPIsCached): max cached alarms and
+# seconds after which an alarm id is re-read from the FM manager
+FM_CLIENT_CACHE_MAX_ENTRIES = 10000
+FM_CLIENT_CACHE_RESYNC_INTERVAL = 60
+
+# FaultBatcher: updates sent per message, seconds an update may wait for
+# more to join its batch, and updates queued before callers block
+FM_CLIENT_BATCH_MAX_SIZE = 100
+FM_CLIENT_BATCH_MAX_DELAY = 0.1
+FM_CLIENT_BATCH_MAX_PENDING = 1000
+
+# Alarms fetched per request by the iter_faults* generators
+FM_CLIENT_PAGE_SIZE = 500
+
 FM_UUID_INDEX = 0
 FM_ALARM_ID_INDEX = 1
 FM_ALARM_STATE_INDEX = 2
@@ -1,5 +1,5 @@
 #
-# Copyright (c) 2013-2025 Wind River Systems, Inc.
+# Copyright (c) 2013-2026 Wind River Systems, Inc.
 #
 # SPDX-License-Identifier: Apache-2.0
 #
@@ -10,14 +10,136 @@
 # Author:
 #
 
-import copy
+import atexit
+import bisect
+import collections
 from . import constants
+import itertools
+import logging
+import operator
+import os
 import six
 import fm_core  # pylint: disable=import-error
 import threading
+import time
 
+# fm_core serializes access to the FM manager socket itself and releases
+# the GIL while a request is in flight, so the API calls below do not
+# take this lock and independent calls from different threads overlap.
+# It is kept for callers that use it to order their own fm_api calls.
 fm_api_lock = threading.Lock()
 
+LOG = logging.getLogger(__name__)
+
+# Upper bounds of the call latency histogram buckets, in ms
+_LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+# fm_core functions that return None, rather than False, on failure
+_NONE_IS_FAILURE = ('set', 'set_async')
+
+
+class _CallStats(object):
+    """Latency and failure counters of the fm_core calls of the process"""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._logger = None
+
+    def record(self, name, elapsed, failed):
+        ms = elapsed * 1e3
+        with self._lock:
+            entry = self._calls.get(name)
+            if entry is None:
+                # calls, failures, total ms, max ms, histogram
+                entry = self._calls[name] = [
+                    0, 0, 0.0, 0.0, [0] * (len(_LATENCY_BUCKETS_MS) + 1)]
+            entry[0] += 1
+            if failed:
+                entry[1] += 1
+            entry[2] += ms
+            entry[3] = max(entry[3], ms)
+            entry[4][bisect.bisect_left(_LATENCY_BUCKETS_MS, ms)] += 1
+
+    def snapshot(self):
+        stats = {}
+        with self._lock:
+            for name, (calls, failures, total, peak,
+                       buckets) in self._calls.items():
+                histogram = dict(('<=%dms' % bound, count) for bound, count
+                                 in zip(_LATENCY_BUCKETS_MS, buckets))
+                histogram['>%dms' % _LATENCY_BUCKETS_MS[-1]] = buckets[-1]
+                stats[name] = {'calls': calls,
+                               'failures': failures,
+                               'avg_ms': total / calls,
+                               'max_ms': peak,
+                               'histogram': histogram}
+        return stats
+
+    def _log_periodically(self, interval, stop):
+        while not stop.wait(interval):
+            for name, entry in sorted(self.snapshot().items()):
+                LOG.info("fm_core.%s: calls %d failures %d avg %.1fms "
+                         "max %.1fms", name, entry['calls'],
+                         entry['failures'], entry['avg_ms'],
+                         entry['max_ms'])
+
+    def enable(self, log_interval=None):
+        self.enabled = True
+        if self._logger is not None:
+            self._logger.set()
+            self._logger = None
+        if log_interval:
+            self._logger = threading.Event()
+            thread = threading.Thread(target=self._log_periodically,
+                                      args=(log_interval, self._logger),
+                                      name='fm-api-stats')
+            thread.daemon = True
+            thread.start()
+
+    def disable(self):
+        self.enabled = False
+        if self._logger is not None:
+            self._logger.set()
+            self._logger = None
+
+
+_call_stats = _CallStats()
+
+
+def _core_call(name, *args, **kwargs):
+    func = getattr(fm_core, name)
+    if not _call_stats.enabled:
+        return func(*args, **kwargs)
+    start = time.monotonic()
+    failed = True
+    try:
+        result = func(*args, **kwargs)
+        failed = (result is False or
+                  (result is None and name in _NONE_IS_FAILURE))
+        return result
+    finally:
+        _call_stats.record(name, time.monotonic() - start, failed)
+
+
+def enable_stats(log_interval=None):
+    """Start counting calls, failures and latency of the fm_core calls
+
+    The counters are shared by every API object of the process, see
+    FaultAPIsBase.stats(). With log_interval, a summary is logged every
+    log_interval seconds. Setting FM_API_STATS_LOG_INTERVAL in the
+    environment enables the stats when the module is imported.
+    """
+    _call_stats.enable(log_interval)
+
+
+def disable_stats():
+    _call_stats.disable()
+
+
+if os.environ.get('FM_API_STATS_LOG_INTERVAL'):
+    enable_stats(float(os.environ['FM_API_STATS_LOG_INTERVAL']))
+
 
 class ClientException(Exception):
     pass
@@ -49,7 +171,27 @@ class APIException(Exception):
 # keep_existing_alarm: keep original alarm when creating an alarm that already exist
 #                      true/false, default to false
 # See CGCS FM Guide for the alarm model specification
+_FAULT_ATTRS = ('alarm_id', 'alarm_state', 'entity_type_id',
+                'entity_instance_id', 'severity', 'reason_text', 'alarm_type',
+                'probable_cause', 'proposed_repair_action',
+                'service_affecting', 'suppression', 'uuid', 'timestamp',
+                'inhibit_alarms', 'keep_existing_alarm')
+_get_fault_tuple = operator.attrgetter(
+    'uuid', 'alarm_id', 'alarm_state', 'entity_type_id', 'entity_instance_id',
+    'timestamp', 'severity', 'reason_text', 'alarm_type', 'probable_cause',
+    'proposed_repair_action', 'service_affecting', 'suppression',
+    'inhibit_alarms', 'keep_existing_alarm')
+
+
 class Fault(object):
+    """An alarm, as raised by a client or returned by the FM system
+
+    Faults compare and hash by (alarm_id, entity_instance_id), the key the
+    FM system uses to identify an active alarm; those two attributes should
+    not be changed while the Fault is used as a dict key or set member.
+    """
+
+    __slots__ = _FAULT_ATTRS
 
     def __init__(self, alarm_id, alarm_state, entity_type_id,
                  entity_instance_id, severity, reason_text,
@@ -57,15 +199,20 @@ class Fault(object):
                  service_affecting=False, suppression=False,
                  uuid=None, timestamp=None, inhibit_alarms=False,
                  keep_existing_alarm=False):
+        if six.PY2:
+            entity_type_id = self._unicode(entity_type_id)
+            entity_instance_id = self._unicode(entity_instance_id)
+            reason_text = self._unicode(reason_text)
+            proposed_repair_action = self._unicode(proposed_repair_action)
         self.alarm_id = alarm_id
         self.alarm_state = alarm_state
-        self.entity_type_id = self._unicode(entity_type_id)
-        self.entity_instance_id = self._unicode(entity_instance_id)
+        self.entity_type_id = entity_type_id
+        self.entity_instance_id = entity_instance_id
         self.severity = severity
-        self.reason_text = self._unicode(reason_text)
+        self.reason_text = reason_text
         self.alarm_type = alarm_type
         self.probable_cause = probable_cause
-        self.proposed_repair_action = self._unicode(proposed_repair_action)
+        self.proposed_repair_action = proposed_repair_action
         self.service_affecting = service_affecting
         self.suppression = suppression
         self.uuid = uuid
@@ -74,7 +221,47 @@ class Fault(object):
         self.keep_existing_alarm = keep_existing_alarm
 
     def as_dict(self):
-        return copy.copy(self.__dict__)
+        return {'alarm_id': self.alarm_id,
+                'alarm_state': self.alarm_state,
+                'entity_type_id': self.entity_type_id,
+                'entity_instance_id': self.entity_instance_id,
+                'severity': self.severity,
+                'reason_text': self.reason_text,
+                'alarm_type': self.alarm_type,
+                'probable_cause': self.probable_cause,
+                'proposed_repair_action': self.proposed_repair_action,
+                'service_affecting': self.service_affecting,
+                'suppression': self.suppression,
+                'uuid': self.uuid,
+                'timestamp': self.timestamp,
+                'inhibit_alarms': self.inhibit_alarms,
+                'keep_existing_alarm': self.keep_existing_alarm}
+
+    def as_tuple(self):
+        """Attribute values in fm_core field order (constants.FM_*_INDEX)
+
+        The tuple can be passed to fm_core in place of the Fault.
+        """
+        return _get_fault_tuple(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Fault):
+            return NotImplemented
+        return (self.alarm_id == other.alarm_id and
+                self.entity_instance_id == other.entity_instance_id)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash((self.alarm_id, self.entity_instance_id))
+
+    def __repr__(self):
+        return '<Fault alarm_id=%r entity_instance_id=%r severity=%r>' % (
+            self.alarm_id, self.entity_instance_id, self.severity)
 
     @staticmethod
     def _unicode(value):
@@ -85,6 +272,17 @@ class Fault(object):
 
 
 class FaultAPIsBase(object):
+    @staticmethod
+    def stats() -> dict:
+        """Get the fm_core call counters, see enable_stats()
+
+        :returns: dict keyed by fm_core function name, each with 'calls',
+                  'failures' (None/False returned, e.g. when the FM manager
+                  cannot be reached), 'avg_ms', 'max_ms' and a latency
+                  'histogram'; empty until enable_stats() is called
+        """
+        return _call_stats.snapshot()
+
     @staticmethod
     def _check_val(data):
         if data is None:
@@ -128,6 +326,46 @@ class FaultAPIsBase(object):
                          line[constants.FM_TIMESTAMP_INDEX])
             return data
 
+    @staticmethod
+    def _tuple_to_alarm(alarm_tuple):
+        # fm_core returns the fields in the same order and with the same
+        # values as the FM_CLIENT_STR_SEP separated string
+        if len(alarm_tuple) < constants.MAX_ALARM_ATTRIBUTES:
+            return None
+        return Fault(alarm_tuple[constants.FM_ALARM_ID_INDEX],
+                     alarm_tuple[constants.FM_ALARM_STATE_INDEX],
+                     alarm_tuple[constants.FM_ENT_TYPE_ID_INDEX],
+                     alarm_tuple[constants.FM_ENT_INST_ID_INDEX],
+                     alarm_tuple[constants.FM_SEVERITY_INDEX],
+                     alarm_tuple[constants.FM_REASON_TEXT_INDEX],
+                     alarm_tuple[constants.FM_ALARM_TYPE_INDEX],
+                     alarm_tuple[constants.FM_CAUSE_INDEX],
+                     alarm_tuple[constants.FM_REPAIR_ACTION_INDEX],
+                     alarm_tuple[constants.FM_SERVICE_AFFECTING_INDEX],
+                     alarm_tuple[constants.FM_SUPPRESSION_INDEX],
+                     alarm_tuple[constants.FM_UUID_INDEX],
+                     alarm_tuple[constants.FM_TIMESTAMP_INDEX])
+
+    def _iter_fault_pages(self, get_page, key, page_size, name):
+        # get_page: name of the fm_core paged get function
+        # Keyset paging: each page starts after the last alarm received,
+        # so a page is never skipped or repeated when alarms are raised or
+        # cleared in between
+        after = None
+        while True:
+            resp = _core_call(get_page, key, after=after, max=page_size,
+                              structured=True)
+            if resp is False:
+                raise APIException("Failed to execute %s." % name)
+            if not resp:
+                return
+            for alarm in resp:
+                yield self._tuple_to_alarm(alarm)
+            if len(resp) < page_size:
+                return
+            after = (resp[-1][constants.FM_ALARM_ID_INDEX],
+                     resp[-1][constants.FM_ENT_INST_ID_INDEX])
+
     @staticmethod
     def _check_required_attributes(data):
         if data.alarm_id is None:
@@ -186,115 +424,144 @@ class FaultAPIsBase(object):
 class FaultAPIs(FaultAPIsBase):
 
     def set_fault(self, data):
-        with fm_api_lock:
-            self._check_required_attributes(data)
-            self._validate_attributes(data)
-            buff = self._alarm_to_str(data)
-            try:
-                return fm_core.set(buff)
-            except (RuntimeError, SystemError, TypeError):
-                return None
+        self._check_required_attributes(data)
+        self._validate_attributes(data)
+        try:
+            return _core_call('set', data)
+        except (RuntimeError, SystemError, TypeError):
+            return None
 
     def set_faults(self, data):
-        buff_list = []
-        with fm_api_lock:
-            for alarm_data in data:
-                self._check_required_attributes(alarm_data)
-                self._validate_attributes(alarm_data)
-                buff = self._alarm_to_str(alarm_data)
-                buff_list.append(buff)
-            try:
-                return fm_core.set_fault_list(buff_list)
-            except (RuntimeError, SystemError, TypeError):
-                return None
+        alarm_list = []
+        for alarm_data in data:
+            self._check_required_attributes(alarm_data)
+            self._validate_attributes(alarm_data)
+            alarm_list.append(alarm_data)
+        try:
+            return _core_call('set_fault_list', alarm_list)
+        except (RuntimeError, SystemError, TypeError):
+            return None
 
     def clear_fault(self, alarm_id, entity_instance_id):
-        with fm_api_lock:
-            sep = constants.FM_CLIENT_STR_SEP
-            buff = (sep + self._check_val(alarm_id) + sep +
-                    self._check_val(entity_instance_id) + sep)
-            try:
-                resp = fm_core.clear(buff)
-                # resp may be True/False/None after FaultAPIsV2
-                #  implementation.
-                # To keep FaultAPIs the same as before,
-                #  return False for None case.
-                if resp is True:
-                    return True
-                else:
-                    return False
-            except (RuntimeError, SystemError, TypeError):
+        try:
+            resp = _core_call('clear', alarm_id, entity_instance_id)
+            # resp may be True/False/None after FaultAPIsV2
+            #  implementation.
+            # To keep FaultAPIs the same as before,
+            #  return False for None case.
+            if resp is True:
+                return True
+            else:
                 return False
+        except (RuntimeError, SystemError, TypeError):
+            return False
 
     def get_fault(self, alarm_id, entity_instance_id):
-        with fm_api_lock:
-            sep = constants.FM_CLIENT_STR_SEP
-            buff = (sep + self._check_val(alarm_id) + sep +
-                    self._check_val(entity_instance_id) + sep)
-            try:
-                resp = fm_core.get(buff)
-                if resp:
-                    return self._str_to_alarm(resp)
-            except (RuntimeError, SystemError, TypeError):
-                pass
-            return None
+        try:
+            resp = _core_call('get', alarm_id, entity_instance_id,
+                              structured=True)
+            if resp:
+                return self._tuple_to_alarm(resp)
+        except (RuntimeError, SystemError, TypeError):
+            pass
+        return None
 
     def clear_all(self, entity_instance_id):
-        with fm_api_lock:
-            try:
-                resp = fm_core.clear_all(entity_instance_id)
-                # resp may be True/False/None after FaultAPIsV2
-                #  implementation.
-                # To keep FaultAPIs the same as before,
-                #  return False for None case.
-                if resp is True:
-                    return True
-                else:
-                    return False
-            except (RuntimeError, SystemError, TypeError):
+        try:
+            resp = _core_call('clear_all', entity_instance_id)
+            # resp may be True/False/None after FaultAPIsV2
+            #  implementation.
+            # To keep FaultAPIs the same as before,
+            #  return False for None case.
+            if resp is True:
+                return True
+            else:
                 return False
+        except (RuntimeError, SystemError, TypeError):
+            return False
 
     def get_faults(self, entity_instance_id):
-        with fm_api_lock:
-            try:
-                resp = fm_core.get_by_eid(entity_instance_id)
-                if resp:
-                    data = []
-                    for i in resp:
-                        data.append(self._str_to_alarm(i))
-                    return data
-            except (RuntimeError, SystemError, TypeError):
-                pass
-            return None
+        try:
+            resp = _core_call('get_by_eid', entity_instance_id,
+                              structured=True)
+            if resp:
+                data = []
+                for i in resp:
+                    data.append(self._tuple_to_alarm(i))
+                return data
+        except (RuntimeError, SystemError, TypeError):
+            pass
+        return None
 
     def get_faults_by_id_n_eid(self, alarm_id, entity_instance_id):
-        with fm_api_lock:
-            sep = constants.FM_CLIENT_STR_SEP
-            buff = (sep + self._check_val(alarm_id) + sep +
-                    self._check_val(entity_instance_id) + sep)
-            try:
-                resp = fm_core.get_by_id_n_eid(buff)
-                if resp:
-                    data = []
-                    for i in resp:
-                        data.append(self._str_to_alarm(i))
-                    return data
-            except (RuntimeError, SystemError, TypeError):
-                pass
-            return None
+        try:
+            resp = _core_call('get_by_id_n_eid', alarm_id,
+                              entity_instance_id, structured=True)
+            if resp:
+                data = []
+                for i in resp:
+                    data.append(self._tuple_to_alarm(i))
+                return data
+        except (RuntimeError, SystemError, TypeError):
+            pass
+        return None
 
     def get_faults_by_id(self, alarm_id):
-        with fm_api_lock:
-            try:
-                resp = fm_core.get_by_aid(alarm_id)
-                if resp:
-                    data = []
-                    for i in resp:
-                        data.append(self._str_to_alarm(i))
-                    return data
-            except (RuntimeError, SystemError, TypeError):
-                pass
-            return None
+        try:
+            resp = _core_call('get_by_aid', alarm_id, structured=True)
+            if resp:
+                data = []
+                for i in resp:
+                    data.append(self._tuple_to_alarm(i))
+                return data
+        except (RuntimeError, SystemError, TypeError):
+            pass
+        return None
+
+    @staticmethod
+    def _iter_faults_once_started(faults):
+        # Like the get methods, yield nothing if the first page fails. A
+        # failure past the first page is raised, so that a partial result
+        # is not taken for a complete one.
+        started = False
+        try:
+            for fault in faults:
+                started = True
+                yield fault
+        except (APIException, RuntimeError, SystemError, TypeError):
+            if started:
+                raise
+
+    def iter_faults(self, entity_instance_id,
+                    page_size=constants.FM_CLIENT_PAGE_SIZE):
+        return self._iter_faults_once_started(self._iter_fault_pages(
+            'get_by_eid_page', entity_instance_id, page_size,
+            'iter_faults'))
+
+    def iter_faults_by_id(self, alarm_id,
+                          page_size=constants.FM_CLIENT_PAGE_SIZE):
+        return self._iter_faults_once_started(self._iter_fault_pages(
+            'get_by_aid_page', alarm_id, page_size, 'iter_faults_by_id'))
+
+    def get_faults_bulk(self, entity_instance_ids):
+        try:
+            resp = _core_call('get_by_eids', list(entity_instance_ids),
+                              structured=True)
+            if resp:
+                return [self._tuple_to_alarm(i) for i in resp]
+        except (RuntimeError, SystemError, TypeError):
+            pass
+        return None
+
+    def get_faults_by_ids(self, alarm_ids):
+        try:
+            resp = _core_call('get_by_aids', list(alarm_ids),
+                              structured=True)
+            if resp:
+                return [self._tuple_to_alarm(i) for i in resp]
+        except (RuntimeError, SystemError, TypeError):
+            pass
+        return None
 
 
 class FaultAPIsV2(FaultAPIsBase):
@@ -304,11 +571,9 @@ class FaultAPIsV2(FaultAPIsBase):
     # Exception: 1. Input Alarm format is not valid
     #            2. When there is operation failure
     def set_fault(self, data):
-        with fm_api_lock:
-            self._check_required_attributes(data)
-            self._validate_attributes(data)
-            buff = self._alarm_to_str(data)
-            uuid = fm_core.set(buff)
+        self._check_required_attributes(data)
+        self._validate_attributes(data)
+        uuid = _core_call('set', data)
         if uuid is None:
             raise APIException("Failed to execute set_fault.")
         return uuid
@@ -318,99 +583,149 @@ class FaultAPIsV2(FaultAPIsBase):
     #         Alarm doesn't exist: False
     # Exception: When there is operation failure
     def clear_fault(self, alarm_id, entity_instance_id):
-        with fm_api_lock:
-            sep = constants.FM_CLIENT_STR_SEP
-            buff = (sep + self._check_val(alarm_id) + sep +
-                    self._check_val(entity_instance_id) + sep)
-            resp = fm_core.clear(buff)
-            if resp is False:
-                # There is operation failure
-                raise APIException("Failed to execute clear_fault.")
-            elif resp is None:
-                # alarm is not found
-                return False
-            else:
-                return True
+        resp = _core_call('clear', alarm_id, entity_instance_id)
+        if resp is False:
+            # There is operation failure
+            raise APIException("Failed to execute clear_fault.")
+        elif resp is None:
+            # alarm is not found
+            return False
+        else:
+            return True
 
     # Input: alarm_id, entity_instance_id
     # Return: Success: Alarm
     #         Alarm doesn't exist: None
     # Exception: When there is operation failure
     def get_fault(self, alarm_id, entity_instance_id):
-        with fm_api_lock:
-            sep = constants.FM_CLIENT_STR_SEP
-            buff = (sep + self._check_val(alarm_id) + sep +
-                    self._check_val(entity_instance_id) + sep)
-            resp = fm_core.get(buff)
-            if resp is False:
-                raise APIException("Failed to execute get_fault.")
-            else:
-                return self._str_to_alarm(resp) if resp else None
+        resp = _core_call('get', alarm_id, entity_instance_id,
+                          structured=True)
+        if resp is False:
+            raise APIException("Failed to execute get_fault.")
+        else:
+            return self._tuple_to_alarm(resp) if resp else None
 
     # Input: entity_instance_id
     # Return: Success: True
     #         Alarm doesn't exist: False
     # Exception: When there is operation failure
     def clear_all(self, entity_instance_id):
-        with fm_api_lock:
-            resp = fm_core.clear_all(entity_instance_id)
-            if resp is False:
-                # There is operation failure
-                raise APIException("Failed to execute clear_all.")
-            elif resp is None:
-                # alarm is not found
-                return False
-            else:
-                return True
+        resp = _core_call('clear_all', entity_instance_id)
+        if resp is False:
+            # There is operation failure
+            raise APIException("Failed to execute clear_all.")
+        elif resp is None:
+            # alarm is not found
+            return False
+        else:
+            return True
 
     # Input: entity_instance_id
     # Return: Success: Alarm list
     #         Alarm doesn't exist: None
     # Exception: When there is operation failure
     def get_faults(self, entity_instance_id):
-        with fm_api_lock:
-            resp = fm_core.get_by_eid(entity_instance_id)
-            if resp is False:
-                raise APIException("Failed to execute get_faults.")
-            elif resp:
-                data = []
-                for i in resp:
-                    data.append(self._str_to_alarm(i))
-                return data
-            else:
-                return None
+        resp = _core_call('get_by_eid', entity_instance_id,
+                          structured=True)
+        if resp is False:
+            raise APIException("Failed to execute get_faults.")
+        elif resp:
+            data = []
+            for i in resp:
+                data.append(self._tuple_to_alarm(i))
+            return data
+        else:
+            return None
 
     # Input: alarm_id
     # Return: Success: Alarm list
     #         Alarm doesn't exist: None
     # Exception: When there is operation failure
     def get_faults_by_id(self, alarm_id):
-        with fm_api_lock:
-            resp = fm_core.get_by_aid(alarm_id)
-            if resp is False:
-                raise APIException("Failed to execute get_faults_by_id.")
-            elif resp:
-                data = []
-                for i in resp:
-                    data.append(self._str_to_alarm(i))
-                return data
-            else:
-                return None
+        resp = _core_call('get_by_aid', alarm_id, structured=True)
+        if resp is False:
+            raise APIException("Failed to execute get_faults_by_id.")
+        elif resp:
+            data = []
+            for i in resp:
+                data.append(self._tuple_to_alarm(i))
+            return data
+        else:
+            return None
+
+    def iter_faults(self, entity_instance_id: str,
+                    page_size: int = constants.FM_CLIENT_PAGE_SIZE):
+        """Iterate over the alarms of an entity, page_size at a time
+
+        Yields the same alarms as get_faults(), ordered by entity instance
+        id and alarm id, fetching page_size alarms per request, so memory
+        use does not grow with the number of alarms.
+
+        :raises APIException: when a page cannot be fetched
+        """
+        return self._iter_fault_pages('get_by_eid_page',
+                                      entity_instance_id, page_size,
+                                      'iter_faults')
+
+    def iter_faults_by_id(self, alarm_id: str,
+                          page_size: int = constants.FM_CLIENT_PAGE_SIZE):
+        """Iterate over the alarms of an alarm id, page_size at a time
+
+        Paged variant of get_faults_by_id(), see iter_faults().
+
+        :raises APIException: when a page cannot be fetched
+        """
+        return self._iter_fault_pages('get_by_aid_page', alarm_id,
+                                      page_size, 'iter_faults_by_id')
+
+    def get_faults_bulk(self, entity_instance_ids: list[str]) -> list[Fault]:
+        """Get the alarms of several entities with a single request
+
+        Returns the alarms get_faults() returns for any of the entity
+        instance ids, each alarm once, with one round trip and one DB query.
+
+        :param entity_instance_ids: list of entity instance ids
+        :returns: list of Fault, or None if no alarm was found
+        """
+        resp = _core_call('get_by_eids', list(entity_instance_ids),
+                          structured=True)
+        if resp is False:
+            raise APIException("Failed to execute get_faults_bulk.")
+        elif resp:
+            return [self._tuple_to_alarm(i) for i in resp]
+        else:
+            return None
+
+    def get_faults_by_ids(self, alarm_ids: list[str]) -> list[Fault]:
+        """Get the alarms of several alarm ids with a single request
+
+        Returns the same alarms as get_faults_by_id() called for each alarm
+        id, with one round trip and one DB query.
+
+        :param alarm_ids: list of alarm ids
+        :returns: list of Fault, or None if no alarm was found
+        """
+        resp = _core_call('get_by_aids', list(alarm_ids),
+                          structured=True)
+        if resp is False:
+            raise APIException("Failed to execute get_faults_by_ids.")
+        elif resp:
+            return [self._tuple_to_alarm(i) for i in resp]
+        else:
+            return None
 
     def set_faults(self, data: list[Fault]) -> bool:
         """Set a list of provided faults
 
         :param data: list of Fault objects
         """
-        buff_list = []
+        alarm_list = []
         for alarm_data in data:
             self._check_required_attributes(alarm_data)
             self._validate_attributes(alarm_data)
-            buff = self._alarm_to_str(alarm_data)
-            buff_list.append(buff)
+            alarm_list.append(alarm_data)
 
-        with fm_api_lock:
-            resp = fm_core.set_fault_list(buff_list)
+        resp = _core_call('set_fault_list', alarm_list)
         if resp is False:
             raise APIException("Failed to execute set_faults.")
         return resp
@@ -420,13 +735,556 @@ class FaultAPIsV2(FaultAPIsBase):
 
         :param faults_list: list of tuples (alarm_id, entity_instance_id)
         """
-        buff_list = []
-        sep = constants.FM_CLIENT_STR_SEP
-        for alarm_id, entity_instance_id in faults_list:
-            buff_list.append(sep + self._check_val(alarm_id) + sep +
-                             self._check_val(entity_instance_id) + sep)
-        with fm_api_lock:
-            resp = fm_core.clear_list(buff_list)
+        filter_list = [(alarm_id, entity_instance_id)
+                       for alarm_id, entity_instance_id in faults_list]
+        resp = _core_call('clear_list', filter_list)
         if resp is False:
             raise APIException("Failed to execute clear_faults_list.")
         return resp
+
+
+class FaultAPIsAsync(FaultAPIsV2):
+    """Fire-and-forget variant of FaultAPIsV2
+
+    set_fault, clear_fault and clear_all only queue the request inside
+    fm_core and return without waiting for the FM manager; a background
+    thread in fm_core sends the queued requests in order, reconnecting and
+    retrying as needed. A get issued right after a queued request may not
+    see its effect yet. The remaining methods are synchronous, as in
+    FaultAPIsV2.
+    """
+
+    # Input: alarm data
+    # Return: Success: uuid assigned to the queued alarm
+    #         Request queue is full: None
+    # Exception: Input Alarm format is not valid
+    def set_fault(self, data):
+        self._check_required_attributes(data)
+        self._validate_attributes(data)
+        return _core_call('set_async', data)
+
+    # Input: alarm_id, entity_instance_id
+    # Return: Success: True
+    #         Request queue is full: False
+    def clear_fault(self, alarm_id, entity_instance_id):
+        return _core_call('clear_async', alarm_id, entity_instance_id)
+
+    # Input: entity_instance_id
+    # Return: Success: True
+    #         Request queue is full: False
+    def clear_all(self, entity_instance_id):
+        return _core_call('clear_all_async', entity_instance_id)
+
+    def get_queue_stats(self) -> dict:
+        """Get the counters of the fm_core async request queue
+
+        The queue is shared by every FaultAPIsAsync instance in the process.
+
+        :returns: dict with 'pending' (waiting in the queue), 'enqueued',
+                  'sent' (acknowledged by the FM manager) and 'dropped'
+                  (rejected because the queue was full)
+        """
+        stats = fm_core.async_stats()
+        if stats is None:
+            raise APIException("Failed to execute get_queue_stats.")
+        return stats
+
+
+def _alarm_text(value):
+    # fm_core sends None as " "
+    return " " if value is None else value
+
+
+def _alarm_flag(value):
+    # fmManager reads "True" and "t" as true and any other string as false
+    if isinstance(value, six.string_types):
+        return value in ('True', 't')
+    return bool(value)
+
+
+def _alarm_content(data):
+    """The fields of an alarm that a re-set can change"""
+    return (data.alarm_state, data.entity_type_id, data.severity,
+            _alarm_text(data.reason_text), data.alarm_type,
+            data.probable_cause, _alarm_text(data.proposed_repair_action),
+            _alarm_flag(data.service_affecting),
+            _alarm_flag(data.suppression),
+            _alarm_flag(data.inhibit_alarms))
+
+
+class AlarmStateCache(object):
+    """Last known state of the alarms handled by FaultAPIsCached
+
+    Entries are keyed by (alarm_id, entity_instance_id) and hold the uuid
+    and content of an active alarm, or None for an alarm known to be clear.
+    The least recently used entries are evicted beyond max_entries. Every
+    alarm id is re-read from the FM manager with get_faults_by_id once its
+    entries are older than resync_interval seconds, so changes made by other
+    clients are picked up within that interval.
+    """
+
+    def __init__(self, max_entries=constants.FM_CLIENT_CACHE_MAX_ENTRIES,
+                 resync_interval=constants.FM_CLIENT_CACHE_RESYNC_INTERVAL):
+        self.max_entries = max_entries
+        self.resync_interval = resync_interval
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        # alarm_id -> set of the entity_instance_ids of its entries
+        self._by_alarm_id = {}
+        # alarm_id -> time.monotonic() of its last complete resync
+        self._synced = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._resyncs = 0
+
+    def _store(self, key, value):
+        """Store an entry, and return the alarm ids of the evicted entries"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._by_alarm_id.setdefault(key[0], set()).add(key[1])
+        evicted = set()
+        while len(self._entries) > self.max_entries:
+            old_key, entry = self._entries.popitem(last=False)
+            self._discard(old_key)
+            self._evictions += 1
+            evicted.add(old_key[0])
+            if entry is not None:
+                # The entries of the alarm id no longer hold all its active
+                # alarms, which check_clear relies on
+                self._synced.pop(old_key[0], None)
+        return evicted
+
+    def _discard(self, key):
+        entity_instance_ids = self._by_alarm_id.get(key[0])
+        if entity_instance_ids is not None:
+            entity_instance_ids.discard(key[1])
+            if not entity_instance_ids:
+                del self._by_alarm_id[key[0]]
+
+    def _remove(self, key):
+        if self._entries.pop(key, False) is not False:
+            self._discard(key)
+
+    def _keys(self, alarm_id, prefix=None):
+        # The keys of alarm_id, or of those of its entity instance ids that
+        # start with prefix
+        return [(alarm_id, entity_instance_id) for entity_instance_id
+                in self._by_alarm_id.get(alarm_id, ())
+                if prefix is None or entity_instance_id.startswith(prefix)]
+
+    def _has_active(self, alarm_id, entity_instance_id):
+        # Whether an alarm that clear_fault(alarm_id, entity_instance_id)
+        # would clear is known to be active
+        return any(self._entries[key] is not None
+                   for key in self._keys(alarm_id, entity_instance_id))
+
+    def needs_resync(self, alarm_id):
+        with self._lock:
+            synced = self._synced.get(alarm_id)
+        return (synced is None or
+                time.monotonic() - synced >= self.resync_interval)
+
+    def resync(self, alarm_id, faults, entity_instance_id=None):
+        """Replace the entries of alarm_id with the active faults
+
+        The alarm id is only marked as synced if none of its entries had to
+        be evicted to make room for the faults.
+
+        :param faults: list of Fault returned by get_faults_by_id, or None
+        :param entity_instance_id: also record this instance as clear if
+                                   it is not among the faults
+        """
+        with self._lock:
+            for key in self._keys(alarm_id):
+                self._entries[key] = None
+            evicted = False
+            for fault in faults or ():
+                evicted |= alarm_id in self._store(
+                    (alarm_id, fault.entity_instance_id),
+                    (fault.uuid, _alarm_content(fault)))
+            key = (alarm_id, entity_instance_id)
+            if (entity_instance_id is not None and
+                    key not in self._entries and
+                    not self._has_active(alarm_id, entity_instance_id)):
+                evicted |= alarm_id in self._store(key, None)
+            if evicted:
+                self._synced.pop(alarm_id, None)
+            else:
+                self._synced[alarm_id] = time.monotonic()
+            self._resyncs += 1
+
+    def check_set(self, data):
+        """Return the uuid if data is already the active alarm, else None"""
+        key = (data.alarm_id, data.entity_instance_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == _alarm_content(data):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+            return None
+
+    def check_clear(self, alarm_id, entity_instance_id):
+        """Return True if the alarm is known to be clear
+
+        fmManager clears every alarm of alarm_id whose entity_instance_id
+        starts with the given one, so the clear is only answered locally if
+        the entries of alarm_id are complete and none of those is known to
+        be active.
+        """
+        key = (alarm_id, entity_instance_id)
+        with self._lock:
+            if (alarm_id in self._synced and
+                    key in self._entries and self._entries[key] is None and
+                    not self._has_active(alarm_id, entity_instance_id)):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return True
+            self._misses += 1
+            return False
+
+    def set(self, data, uuid):
+        with self._lock:
+            self._store((data.alarm_id, data.entity_instance_id),
+                        (uuid, _alarm_content(data)))
+
+    def clear(self, alarm_id, entity_instance_id):
+        # fmManager clears every alarm of alarm_id whose entity_instance_id
+        # starts with the given one
+        with self._lock:
+            if entity_instance_id:
+                for key in self._keys(alarm_id, entity_instance_id):
+                    self._entries[key] = None
+            self._store((alarm_id, entity_instance_id), None)
+
+    def invalidate(self, alarm_id, entity_instance_id):
+        with self._lock:
+            self._remove((alarm_id, entity_instance_id))
+
+    def invalidate_entity(self, entity_instance_id):
+        # clear_all removes every alarm whose entity_instance_id starts
+        # with the given one
+        with self._lock:
+            for alarm_id in list(self._by_alarm_id):
+                for key in self._keys(alarm_id, entity_instance_id):
+                    self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries),
+                    'hits': self._hits,
+                    'misses': self._misses,
+                    'evictions': self._evictions,
+                    'resyncs': self._resyncs}
+
+
+_alarm_state_cache = AlarmStateCache()
+
+
+class FaultAPIsCached(FaultAPIsV2):
+    """FaultAPIsV2 that skips set/clear requests with no effect
+
+    A set_fault identical to the last known state of the alarm returns the
+    uuid of the active alarm, and a clear_fault of an alarm known to be clear
+    returns False, both without contacting the FM manager. The state is kept
+    in an AlarmStateCache, by default shared by every FaultAPIsCached
+    instance in the process. Only alarms in the "set" state are cached; logs
+    and other requests are always sent.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else _alarm_state_cache
+
+    def _resync(self, alarm_id, entity_instance_id):
+        if not self.cache.needs_resync(alarm_id):
+            return
+        try:
+            faults = FaultAPIsV2.get_faults_by_id(self, alarm_id)
+        except APIException:
+            # the request itself will report the failure
+            return
+        self.cache.resync(alarm_id, faults, entity_instance_id)
+
+    def set_fault(self, data):
+        if data.alarm_state != constants.FM_ALARM_STATE_SET:
+            self.cache.invalidate(data.alarm_id, data.entity_instance_id)
+            return super(FaultAPIsCached, self).set_fault(data)
+        self._check_required_attributes(data)
+        self._validate_attributes(data)
+        self._resync(data.alarm_id, data.entity_instance_id)
+        uuid = self.cache.check_set(data)
+        if uuid is None:
+            uuid = super(FaultAPIsCached, self).set_fault(data)
+            self.cache.set(data, uuid)
+        return uuid
+
+    def clear_fault(self, alarm_id, entity_instance_id):
+        self._resync(alarm_id, entity_instance_id)
+        if self.cache.check_clear(alarm_id, entity_instance_id):
+            return False
+        try:
+            resp = super(FaultAPIsCached, self).clear_fault(
+                alarm_id, entity_instance_id)
+        except APIException:
+            self.cache.invalidate(alarm_id, entity_instance_id)
+            raise
+        self.cache.clear(alarm_id, entity_instance_id)
+        return resp
+
+    def clear_all(self, entity_instance_id):
+        try:
+            return super(FaultAPIsCached, self).clear_all(entity_instance_id)
+        finally:
+            self.cache.invalidate_entity(entity_instance_id)
+
+    def get_faults_by_id(self, alarm_id):
+        faults = super(FaultAPIsCached, self).get_faults_by_id(alarm_id)
+        self.cache.resync(alarm_id, faults)
+        return faults
+
+    def get_faults_by_ids(self, alarm_ids: list[str]) -> list[Fault]:
+        alarm_ids = list(alarm_ids)
+        faults = super(FaultAPIsCached, self).get_faults_by_ids(alarm_ids)
+        by_id = collections.defaultdict(list)
+        for fault in faults or ():
+            by_id[fault.alarm_id].append(fault)
+        for alarm_id in alarm_ids:
+            self.cache.resync(alarm_id, by_id[alarm_id])
+        return faults
+
+    def set_faults(self, data: list[Fault]) -> bool:
+        try:
+            return super(FaultAPIsCached, self).set_faults(data)
+        finally:
+            for alarm_data in data:
+                self.cache.invalidate(alarm_data.alarm_id,
+                                      alarm_data.entity_instance_id)
+
+    def clear_faults_list(self, faults_list: list[tuple[str, str]]) -> bool:
+        try:
+            return super(FaultAPIsCached, self).clear_faults_list(
+                faults_list)
+        finally:
+            for alarm_id, entity_instance_id in faults_list:
+                self.cache.invalidate(alarm_id, entity_instance_id)
+
+    def get_cache_stats(self) -> dict:
+        """Get the counters of the alarm state cache
+
+        :returns: dict with 'entries', 'hits' (requests answered from the
+                  cache), 'misses' (requests sent to the FM manager),
+                  'evictions' and 'resyncs'
+        """
+        return self.cache.stats()
+
+
+class FaultBatcher(object):
+    """Coalesce set_fault/clear_fault calls into set_faults/clear_faults_list
+
+    Updates from any number of threads are queued per (alarm_id,
+    entity_instance_id); a later update of the same alarm replaces the
+    queued one, unless a clear was queued in between: a clear also removes
+    the alarms whose entity_instance_id it prefixes, so the updates queued
+    after it are never merged into the ones before. A background thread sends the queue through the list APIs
+    of api (a FaultAPIsV2 by default) once max_batch alarms are queued or
+    the oldest update has waited max_delay seconds. Callers block while
+    max_pending alarms are queued. Failed batches are queued again, unless
+    a newer update of the alarm arrived meanwhile, and retried after
+    max_delay. Whatever is still queued is sent when the batcher is closed
+    or the process exits. Logs are sent right away with api.set_fault.
+    """
+
+    def __init__(self, api=None,
+                 max_batch=constants.FM_CLIENT_BATCH_MAX_SIZE,
+                 max_delay=constants.FM_CLIENT_BATCH_MAX_DELAY,
+                 max_pending=constants.FM_CLIENT_BATCH_MAX_PENDING):
+        self.api = api if api is not None else FaultAPIsV2()
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self._cond = threading.Condition()
+        # serializes taking a batch and sending it, so a batch is never
+        # overtaken by a later one
+        self._send_lock = threading.Lock()
+        # (segment, alarm_id, entity_instance_id) -> Fault to set, or None
+        # to clear; every queued clear ends the current segment
+        self._pending = collections.OrderedDict()
+        self._segment = 0
+        self._first_queued = None
+        self._retry_at = 0
+        self._closed = False
+        self._stats = {'queued': 0, 'coalesced': 0, 'flushes': 0,
+                       'sent': 0, 'errors': 0}
+        self._flush_total = 0.0
+        self._flush_max = 0.0
+        self._flush_last = 0.0
+        self._thread = threading.Thread(target=self._run,
+                                        name='fm-fault-batcher')
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def set_fault(self, data):
+        if data.alarm_state in (constants.FM_ALARM_STATE_MSG,
+                                constants.FM_ALARM_STATE_LOG):
+            # every log is a distinct event, they are not coalesced
+            return self.api.set_fault(data)
+        self.api._check_required_attributes(data)
+        self.api._validate_attributes(data)
+        self._queue((data.alarm_id, data.entity_instance_id), data)
+
+    def clear_fault(self, alarm_id, entity_instance_id):
+        self._queue((alarm_id, entity_instance_id), None)
+
+    def _queue(self, alarm_key, value):
+        with self._cond:
+            while True:
+                key = (self._segment,) + alarm_key
+                if (self._closed or key in self._pending or
+                        len(self._pending) < self.max_pending):
+                    break
+                self._cond.wait()
+            if self._closed:
+                raise ClientException("FaultBatcher is closed.")
+            if key in self._pending:
+                del self._pending[key]
+                self._stats['coalesced'] += 1
+            self._pending[key] = value
+            if value is None:
+                self._segment += 1
+            self._stats['queued'] += 1
+            if self._first_queued is None:
+                self._first_queued = time.monotonic()
+                self._cond.notify_all()
+            elif len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+
+    def _wait_time(self):
+        """Seconds until the next batch is due, 0 if now, None if idle"""
+        if not self._pending:
+            return None
+        now = time.monotonic()
+        if now < self._retry_at:
+            return self._retry_at - now
+        if len(self._pending) >= self.max_batch:
+            return 0
+        return max(0, self._first_queued + self.max_delay - now)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                wait = self._wait_time()
+                while not self._closed and wait != 0:
+                    self._cond.wait(wait)
+                    wait = self._wait_time()
+                if self._closed:
+                    return
+            self._flush_batch()
+
+    def _flush_batch(self):
+        """Send up to max_batch queued updates
+
+        Returns False if nothing was queued or the batch failed.
+        """
+        with self._send_lock:
+            with self._cond:
+                batch = []
+                while self._pending and len(batch) < self.max_batch:
+                    batch.append(self._pending.popitem(last=False))
+                if not self._pending:
+                    self._first_queued = None
+                self._cond.notify_all()
+            if not batch:
+                return False
+            return self._send(batch)
+
+    def _send(self, batch):
+        # Sets and clears are sent in runs, in queue order: a clear also
+        # removes the alarms whose entity_instance_id it prefixes, so it
+        # must not overtake or be overtaken by a set of one of them
+        start = time.monotonic()
+        failed = []
+        sent = 0
+        for is_clear, run in itertools.groupby(
+                batch, key=lambda item: item[1] is None):
+            run = list(run)
+            if failed:
+                failed.extend(run)
+                continue
+            try:
+                if is_clear:
+                    self.api.clear_faults_list([key[1:] for key, _ in run])
+                else:
+                    self.api.set_faults([value for _, value in run])
+                sent += len(run)
+            except APIException:
+                failed.extend(run)
+        elapsed = time.monotonic() - start
+
+        with self._cond:
+            self._stats['flushes'] += 1
+            self._stats['sent'] += sent
+            self._flush_total += elapsed
+            self._flush_max = max(self._flush_max, elapsed)
+            self._flush_last = elapsed
+            if not failed:
+                return True
+            self._stats['errors'] += 1
+            # back to the head of the queue, ahead of the newer updates; a
+            # newer update of the same segment replaces the failed one
+            for key, value in reversed(failed):
+                if key not in self._pending:
+                    self._pending[key] = value
+                    self._pending.move_to_end(key, last=False)
+            if self._first_queued is None:
+                self._first_queued = time.monotonic()
+            self._retry_at = time.monotonic() + self.max_delay
+            return False
+
+    def flush(self):
+        """Send every queued update now
+
+        Returns False if a batch failed; its updates stay queued.
+        """
+        while self._flush_batch():
+            pass
+        with self._cond:
+            return not self._pending
+
+    def close(self):
+        """Send the queued updates and stop the background thread"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        atexit.unregister(self.close)
+        self._thread.join()
+        self.flush()
+
+    def stats(self) -> dict:
+        """Get the batcher counters
+
+        :returns: dict with 'pending' (alarms queued), 'queued' (calls
+                  accepted), 'coalesced' (calls that replaced a queued
+                  update), 'flushes', 'sent' (alarms sent), 'errors'
+                  (failed flushes) and the last, average and maximum
+                  flush time in ms
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+            flushes = stats['flushes']
+            stats['flush_ms_last'] = self._flush_last * 1e3
+            stats['flush_ms_avg'] = (self._flush_total * 1e3 / flushes
+                                     if flushes else 0.0)
+            stats['flush_ms_max'] = self._flush_max * 1e3
+            return stats
@@ -0,0 +1,235 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Tests for the fm_api client classes"""
+
+import sys
+import time
+import unittest
+from unittest import mock
+
+# fm_core is built with fm-common; the tests replace the calls into it
+sys.modules.setdefault('fm_core', mock.MagicMock())
+
+from fm_api import constants  # noqa: E402
+from fm_api import fm_api  # noqa: E402
+
+ALARM_ID = constants.FM_ALARM_ID_VM_FAILED
+
+
+def _fault(entity_instance_id, uuid=None):
+    return fm_api.Fault(
+        alarm_id=ALARM_ID,
+        alarm_state=constants.FM_ALARM_STATE_SET,
+        entity_type_id=constants.FM_ENTITY_TYPE_HOST,
+        entity_instance_id=entity_instance_id,
+        severity=constants.FM_ALARM_SEVERITY_MAJOR,
+        reason_text='reason',
+        alarm_type=constants.FM_ALARM_TYPE_5,
+        probable_cause=constants.ALARM_PROBABLE_CAUSE_8,
+        proposed_repair_action='repair',
+        uuid=uuid)
+
+
+def _alarm_tuple(entity_instance_id):
+    alarm = [''] * constants.MAX_ALARM_ATTRIBUTES
+    alarm[constants.FM_ALARM_ID_INDEX] = ALARM_ID
+    alarm[constants.FM_ENT_INST_ID_INDEX] = entity_instance_id
+    return tuple(alarm)
+
+
+class FakeManager(object):
+    """Active alarms of one alarm id, as fmManager handles them"""
+
+    def __init__(self):
+        self.active = {}
+        self.clears = []
+
+    def set_fault(self, api, data):
+        uuid = 'uuid-%s' % data.entity_instance_id
+        self.active[data.entity_instance_id] = uuid
+        return uuid
+
+    def clear_fault(self, api, alarm_id, entity_instance_id):
+        self.clears.append(entity_instance_id)
+        cleared = [eid for eid in self.active
+                   if eid.startswith(entity_instance_id)]
+        for eid in cleared:
+            del self.active[eid]
+        return bool(cleared)
+
+    def get_faults_by_id(self, api, alarm_id):
+        return [_fault(eid, uuid) for eid, uuid in self.active.items()] or None
+
+
+class FaultAPIsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(FaultAPIsTestCase, self).setUp()
+        patcher = mock.patch.object(fm_api, 'fm_core')
+        self.fm_core = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.api = fm_api.FaultAPIs()
+
+    def test_iter_faults(self):
+        self.fm_core.get_by_eid_page.side_effect = [
+            [_alarm_tuple('host=a'), _alarm_tuple('host=a.port=1')],
+            [_alarm_tuple('host=a.port=2')]]
+        self.assertEqual(['host=a', 'host=a.port=1', 'host=a.port=2'],
+                         [fault.entity_instance_id for fault in
+                          self.api.iter_faults('host=a', page_size=2)])
+
+    def test_iter_faults_first_page_fails(self):
+        self.fm_core.get_by_aid_page.return_value = False
+        self.assertEqual([], list(self.api.iter_faults_by_id(ALARM_ID)))
+
+    def test_iter_faults_page_fails(self):
+        self.fm_core.get_by_eid_page.side_effect = [
+            [_alarm_tuple('host=a'), _alarm_tuple('host=a.port=1')],
+            False]
+        faults = self.api.iter_faults('host=a', page_size=2)
+        self.assertEqual('host=a', next(faults).entity_instance_id)
+        self.assertEqual('host=a.port=1', next(faults).entity_instance_id)
+        # The failure of the second page is not taken for the end of the
+        # alarms
+        self.assertRaises(fm_api.APIException, next, faults)
+
+
+class FaultAPIsCachedTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(FaultAPIsCachedTestCase, self).setUp()
+        self.manager = FakeManager()
+        for name in ('set_fault', 'clear_fault', 'get_faults_by_id'):
+            patcher = mock.patch.object(fm_api.FaultAPIsV2, name,
+                                        autospec=True,
+                                        side_effect=getattr(self.manager,
+                                                            name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.api = fm_api.FaultAPIsCached(cache=fm_api.AlarmStateCache())
+
+    def test_clear_known_clear(self):
+        self.api.set_fault(_fault('host=a'))
+        self.assertTrue(self.api.clear_fault(ALARM_ID, 'host=a'))
+        self.assertFalse(self.api.clear_fault(ALARM_ID, 'host=a'))
+        # The second clear is answered by the cache
+        self.assertEqual(['host=a'], self.manager.clears)
+
+    def test_clear_prefix_of_active(self):
+        # No alarm is active, so the resync records host=a as clear
+        self.assertFalse(self.api.clear_fault(ALARM_ID, 'host=a'))
+        self.api.set_fault(_fault('host=a.port=1'))
+
+        # fmManager clears the alarms of the entities under host=a too
+        self.assertTrue(self.api.clear_fault(ALARM_ID, 'host=a'))
+        self.assertEqual(['host=a'], self.manager.clears)
+        self.assertEqual({}, self.manager.active)
+
+    def test_resync_with_active_child(self):
+        self.manager.active['host=a.port=1'] = 'uuid-host=a.port=1'
+
+        # The resync of the first clear must not record host=a as clear
+        self.assertTrue(self.api.clear_fault(ALARM_ID, 'host=a'))
+        self.assertEqual({}, self.manager.active)
+
+    def test_resync_evicts_active(self):
+        self.api = fm_api.FaultAPIsCached(
+            cache=fm_api.AlarmStateCache(max_entries=2))
+        for eid in ('host=a.port=1', 'host=c', 'host=d'):
+            self.manager.active[eid] = 'uuid-%s' % eid
+
+        # The resync cannot keep all the active alarms, so the clear of
+        # host=a must still reach fmManager
+        self.assertTrue(self.api.clear_fault(ALARM_ID, 'host=a'))
+        self.assertEqual(['host=a'], self.manager.clears)
+        self.assertNotIn('host=a.port=1', self.manager.active)
+        self.assertTrue(self.api.cache.needs_resync(ALARM_ID))
+
+
+class FaultBatcherTestCase(unittest.TestCase):
+
+    def setUp(self):
+        super(FaultBatcherTestCase, self).setUp()
+        self.api = mock.Mock(spec=fm_api.FaultAPIsV2)
+        self.calls = []
+        self.api.set_faults.side_effect = lambda data: self.calls.append(
+            ('set', [fault.entity_instance_id for fault in data]))
+        self.api.clear_faults_list.side_effect = (
+            lambda faults: self.calls.append(
+                ('clear', [eid for _, eid in faults])))
+
+    def _batcher(self, **kwargs):
+        kwargs.setdefault('max_delay', 60)
+        batcher = fm_api.FaultBatcher(api=self.api, **kwargs)
+        self.addCleanup(batcher.close)
+        return batcher
+
+    def _wait_for_calls(self):
+        deadline = time.monotonic() + 5
+        while not self.calls and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_order_across_clear(self):
+        batcher = self._batcher()
+        batcher.set_fault(_fault('host=a.port=1'))
+        batcher.clear_fault(ALARM_ID, 'host=a')
+        batcher.set_fault(_fault('host=a.port=1'))
+        batcher.set_fault(_fault('host=a'))
+        self.assertTrue(batcher.flush())
+        # The sets after the clear are not merged into the one before it
+        self.assertEqual([('set', ['host=a.port=1']),
+                          ('clear', ['host=a']),
+                          ('set', ['host=a.port=1', 'host=a'])],
+                         self.calls)
+        self.assertEqual(0, batcher.stats()['coalesced'])
+
+    def test_coalesce(self):
+        batcher = self._batcher()
+        batcher.set_fault(_fault('host=a'))
+        batcher.set_fault(_fault('host=b'))
+        latest = _fault('host=a')
+        latest.severity = constants.FM_ALARM_SEVERITY_CRITICAL
+        batcher.set_fault(latest)
+        self.assertTrue(batcher.flush())
+        self.assertEqual([('set', ['host=b', 'host=a'])], self.calls)
+        self.assertIs(latest, self.api.set_faults.call_args[0][0][1])
+        stats = batcher.stats()
+        self.assertEqual(3, stats['queued'])
+        self.assertEqual(1, stats['coalesced'])
+        self.assertEqual(2, stats['sent'])
+
+    def test_flush_on_size(self):
+        batcher = self._batcher(max_batch=2)
+        batcher.set_fault(_fault('host=a'))
+        batcher.set_fault(_fault('host=b'))
+        self._wait_for_calls()
+        self.assertEqual([('set', ['host=a', 'host=b'])], self.calls)
+
+    def test_flush_on_interval(self):
+        batcher = self._batcher(max_delay=0.05)
+        batcher.set_fault(_fault('host=a'))
+        self._wait_for_calls()
+        self.assertEqual([('set', ['host=a'])], self.calls)
+        self.assertEqual(0, batcher.stats()['pending'])
+
+    def test_failed_batch_requeued(self):
+        batcher = self._batcher()
+        self.api.set_faults.side_effect = fm_api.APIException("failed")
+        batcher.set_fault(_fault('host=a'))
+        batcher.clear_fault(ALARM_ID, 'host=b')
+        self.assertFalse(batcher.flush())
+        # Nothing after the failed run is sent ahead of it
+        self.api.clear_faults_list.assert_not_called()
+        stats = batcher.stats()
+        self.assertEqual(2, stats['pending'])
+        self.assertEqual(1, stats['errors'])
+
+        self.api.set_faults.side_effect = lambda data: self.calls.append(
+            ('set', [fault.entity_instance_id for fault in data]))
+        self.assertTrue(batcher.flush())
+        self.assertEqual([('set', ['host=a']), ('clear', ['host=b'])],
+                         self.calls)
@@ -0,0 +1,835 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Benchmarks for the fm_api client library.
+
+The benchmarks run against the stand-in FM manager of fm_api_stand_in,
+which answers the fm_core wire protocol with the alarms kept in memory,
+so the numbers reflect the client side only. fm_core always connects to
+'controller' port 8001; run this on a host where 'controller' resolves
+to the local machine and fmManager is not running.
+
+Usage:
+    python fm_api_bench.py [--json] latency [calls] [delay-ms]
+    python fm_api_bench.py [--json] threads [threads-list] [calls] [delay-ms]
+    python fm_api_bench.py [--json] async [calls] [delay-ms]
+    python fm_api_bench.py [--json] protocol [faults]
+    python fm_api_bench.py [--json] fault [faults]
+    python fm_api_bench.py [--json] cache [calls] [delay-ms]
+    python fm_api_bench.py [--json] batch [threads-list] [calls] [delay-ms]
+    python fm_api_bench.py [--json] storm [threads-list] [alarms] [delay-ms]
+    python fm_api_bench.py [--json] bulk [entities] [delay-ms]
+    python fm_api_bench.py [--json] page [faults] [page-size]
+    python fm_api_bench.py [--json] stats [calls] [delay-ms]
+    python fm_api_bench.py [--json] idle [calls] [idle-ms]
+    python fm_api_bench.py [--json] set [threads-list] [alarms] [delay-ms]
+    python fm_api_bench.py [--json] conns [clients-list] [calls] [delay-ms]
+    python fm_api_bench.py [--json] all [delay-ms]
+
+    latency: per call latency percentiles of set_fault, get_fault,
+             get_faults and clear_fault
+    threads: set/clear throughput from several threads sharing one
+             FaultAPIsV2, and how much a pure Python thread still runs
+    async: time spent in the caller by FaultAPIsV2 and FaultAPIsAsync
+           set_fault, and how long the async queue takes to drain
+    protocol: set_fault_list and get_by_aid cost with '###' strings and
+              with structured arguments, default 10000 faults
+    fault: Fault construction time, memory and export cost, without the
+           stand-in manager, default 100000 faults
+    cache: repeated polling cycles of identical set_fault calls and clears
+           of alarms never raised, with FaultAPIsV2 and FaultAPIsCached
+    batch: a burst of set_fault calls from several threads, each alarm
+           updated twice, sent one by one and through a FaultBatcher
+    storm: several threads raise, update and then clear many alarms at
+           once through FaultAPIsV2, FaultBatcher and FaultAPIsAsync, with
+           the alarms the manager holds after each phase, default 1000
+           alarms
+    bulk: alarms of many entities with one get_faults call per entity
+          and with a single get_faults_bulk call, default 100 entities
+    page: peak memory and time to the first and last alarm of an alarm id
+          with get_faults_by_id and iter_faults_by_id, default 1000 faults
+          in pages of 100
+    stats: cost of the call instrumentation on a local fm_core call, and
+           the stats of set_fault/clear_fault calls
+    idle: latency of a fm_core.get and of the delivery of a FaultAPIsAsync
+          set_fault, each made after the manager and the client were
+          idle for a while, default 20 calls after 300 ms
+    set: set_fault and clear_fault throughput of several threads sharing
+         one FaultAPIsV2, split into the raise of new alarms, the update
+         of raised alarms and their clear, default 1000 alarms; use it
+         with --manager to measure the fmManager database paths
+    conns: many clients connected to the manager at once, each with its
+           own connection like a process using fm_api: the time to
+           connect them, the get latency of one more client while they
+           are idle, and rounds of one get from every client at once;
+           clients-list is comma separated, default 10,100,500
+    all: latency, threads, batch, storm, bulk and page with their default
+         sizes against one stand-in manager
+
+    --json: print the results as one JSON document instead of tables
+    --manager: use the FM manager running on 'controller' instead of
+               starting the stand-in manager, delay-ms is ignored
+    threads-list: comma separated thread counts, default 1,2,4,8
+    calls: calls made by each thread, default 100
+    delay-ms: time the stand-in manager holds each request, default 1
+"""
+
+import collections
+import json
+import platform
+import re
+import selectors
+import socket
+import sys
+import threading
+import time
+import tracemalloc
+
+from fm_api import constants
+from fm_api import fm_api
+import fm_api_stand_in
+import fm_core  # pylint: disable=import-error
+
+BENCH_ENTITY_PREFIX = '%s=bench-' % constants.FM_ENTITY_TYPE_INSTANCE
+FM_MGR_HOST = 'controller'
+
+
+class Report(object):
+    """Benchmark results, printed as tables or kept for one JSON document
+
+    Each benchmark fills a table of rows keyed by column name, plus notes
+    for values that do not fit a row.
+    """
+
+    def __init__(self, as_json=False):
+        self.as_json = as_json
+        self.results = collections.OrderedDict()
+
+    def table(self, name, columns):
+        """Start the table of benchmark name
+
+        columns is a list of (name, printf format) pairs.
+        """
+        result = self.results.setdefault(
+            name, collections.OrderedDict(rows=[]))
+        return ReportTable(self, result['rows'], columns)
+
+    def note(self, name, key, value):
+        self.results[name][key] = value
+        if not self.as_json:
+            print('%s: %s' % (key, value))
+
+    def dump(self, argv):
+        if self.as_json:
+            print(json.dumps(collections.OrderedDict((
+                ('argv', argv[1:]),
+                ('python', platform.python_version()),
+                ('time', time.time()),
+                ('results', self.results))), indent=2))
+
+
+class ReportTable(object):
+
+    def __init__(self, report, rows, columns):
+        self.report = report
+        self.rows = rows
+        self.columns = columns
+        self.widths = ['%' + re.match(r'%(-?\d*)', fmt).group(1) + 's'
+                       for _, fmt in columns]
+        if not report.as_json:
+            if len(report.results) > 1:
+                print('')
+            print(' '.join(width % name for width, (name, _) in
+                           zip(self.widths, columns)))
+
+    def add(self, *values):
+        """Add a row, None stands for a failed measurement"""
+        self.rows.append(collections.OrderedDict(
+            (name, value) for (name, _), value in zip(self.columns, values)))
+        if not self.report.as_json:
+            print(' '.join(
+                width % '-' if value is None else fmt % value
+                for width, (_, fmt), value in
+                zip(self.widths, self.columns, values)))
+
+
+def make_fault(index):
+    return fm_api.Fault(
+        alarm_id=constants.FM_ALARM_ID_VM_FAILED,
+        alarm_state=constants.FM_ALARM_STATE_SET,
+        entity_type_id=constants.FM_ENTITY_TYPE_INSTANCE,
+        entity_instance_id='%s%d' % (BENCH_ENTITY_PREFIX, index),
+        severity=constants.FM_ALARM_SEVERITY_MAJOR,
+        reason_text='fm_api benchmark fault %d' % index,
+        alarm_type=constants.FM_ALARM_TYPE_5,
+        probable_cause=constants.ALARM_PROBABLE_CAUSE_8,
+        proposed_repair_action='None',
+        service_affecting=False,
+        suppression=False)
+
+
+def raise_faults(count):
+    """Raise count benchmark alarms in the manager"""
+    fm_api.FaultAPIsV2().set_faults([make_fault(i) for i in range(count)])
+
+
+def clear_faults():
+    """Clear every benchmark alarm left in the manager"""
+    fm_api.FaultAPIs().clear_all(BENCH_ENTITY_PREFIX)
+
+
+def count_faults():
+    return sum(1 for _ in fm_api.FaultAPIsV2().iter_faults(
+        BENCH_ENTITY_PREFIX))
+
+
+class Ticker(threading.Thread):
+    """Pure Python busy loop that shows whether the interpreter is stalled"""
+
+    def __init__(self):
+        super(Ticker, self).__init__(daemon=True)
+        self.count = 0
+        self.running = True
+
+    def run(self):
+        while self.running:
+            self.count += 1
+
+
+def _timed(func, *args, **kwargs):
+    start = time.time()
+    result = func(*args, **kwargs)
+    return result, time.time() - start
+
+
+def _run_threads(target, thread_args):
+    """Run target once per thread_args entry, return the elapsed time
+
+    The clock starts once every thread is ready to call target.
+    """
+    barrier = threading.Barrier(len(thread_args) + 1)
+
+    def run(*args):
+        barrier.wait()
+        target(*args)
+
+    workers = [threading.Thread(target=run, args=args)
+               for args in thread_args]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.time()
+    for worker in workers:
+        worker.join()
+    return time.time() - start
+
+
+def _percentile(samples, percent):
+    """percent percentile of the sorted samples"""
+    return samples[min(len(samples) - 1, len(samples) * percent // 100)]
+
+
+def _latency_table(report, name):
+    return report.table(name, (
+        ('call', '%-16s'), ('calls', '%8d'), ('avg_us', '%10.1f'),
+        ('p50_us', '%10.1f'), ('p90_us', '%10.1f'), ('p99_us', '%10.1f'),
+        ('max_us', '%10.1f')))
+
+
+def _add_latency_row(table, name, samples):
+    samples = sorted(samples)
+    table.add(name, len(samples), sum(samples) / len(samples),
+              _percentile(samples, 50), _percentile(samples, 90),
+              _percentile(samples, 99), samples[-1])
+
+
+def bench_latency(report, calls):
+    api = fm_api.FaultAPIsV2()
+    faults = [make_fault(i) for i in range(calls)]
+    aid = constants.FM_ALARM_ID_VM_FAILED
+    api.get_fault(aid, 'none')
+
+    table = _latency_table(report, 'latency')
+    for name, func, args in (
+            ('set_fault', api.set_fault, [(f,) for f in faults]),
+            ('get_fault', api.get_fault,
+             [(aid, f.entity_instance_id) for f in faults]),
+            ('get_faults', api.get_faults,
+             [(f.entity_instance_id,) for f in faults]),
+            ('clear_fault', api.clear_fault,
+             [(aid, f.entity_instance_id) for f in faults])):
+        _add_latency_row(table, name,
+                         [_timed(func, *arg)[1] * 1e6 for arg in args])
+
+
+def _thread_worker(api, index, calls):
+    fault = make_fault(index)
+    for _ in range(calls // 2):
+        api.set_fault(fault)
+        api.clear_fault(fault.alarm_id, fault.entity_instance_id)
+
+
+def bench_threads(report, thread_counts, calls):
+    api = fm_api.FaultAPIsV2()
+    # Establish the manager connection outside of the measurements
+    api.set_fault(make_fault(0))
+
+    ticker = Ticker()
+    ticker.start()
+    start_count = ticker.count
+    time.sleep(1)
+    idle_rate = ticker.count - start_count
+
+    table = report.table('threads', (
+        ('threads', '%8d'), ('calls_per_s', '%12.0f'),
+        ('us_per_call', '%12.1f'), ('interp_avail_pct', '%17.0f')))
+    for count in thread_counts:
+        start_count = ticker.count
+        elapsed = _run_threads(_thread_worker,
+                               [(api, i, calls) for i in range(count)])
+        ticks = ticker.count - start_count
+        total = count * (calls // 2) * 2
+        table.add(count, total / elapsed, elapsed * 1e6 / total,
+                  100.0 * ticks / (idle_rate * elapsed))
+    ticker.running = False
+
+
+def _drain(async_api):
+    stats = async_api.get_queue_stats()
+    while stats['sent'] < stats['enqueued']:
+        time.sleep(0.0002)
+        stats = async_api.get_queue_stats()
+    return stats
+
+
+def bench_async(report, calls):
+    faults = [make_fault(i) for i in range(calls)]
+    sync_api = fm_api.FaultAPIsV2()
+    async_api = fm_api.FaultAPIsAsync()
+    sync_api.set_fault(faults[0])
+
+    table = report.table('async', (
+        ('api', '%-16s'), ('us_per_call', '%12.1f'), ('drain_ms', '%12.0f')))
+    start = time.time()
+    for fault in faults:
+        sync_api.set_fault(fault)
+    elapsed = time.time() - start
+    table.add('FaultAPIsV2', elapsed * 1e6 / calls, None)
+
+    start = time.time()
+    for fault in faults:
+        async_api.set_fault(fault)
+    elapsed = time.time() - start
+    stats = _drain(async_api)
+    drained = time.time() - start
+    table.add('FaultAPIsAsync', elapsed * 1e6 / calls, drained * 1e3)
+    report.note('async', 'queue_stats', stats)
+
+
+def bench_protocol(report, count):
+    api = fm_api.FaultAPIsV2()
+    faults = [make_fault(i) for i in range(count)]
+    aid = constants.FM_ALARM_ID_VM_FAILED
+    fm_core.set(faults[0])
+
+    def set_str():
+        return fm_core.set_fault_list([api._alarm_to_str(f) for f in faults])
+
+    def set_structured():
+        return fm_core.set_fault_list(faults)
+
+    def get_str():
+        return [api._str_to_alarm(a)
+                for a in fm_core.get_by_aid(aid, max=count)]
+
+    def get_structured():
+        return [api._tuple_to_alarm(a)
+                for a in fm_core.get_by_aid(aid, max=count, structured=True)]
+
+    table = report.table('protocol', (
+        ('call', '%-10s'), ('string_ms', '%12.1f'), ('struct_ms', '%12.1f'),
+        ('speedup', '%9.2fx')))
+    for name, str_func, structured_func in (
+            ('set_list', set_str, set_structured),
+            ('get_by_aid', get_str, get_structured)):
+        str_result, str_time = _timed(str_func)
+        structured_result, structured_time = _timed(structured_func)
+        if str_result is False or structured_result is False:
+            table.add(name, None, None, None)
+            continue
+        table.add(name, str_time * 1e3, structured_time * 1e3,
+                  str_time / structured_time)
+
+
+def bench_fault(report, count):
+    api = fm_api.FaultAPIsV2()
+    row = make_fault(0).as_dict()
+    alarm_tuple = (row['uuid'], row['alarm_id'], row['alarm_state'],
+                   row['entity_type_id'], row['entity_instance_id'],
+                   '2024-01-01 00:00:00.000000', row['severity'],
+                   row['reason_text'], row['alarm_type'],
+                   row['probable_cause'], row['proposed_repair_action'],
+                   'False', 'False', 'False', 'False')
+
+    start = time.time()
+    faults = [fm_api.Fault(**row) for _ in range(count)]
+    construct = time.time() - start
+    del faults
+
+    tracemalloc.start()
+    faults = [fm_api.Fault(**row) for _ in range(count)]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del faults
+
+    results = []
+    for name, func, arg in (
+            ('from get tuple', api._tuple_to_alarm, alarm_tuple),
+            ('as_dict', fm_api.Fault.as_dict, make_fault(0))):
+        start = time.time()
+        for _ in range(count):
+            func(arg)
+        results.append((name, time.time() - start))
+    if hasattr(fm_api.Fault, 'as_tuple'):
+        fault = make_fault(0)
+        start = time.time()
+        for _ in range(count):
+            fault.as_tuple()
+        results.append(('as_tuple', time.time() - start))
+
+    table = report.table('fault', (
+        ('operation', '%-16s'), ('ns_per_fault', '%12.0f')))
+    table.add('construct', construct * 1e9 / count)
+    for name, elapsed in results:
+        table.add(name, elapsed * 1e9 / count)
+    report.note('fault', 'bytes_per_fault', float(memory) / count)
+
+
+def _poll_cycle(api, faults):
+    for fault in faults:
+        api.set_fault(fault)
+        api.clear_fault(constants.FM_ALARM_ID_VM_PAUSED,
+                        fault.entity_instance_id)
+
+
+def bench_cache(report, calls, cycles=5):
+    faults = [make_fault(i) for i in range(calls // 2)]
+    cache = fm_api.AlarmStateCache()
+    fm_api.FaultAPIsV2().set_fault(faults[0])
+
+    table = report.table('cache', (
+        ('api', '%-16s'), ('first_us_per_call', '%18.1f'),
+        ('later_us_per_call', '%18.1f')))
+    for name, api in (('FaultAPIsV2', fm_api.FaultAPIsV2()),
+                      ('FaultAPIsCached', fm_api.FaultAPIsCached(cache))):
+        _, first = _timed(_poll_cycle, api, faults)
+        start = time.time()
+        for _ in range(cycles - 1):
+            _poll_cycle(api, faults)
+        later = time.time() - start
+        table.add(name, first * 1e6 / calls,
+                  later * 1e6 / ((cycles - 1) * calls))
+    report.note('cache', 'cache_stats', cache.stats())
+
+
+def _batch_worker(api, faults):
+    for _ in range(2):
+        for fault in faults:
+            api.set_fault(fault)
+
+
+def _timed_burst(api, count, calls):
+    elapsed = _run_threads(_batch_worker, [
+        (api, [make_fault(i * calls + j) for j in range(calls // 2)])
+        for i in range(count)])
+    if isinstance(api, fm_api.FaultBatcher):
+        _, flushed = _timed(api.flush)
+        elapsed += flushed
+    return elapsed
+
+
+def bench_batch(report, thread_counts, calls):
+    fm_api.FaultAPIsV2().set_fault(make_fault(0))
+
+    table = report.table('batch', (
+        ('threads', '%8d'), ('calls', '%10d'), ('single_ms', '%12.1f'),
+        ('batched_ms', '%12.1f'), ('messages', '%10d'),
+        ('flush_ms', '%10.1f')))
+    for count in thread_counts:
+        single = _timed_burst(fm_api.FaultAPIsV2(), count, calls)
+        with fm_api.FaultBatcher() as batcher:
+            batched = _timed_burst(batcher, count, calls)
+            stats = batcher.stats()
+        table.add(count, count * (calls // 2) * 2, single * 1e3,
+                  batched * 1e3, stats['flushes'], stats['flush_ms_avg'])
+
+
+def _storm_raise(api, faults):
+    for fault in faults:
+        api.set_fault(fault)
+    # Every alarm changes severity while the storm goes on
+    for fault in faults:
+        fault.severity = constants.FM_ALARM_SEVERITY_CRITICAL
+        api.set_fault(fault)
+
+
+def _storm_clear(api, faults):
+    for fault in faults:
+        api.clear_fault(fault.alarm_id, fault.entity_instance_id)
+
+
+def _settle(api):
+    """Wait until the alarms an api still holds reach the manager"""
+    if isinstance(api, fm_api.FaultBatcher):
+        api.flush()
+    elif isinstance(api, fm_api.FaultAPIsAsync):
+        _drain(api)
+
+
+def bench_storm(report, thread_counts, alarms):
+    clear_faults()
+
+    table = report.table('storm', (
+        ('api', '%-16s'), ('threads', '%8d'), ('alarms', '%8d'),
+        ('raise_ms', '%10.1f'), ('raised', '%8d'), ('clear_ms', '%10.1f'),
+        ('left', '%8d')))
+    for count in thread_counts:
+        apis = (('FaultAPIsV2', fm_api.FaultAPIsV2()),
+                ('FaultBatcher', fm_api.FaultBatcher()),
+                ('FaultAPIsAsync', fm_api.FaultAPIsAsync()))
+        for name, api in apis:
+            per_thread = alarms // count
+            thread_faults = [
+                [make_fault(i * per_thread + j) for j in range(per_thread)]
+                for i in range(count)]
+            start = time.time()
+            _run_threads(_storm_raise, [(api, f) for f in thread_faults])
+            _settle(api)
+            raise_time = time.time() - start
+            raised = count_faults()
+            start = time.time()
+            _run_threads(_storm_clear, [(api, f) for f in thread_faults])
+            _settle(api)
+            clear_time = time.time() - start
+            left = count_faults()
+            if isinstance(api, fm_api.FaultBatcher):
+                api.close()
+            table.add(name, count, per_thread * count, raise_time * 1e3,
+                      raised, clear_time * 1e3, left)
+            clear_faults()
+
+
+def bench_bulk(report, count):
+    api = fm_api.FaultAPIsV2()
+    eids = ['%s%d' % (BENCH_ENTITY_PREFIX, i) for i in range(count)]
+    raise_faults(count)
+    api.get_faults(eids[0])
+
+    def one_by_one():
+        faults = []
+        for eid in eids:
+            faults.extend(api.get_faults(eid) or [])
+        return faults
+
+    table = report.table('bulk', (
+        ('call', '%-16s'), ('ms', '%12.1f'), ('alarms', '%10d')))
+    for name, func in (('get_faults', one_by_one),
+                       ('get_faults_bulk',
+                        lambda: api.get_faults_bulk(eids))):
+        faults, elapsed = _timed(func)
+        table.add(name, elapsed * 1e3, len(faults))
+    clear_faults()
+
+
+def _walk(func):
+    first = None
+    count = 0
+    start = time.time()
+    for _ in func():
+        if first is None:
+            first = time.time() - start
+        count += 1
+    return first, time.time() - start, count
+
+
+def bench_page(report, count, page_size):
+    api = fm_api.FaultAPIsV2()
+    aid = constants.FM_ALARM_ID_VM_FAILED
+    raise_faults(count)
+    api.get_fault(aid, 'none')
+
+    table = report.table('page', (
+        ('call', '%-18s'), ('first_ms', '%10.1f'), ('total_ms', '%10.1f'),
+        ('alarms', '%10d'), ('peak_kib', '%10.0f')))
+    for name, func in (
+            ('get_faults_by_id', lambda: api.get_faults_by_id(aid)),
+            ('iter_faults_by_id',
+             lambda: api.iter_faults_by_id(aid, page_size=page_size))):
+        tracemalloc.start()
+        try:
+            first, total, found = _walk(func)
+        except fm_api.APIException:
+            table.add(name, None, None, None, None)
+            continue
+        finally:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        table.add(name, first * 1e3, total * 1e3, found, peak / 1024.0)
+    clear_faults()
+
+
+def bench_stats(report, calls):
+    api = fm_api.FaultAPIsV2()
+    fault = make_fault(0)
+    api.set_fault(fault)
+
+    table = report.table('stats', (
+        ('stats', '%-16s'), ('ns_per_call', '%12.0f')))
+    for name, enable in (('disabled', fm_api.disable_stats),
+                         ('enabled', fm_api.enable_stats)):
+        enable()
+        start = time.time()
+        for _ in range(100000):
+            fm_api._core_call('async_stats')
+        table.add(name, (time.time() - start) * 1e4)
+
+    for _ in range(calls // 2):
+        api.set_fault(fault)
+        api.clear_fault(fault.alarm_id, fault.entity_instance_id)
+    for name, entry in sorted(api.stats().items()):
+        if name != 'async_stats':
+            report.note('stats', name, entry)
+    fm_api.disable_stats()
+
+
+def bench_idle(report, calls, idle_ms):
+    async_api = fm_api.FaultAPIsAsync()
+    fault = make_fault(0)
+    aid = constants.FM_ALARM_ID_VM_FAILED
+    eid = fault.entity_instance_id
+    fm_core.get(aid, eid)
+
+    get_samples = []
+    async_samples = []
+    for _ in range(calls):
+        time.sleep(idle_ms / 1000.0)
+        get_samples.append(_timed(fm_core.get, aid, eid)[1] * 1e6)
+        time.sleep(idle_ms / 1000.0)
+        start = time.time()
+        async_api.set_fault(fault)
+        _drain(async_api)
+        async_samples.append((time.time() - start) * 1e6)
+    table = _latency_table(report, 'idle')
+    _add_latency_row(table, 'get', get_samples)
+    _add_latency_row(table, 'async set_fault', async_samples)
+
+
+def _set_worker(api, faults, severity):
+    for fault in faults:
+        fault.severity = severity
+        api.set_fault(fault)
+
+
+def _clear_worker(api, faults):
+    for fault in faults:
+        api.clear_fault(fault.alarm_id, fault.entity_instance_id)
+
+
+def bench_set(report, thread_counts, alarms):
+    api = fm_api.FaultAPIsV2()
+    clear_faults()
+    table = report.table('set', (
+        ('phase', '%-8s'), ('threads', '%8d'), ('calls', '%8d'),
+        ('calls_per_s', '%12.0f'), ('us_per_call', '%12.1f')))
+    for count in thread_counts:
+        faults = [make_fault(i) for i in range(alarms)]
+        shares = [faults[i::count] for i in range(count)]
+        for phase, target, args in (
+                ('raise', _set_worker,
+                 [(api, share, constants.FM_ALARM_SEVERITY_MAJOR)
+                  for share in shares]),
+                ('update', _set_worker,
+                 [(api, share, constants.FM_ALARM_SEVERITY_CRITICAL)
+                  for share in shares]),
+                ('clear', _clear_worker,
+                 [(api, share) for share in shares])):
+            elapsed = _run_threads(target, args)
+            table.add(phase, count, alarms, alarms / elapsed,
+                      elapsed * 1e6 / alarms)
+    clear_faults()
+
+
+def _get_request():
+    """Wire packet of a fm_core get of an alarm that is not raised"""
+    payload = bytes(fm_api_stand_in.AlarmFilter(
+        alarm_id=constants.FM_ALARM_ID_VM_FAILED.encode(),
+        entity_instance_id=b'bench-none'))
+    packet = fm_api_stand_in.MSG_HDR.pack(
+        1, fm_api_stand_in.EFM_GET_FAULT, len(payload), 0) + payload
+    return fm_api_stand_in.MSG_LEN.pack(len(packet)) + packet
+
+
+def _recv_exact(sock, length):
+    data = b''
+    while len(data) < length:
+        chunk = sock.recv(length - len(data))
+        if not chunk:
+            raise EOFError('connection closed by the manager')
+        data += chunk
+    return data
+
+
+def _recv_packet(sock):
+    length = _recv_exact(sock, fm_api_stand_in.MSG_LEN.size)
+    return _recv_exact(sock, fm_api_stand_in.MSG_LEN.unpack(length)[0])
+
+
+def _get_round(clients, request):
+    """Send a get on every client at once, wait for all the responses"""
+    for client in clients:
+        client.sendall(request)
+    with selectors.DefaultSelector() as selector:
+        for client in clients:
+            selector.register(client, selectors.EVENT_READ)
+        pending = len(clients)
+        while pending:
+            for key, _ in selector.select():
+                _recv_packet(key.fileobj)
+                selector.unregister(key.fileobj)
+                pending -= 1
+
+
+def bench_conns(report, client_counts, calls):
+    request = _get_request()
+    table = report.table('conns', (
+        ('clients', '%8d'), ('connect_ms', '%11.1f'),
+        ('get_p50_us', '%11.1f'), ('get_p99_us', '%11.1f'),
+        ('round_ms', '%10.1f'), ('gets_per_s', '%11.0f')))
+    for count in client_counts:
+        clients = []
+        try:
+            start = time.time()
+            for _ in range(count):
+                clients.append(socket.create_connection(
+                    (FM_MGR_HOST, fm_api_stand_in.FM_MGR_PORT)))
+            connect = time.time() - start
+            for client in clients:
+                client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            probe = clients[0]
+            samples = []
+            for _ in range(calls):
+                start = time.time()
+                probe.sendall(request)
+                _recv_packet(probe)
+                samples.append((time.time() - start) * 1e6)
+            samples.sort()
+            rounds = max(1, calls // 10)
+            elapsed = _timed(lambda: [_get_round(clients, request)
+                                      for _ in range(rounds)])[1]
+        except (OSError, EOFError) as e:
+            report.note('conns', 'error with %d clients' % count, str(e))
+            table.add(count, None, None, None, None, None)
+            continue
+        finally:
+            for client in clients:
+                client.close()
+        table.add(count, connect * 1e3, _percentile(samples, 50),
+                  _percentile(samples, 99), elapsed * 1e3 / rounds,
+                  count * rounds / elapsed)
+
+
+def bench_all(report):
+    thread_counts = [1, 2, 4, 8]
+    bench_latency(report, 100)
+    bench_threads(report, thread_counts, 100)
+    bench_batch(report, thread_counts, 100)
+    bench_storm(report, thread_counts, 1000)
+    bench_bulk(report, 100)
+    bench_page(report, 1000, 100)
+
+
+BENCHMARKS = ('latency', 'threads', 'async', 'protocol', 'fault', 'cache',
+              'batch', 'storm', 'bulk', 'page', 'stats', 'idle', 'set',
+              'conns', 'all')
+
+
+def main(argv):
+    report = Report('--json' in argv)
+    use_manager = '--manager' in argv
+    argv = [arg for arg in argv if arg not in ('--json', '--manager')]
+    if len(argv) < 2 or argv[1] not in BENCHMARKS:
+        print(__doc__)
+        return 1
+    mode = argv[1]
+    args = argv[2:]
+    if mode == 'fault':
+        bench_fault(report, int(args[0]) if args else 100000)
+        report.dump(sys.argv)
+        return 0
+    thread_counts = [1, 2, 4, 8]
+    if mode == 'conns':
+        thread_counts = [10, 100, 500]
+    if mode in ('threads', 'batch', 'storm', 'set', 'conns') and args:
+        thread_counts = [int(i) for i in args.pop(0).split(',')]
+    calls = int(args[0]) if args else 100
+    delay_ms = float(args[1]) if len(args) > 1 else 1.0
+    if mode == 'all':
+        delay_ms = float(args[0]) if args else 1.0
+    elif mode == 'protocol':
+        calls = int(args[0]) if args else 10000
+        delay_ms = 0
+    elif mode == 'page':
+        calls = int(args[0]) if args else 1000
+        page_size = int(args[1]) if len(args) > 1 else 100
+        delay_ms = 0
+    elif mode in ('storm', 'set'):
+        calls = int(args[0]) if args else 1000
+    elif mode == 'idle':
+        calls = int(args[0]) if args else 20
+        idle_ms = float(args[1]) if len(args) > 1 else 300
+        delay_ms = 0
+
+    manager = None
+    if not use_manager:
+        manager = fm_api_stand_in.start_stand_in_manager(delay_ms)
+    try:
+        if mode == 'latency':
+            bench_latency(report, calls)
+        elif mode == 'threads':
+            bench_threads(report, thread_counts, calls)
+        elif mode == 'async':
+            bench_async(report, calls)
+        elif mode == 'cache':
+            bench_cache(report, calls)
+        elif mode == 'batch':
+            bench_batch(report, thread_counts, calls)
+        elif mode == 'storm':
+            bench_storm(report, thread_counts, calls)
+        elif mode == 'bulk':
+            bench_bulk(report, calls)
+        elif mode == 'page':
+            bench_page(report, calls, page_size)
+        elif mode == 'stats':
+            bench_stats(report, calls)
+        elif mode == 'idle':
+            bench_idle(report, calls, idle_ms)
+        elif mode == 'set':
+            bench_set(report, thread_counts, calls)
+        elif mode == 'conns':
+            bench_conns(report, thread_counts, calls)
+        elif mode == 'all':
+            bench_all(report)
+        else:
+            bench_protocol(report, calls)
+    finally:
+        if manager is not None:
+            manager.terminate()
+    report.dump(sys.argv)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
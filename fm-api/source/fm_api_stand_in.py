@@ -0,0 +1,364 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Stand-in FM manager for fm_api benchmarks and manual tests.
+
+The stand-in answers the fmMsg.h wire protocol used by fm_core the way
+fmManager does, with the active alarms kept in memory instead of the
+database. Event logs, event suppression, SNMP traps and alarm history
+are not modelled: a log is acknowledged and counted, and every alarm is
+returned by the get requests.
+
+fm_core always connects to 'controller' port 8001; run the stand-in on
+a host where 'controller' resolves to the local machine and fmManager
+is not running.
+
+Usage:
+    python fm_api_stand_in.py [port] [delay-ms]
+
+    port: port to listen on, default 8001
+    delay-ms: time each request is held before it is answered, default 0
+"""
+
+import ctypes
+import multiprocessing
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+import uuid
+
+FM_MGR_PORT = 8001
+FM_MAX_BUFFER_LENGTH = 255
+FM_UUID_LENGTH = 36
+
+# SFmMsgHdrT: version, action, msg_size, msg_rc
+MSG_HDR = struct.Struct('=iiII')
+MSG_LEN = struct.Struct('!I')
+MSG_COUNT = struct.Struct('=I')
+
+# EFmMsgActionsT
+EFM_CREATE_FAULT = 0
+EFM_UPDATE_FAULT = 1
+EFM_DELETE_FAULT = 2
+EFM_DELETE_FAULTS = 3
+EFM_GET_FAULT = 4
+EFM_GET_FAULTS = 5
+EFM_RETURN_UUID = 6
+EFM_GET_FAULTS_BY_ID = 7
+EFM_GET_FAULTS_BY_ID_N_EID = 8
+EFM_CREATE_FAULT_LIST = 9
+EFM_DELETE_FAULT_LIST = 10
+EFM_GET_FAULTS_BY_EIDS = 11
+EFM_GET_FAULTS_BY_IDS = 12
+EFM_GET_FAULTS_PAGE = 13
+EFM_GET_FAULTS_BY_ID_PAGE = 14
+
+# EFmErrorT
+FM_ERR_OK = 0
+FM_ERR_INVALID_REQ = 7
+FM_ERR_ENTITY_NOT_FOUND = 10
+
+FM_ALARM_STATE_MSG = 2
+
+
+class SFmAlarmDataT(ctypes.Structure):
+    _fields_ = [
+        ('uuid', ctypes.c_char * FM_MAX_BUFFER_LENGTH),
+        ('alarm_id', ctypes.c_char * FM_MAX_BUFFER_LENGTH),
+        ('alarm_state', ctypes.c_int),
+        ('entity_type_id', ctypes.c_char * FM_MAX_BUFFER_LENGTH),
+        ('entity_instance_id', ctypes.c_char * FM_MAX_BUFFER_LENGTH),
+        ('timestamp', ctypes.c_uint64),
+        ('severity', ctypes.c_int),
+        ('reason_text', ctypes.c_char * FM_MAX_BUFFER_LENGTH),
+        ('alarm_type', ctypes.c_int),
+        ('probable_cause', ctypes.c_int),
+        ('proposed_repair_action', ctypes.c_char * FM_MAX_BUFFER_LENGTH),
+        ('service_affecting', ctypes.c_ubyte),
+        ('suppression', ctypes.c_ubyte),
+        ('inhibit_alarms', ctypes.c_ubyte),
+        ('keep_existing_alarm', ctypes.c_ubyte),
+    ]
+
+
+class AlarmFilter(ctypes.Structure):
+    _fields_ = [
+        ('alarm_id', ctypes.c_char * FM_MAX_BUFFER_LENGTH),
+        ('entity_instance_id', ctypes.c_char * FM_MAX_BUFFER_LENGTH),
+    ]
+
+
+class SFmAlarmPageT(ctypes.Structure):
+    _fields_ = [
+        ('id', ctypes.c_char * FM_MAX_BUFFER_LENGTH),
+        ('after', AlarmFilter),
+        ('limit', ctypes.c_uint),
+    ]
+
+
+def _unpack_ids(payload):
+    """The FM_MAX_BUFFER_LENGTH sized ids of a request"""
+    return [payload[i:i + FM_MAX_BUFFER_LENGTH].split(b'\0', 1)[0]
+            for i in range(0, len(payload), FM_MAX_BUFFER_LENGTH)]
+
+
+def _unpack_list(struct_type, payload):
+    """The struct_type array of a list request, None if it is malformed"""
+    size = ctypes.sizeof(struct_type)
+    if len(payload) % size:
+        return None
+    return [struct_type.from_buffer_copy(payload, i)
+            for i in range(0, len(payload), size)]
+
+
+class AlarmStore(object):
+    """Active alarms with the matching rules of the fmManager alarm table
+
+    Alarms are keyed by (alarm_id, entity_instance_id). Queries by entity
+    instance id match it as a prefix, like the LIKE 'id%' of fmManager,
+    and an empty entity instance id in a filter stands for ' '.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._alarms = {}
+        self.logs = 0
+
+    def __len__(self):
+        return len(self._alarms)
+
+    @staticmethod
+    def _filter_eid(entity_instance_id):
+        return entity_instance_id or b' '
+
+    def create(self, alarm):
+        """Raise or update alarm, return the uuid of the stored alarm"""
+        if len(alarm.uuid) != FM_UUID_LENGTH:
+            alarm.uuid = str(uuid.uuid4()).encode()
+        if alarm.alarm_state == FM_ALARM_STATE_MSG:
+            with self._lock:
+                self.logs += 1
+            return alarm.uuid
+        keep_existing = alarm.keep_existing_alarm
+        # A control flag of the request, not part of the alarm
+        alarm.keep_existing_alarm = 0
+        key = (alarm.alarm_id, alarm.entity_instance_id)
+        with self._lock:
+            existing = self._alarms.get(key)
+            if existing is not None and keep_existing:
+                return existing.uuid
+            self._alarms[key] = alarm
+        return alarm.uuid
+
+    def _delete(self, match):
+        with self._lock:
+            keys = [key for key in self._alarms if match(*key)]
+            for key in keys:
+                del self._alarms[key]
+        return len(keys)
+
+    def delete(self, alarm_id, entity_instance_id):
+        """Clear alarm_id of entity_instance_id and its children"""
+        if not entity_instance_id:
+            return self._delete(
+                lambda aid, eid: aid == alarm_id and eid == b' ')
+        return self._delete(
+            lambda aid, eid: (aid == alarm_id and
+                              eid.startswith(entity_instance_id)))
+
+    def delete_all(self, entity_instance_id):
+        """Clear every alarm of entity_instance_id and its children"""
+        return self._delete(
+            lambda aid, eid: eid.startswith(entity_instance_id))
+
+    def get(self, alarm_id, entity_instance_id):
+        return self._alarms.get(
+            (alarm_id, self._filter_eid(entity_instance_id)))
+
+    def find(self, match):
+        with self._lock:
+            return [alarm for key, alarm in self._alarms.items()
+                    if match(*key)]
+
+    def page(self, page, by_id):
+        """One page of alarms in (entity_instance_id, alarm_id) order"""
+        after = (page.after.entity_instance_id, page.after.alarm_id)
+        if by_id:
+            found = self.find(lambda aid, eid: aid == page.id)
+        else:
+            found = self.find(lambda aid, eid: eid.startswith(page.id))
+        found = sorted(
+            ((alarm.entity_instance_id, alarm.alarm_id), alarm)
+            for alarm in found)
+        if page.after.alarm_id:
+            found = [item for item in found if item[0] > after]
+        return [alarm for _, alarm in found[:page.limit]]
+
+
+class StandInManagerHandler(socketserver.BaseRequestHandler):
+    """Answer the requests of one fm_core connection"""
+
+    def reply_alarms(self, alarms):
+        if not alarms:
+            return FM_ERR_ENTITY_NOT_FOUND, b''
+        return FM_ERR_OK, MSG_COUNT.pack(len(alarms)) + b''.join(
+            bytes(alarm) for alarm in alarms)
+
+    def process(self, action, payload):
+        """rc and payload of the response to action"""
+        store = self.server.store
+        if action == EFM_CREATE_FAULT:
+            if len(payload) != ctypes.sizeof(SFmAlarmDataT):
+                return FM_ERR_INVALID_REQ, b''
+            alarm = SFmAlarmDataT.from_buffer_copy(payload)
+            return FM_ERR_OK, store.create(alarm).ljust(
+                FM_MAX_BUFFER_LENGTH, b'\0')
+        if action == EFM_CREATE_FAULT_LIST:
+            alarms = _unpack_list(SFmAlarmDataT, payload)
+            if alarms is None:
+                return FM_ERR_INVALID_REQ, b''
+            for alarm in alarms:
+                store.create(alarm)
+            return FM_ERR_OK, b''
+        if action in (EFM_DELETE_FAULT, EFM_GET_FAULT,
+                      EFM_GET_FAULTS_BY_ID_N_EID):
+            if len(payload) != ctypes.sizeof(AlarmFilter):
+                return FM_ERR_INVALID_REQ, b''
+            alarm_filter = AlarmFilter.from_buffer_copy(payload)
+            aid = alarm_filter.alarm_id
+            eid = alarm_filter.entity_instance_id
+            if action == EFM_DELETE_FAULT:
+                if store.delete(aid, eid):
+                    return FM_ERR_OK, b''
+                return FM_ERR_ENTITY_NOT_FOUND, b''
+            if action == EFM_GET_FAULT:
+                alarm = store.get(aid, eid)
+                if alarm is None:
+                    return FM_ERR_ENTITY_NOT_FOUND, b''
+                return FM_ERR_OK, bytes(alarm)
+            return self.reply_alarms(store.find(
+                lambda a, e: a == aid and e.startswith(eid)))
+        if action == EFM_DELETE_FAULT_LIST:
+            filters = _unpack_list(AlarmFilter, payload)
+            if filters is None:
+                return FM_ERR_INVALID_REQ, b''
+            for alarm_filter in filters:
+                store.delete(alarm_filter.alarm_id,
+                             alarm_filter.entity_instance_id)
+            return FM_ERR_OK, b''
+        if action in (EFM_DELETE_FAULTS, EFM_GET_FAULTS,
+                      EFM_GET_FAULTS_BY_ID):
+            if len(payload) != FM_MAX_BUFFER_LENGTH:
+                return FM_ERR_INVALID_REQ, b''
+            target = _unpack_ids(payload)[0]
+            if action == EFM_DELETE_FAULTS:
+                if store.delete_all(target):
+                    return FM_ERR_OK, b''
+                return FM_ERR_ENTITY_NOT_FOUND, b''
+            if action == EFM_GET_FAULTS:
+                return self.reply_alarms(store.find(
+                    lambda a, e: e.startswith(target)))
+            return self.reply_alarms(store.find(
+                lambda a, e: a == target))
+        if action in (EFM_GET_FAULTS_BY_EIDS, EFM_GET_FAULTS_BY_IDS):
+            if not payload or len(payload) % FM_MAX_BUFFER_LENGTH:
+                return FM_ERR_INVALID_REQ, b''
+            if action == EFM_GET_FAULTS_BY_IDS:
+                targets = set(_unpack_ids(payload))
+                return self.reply_alarms(store.find(
+                    lambda a, e: a in targets))
+            targets = tuple(_unpack_ids(payload))
+            return self.reply_alarms(store.find(
+                lambda a, e: e.startswith(targets)))
+        if action in (EFM_GET_FAULTS_PAGE, EFM_GET_FAULTS_BY_ID_PAGE):
+            if len(payload) != ctypes.sizeof(SFmAlarmPageT):
+                return FM_ERR_INVALID_REQ, b''
+            page = SFmAlarmPageT.from_buffer_copy(payload)
+            return self.reply_alarms(store.page(
+                page, action == EFM_GET_FAULTS_BY_ID_PAGE))
+        return FM_ERR_INVALID_REQ, b''
+
+    def handle(self):
+        while True:
+            length = self.recv_all(MSG_LEN.size)
+            if length is None:
+                return
+            packet = self.recv_all(MSG_LEN.unpack(length)[0])
+            if packet is None:
+                return
+            version, action, _, _ = MSG_HDR.unpack_from(packet)
+            if self.server.delay:
+                time.sleep(self.server.delay)
+            rc, payload = self.process(action, packet[MSG_HDR.size:])
+            resp = MSG_HDR.pack(version, action, len(payload), rc) + payload
+            self.request.sendall(MSG_LEN.pack(len(resp)) + resp)
+
+    def recv_all(self, length):
+        data = b''
+        while len(data) < length:
+            chunk = self.request.recv(length - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+
+class StandInManager(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """fmManager stand-in serving each connection from its own thread"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+    # fmManager listens with a SOMAXCONN backlog, the default of 5 drops
+    # the connections of many clients starting at once
+    request_queue_size = socket.SOMAXCONN
+
+    def __init__(self, port=FM_MGR_PORT, delay_ms=0):
+        socketserver.TCPServer.__init__(self, ('', port),
+                                        StandInManagerHandler)
+        self.store = AlarmStore()
+        self.delay = delay_ms / 1000.0
+
+
+def run_stand_in_manager(port=FM_MGR_PORT, delay_ms=0, ready=None):
+    server = StandInManager(port, delay_ms)
+    if ready is not None:
+        ready.set()
+    server.serve_forever()
+
+
+def start_stand_in_manager(delay_ms=0, port=FM_MGR_PORT):
+    """Run a stand-in manager in a child process, return the process
+
+    The caller terminates the process when it is done with it.
+    """
+    ready = multiprocessing.Event()
+    proc = multiprocessing.Process(target=run_stand_in_manager,
+                                   args=(port, delay_ms, ready),
+                                   daemon=True)
+    proc.start()
+    ready.wait()
+    return proc
+
+
+def main(argv):
+    try:
+        port = int(argv[1]) if len(argv) > 1 else FM_MGR_PORT
+        delay_ms = float(argv[2]) if len(argv) > 2 else 0
+    except ValueError:
+        print(__doc__)
+        return 1
+    try:
+        run_stand_in_manager(port, delay_ms)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
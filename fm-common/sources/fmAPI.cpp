@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2017, 2024-2025 Wind River Systems, Inc.
+// Copyright (c) 2017, 2024-2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -38,10 +38,6 @@
   if (!fm_valid_srv_msg(hdr,sizeof(neededstruct)))  \
     return FM_ERR_COMMUNICATIONS
 
-#define CHECK_LIST_FULL(l) \
-  if (l.size() == MAX_PENDING_REQUEST)          \
-    return FM_ERR_NOT_ENOUGH_SPACE
-
 #define CHECK_LIST_NOT_EMPTY(l) \
   if (l.size() != 0)                            \
     return FM_ERR_REQUEST_PENDING
@@ -49,6 +45,7 @@
 static CFmSocket m_client;
 static bool m_connected = false;
 static bool m_thread = false;
+static SFmAsyncStatsT m_async_stats;
 
 typedef std::list<fm_buff_t>  FmRequestListT;
 
@@ -65,6 +62,13 @@ static CFmMutex & getListMutex() {
 }
 
 
+// Signalled when an async request is queued
+static CFmCondition & getListCond() {
+  static CFmCondition *c = new CFmCondition;
+  return *c;
+}
+
+
 static CFmMutex & getThreadMutex() {
   static CFmMutex *m = new CFmMutex;
   return *m;
@@ -83,23 +87,35 @@ CFmMutex & getAPIMutex() {
 }
 
 
-static void enqueue(fm_buff_t &req) {
+static EFmErrorT enqueue(fm_buff_t &req) {
   CFmMutexGuard m(getListMutex());
+  if (GetListOfFmRequests().size() >= MAX_PENDING_REQUEST) {
+    m_async_stats.dropped++;
+    return FM_ERR_NOT_ENOUGH_SPACE;
+  }
   GetListOfFmRequests().push_back(req);
+  m_async_stats.enqueued++;
+  getListCond().signal();
+  return FM_ERR_OK;
 }
 
 
-static bool dequeue(fm_buff_t &req) {
+// Wait for the next async request
+static void dequeue(fm_buff_t &req) {
   CFmMutexGuard m(getListMutex());
-  if (GetListOfFmRequests().size() == 0) {
-    return false;
+  while (GetListOfFmRequests().size() == 0) {
+    getListCond().wait(getListMutex());
   }
 
-  FmRequestListT::iterator it = GetListOfFmRequests().begin();
   req.clear();
-  req = (*it);
+  req = GetListOfFmRequests().front();
   GetListOfFmRequests().pop_front();
-  return true;
+}
+
+
+static void request_sent() {
+  CFmMutexGuard m(getListMutex());
+  m_async_stats.sent++;
 }
 
 
@@ -187,36 +203,34 @@ static void fmApiJobHandlerThread(void *context) {
 
   while (true) {
     fm_buff_t buff;
-    buff.clear();
-    while (dequeue(buff)) {
-      while (true) {
-        while (!fm_lib_reconnect()) {
-          fmThreadSleep(200);
-        }
-        fm_log_request(buff);
-        // protect from other sync APIs to access the same socket
-        CFmMutexGuard m(getAPIMutex());
-        if(m_client.write_packet(buff)) {
-          fm_buff_t in_buff;
-          in_buff.clear();
-          if(!m_client.read_packet(in_buff)) {
-            // retry after read failure
-            fm_log_response(buff, in_buff, true);
-            m_connected = false;
-            continue;
-          } else {
-            fm_log_response(buff, in_buff);
-            break;
-          }
-        } else {
-          // retry after write failure
-          fm_log_request(buff, true);
+    dequeue(buff);
+    while (true) {
+      while (!fm_lib_reconnect()) {
+        fmThreadSleep(200);
+      }
+      fm_log_request(buff);
+      // protect from other sync APIs to access the same socket
+      CFmMutexGuard m(getAPIMutex());
+      if(m_client.write_packet(buff)) {
+        fm_buff_t in_buff;
+        in_buff.clear();
+        if(!m_client.read_packet(in_buff)) {
+          // retry after read failure
+          fm_log_response(buff, in_buff, true);
           m_connected = false;
           continue;
+        } else {
+          fm_log_response(buff, in_buff);
+          request_sent();
+          break;
         }
+      } else {
+        // retry after write failure
+        fm_log_request(buff, true);
+        m_connected = false;
+        continue;
       }
     }
-    fmThreadSleep(50);
   }
 }
 
@@ -641,6 +655,121 @@ EFmErrorT fm_get_faults_by_id_n_eid(AlarmFilter *filter,
   return FM_ERR_OK;
 }
 
+// Send a get request and read back the alarm list of the response
+static EFmErrorT fm_get_alarm_list(EFmMsgActionsT act, const void *data,
+                                   uint32_t len, SFmAlarmDataT *alarm,
+                                   unsigned int *max_alarms_to_get) {
+
+  CFmMutexGuard m(getAPIMutex());
+  if (!fm_lib_reconnect()) return FM_ERR_NOCONNECT;
+  fm_check_thread_pending_request();
+
+  fm_buff_t buff;
+  buff.clear();
+  EFmErrorT erc = fm_msg_utils_prep_requet_msg(buff, act, data, len);
+  if (erc!=FM_ERR_OK) return erc;
+
+  if (m_client.write_packet(buff)) {
+    if (!m_client.read_packet(buff)) {
+      m_connected = false;
+      return FM_ERR_NOCONNECT;
+    }
+
+    if (ptr_to_hdr(buff)->msg_rc != FM_ERR_OK){
+      *max_alarms_to_get = 0;
+      EFmErrorT rc = (EFmErrorT)ptr_to_hdr(buff)->msg_rc;
+      return rc;
+    }
+
+    uint32_t pkt_size = ptr_to_hdr(buff)->msg_size;
+    if (pkt_size < sizeof(uint32_t)) {
+      FM_ERROR_LOG("Received invalid pkt size: %u\n",pkt_size );
+      m_connected = false;
+      return FM_ERR_COMMUNICATIONS;
+    }
+    pkt_size-=sizeof(uint32_t);
+
+    char *dptr = (char*)ptr_to_data(buff);
+
+    uint32_t *len = (uint32_t*)dptr;
+    dptr+=sizeof(uint32_t);
+    if (*max_alarms_to_get < *len) {
+      return FM_ERR_NOT_ENOUGH_SPACE;
+    }
+    if (pkt_size < (*len*sizeof(SFmAlarmDataT)) ) {
+      return FM_ERR_COMMUNICATIONS;
+    }
+    *max_alarms_to_get = *len;
+    memcpy(alarm,dptr,*len*sizeof(SFmAlarmDataT));
+  } else {
+    m_connected = false;
+    return FM_ERR_NOCONNECT;
+  }
+
+  return FM_ERR_OK;
+}
+
+/**
+ * Retrieves the alarms of several entity instance ids with one request.
+ *
+ * Returns the alarms fm_get_faults() returns for any of the ids, each id
+ * matching as a prefix and each alarm once, with a single round trip and
+ * DB query.
+ *
+ * **Parameters:**
+ * - `inst_ids`: An array of `num_ids` entity instance ids.
+ * - `alarm`: An array of `SFmAlarmDataT` structures where the retrieved
+ * alarms will be stored.
+ * - `max_alarms_to_get`: On input, the size of `alarm`. On output, the
+ * number of alarms retrieved.
+ */
+EFmErrorT fm_get_faults_by_eids(fm_ent_inst_t *inst_ids, unsigned int num_ids,
+                                SFmAlarmDataT *alarm,
+                                unsigned int *max_alarms_to_get) {
+  if (num_ids == 0) return FM_ERR_INVALID_PARAMETER;
+  return fm_get_alarm_list(EFmGetFaultsByEids, inst_ids, num_ids * FM_MAX_BUFFER_LENGTH,
+                           alarm, max_alarms_to_get);
+}
+
+/**
+ * Retrieves the alarms of several alarm ids with one request.
+ *
+ * Returns the same alarms as one fm_get_faults_by_id() call per id, with
+ * a single round trip and DB query. Parameters as for
+ * fm_get_faults_by_eids().
+ */
+EFmErrorT fm_get_faults_by_ids(fm_alarm_id *alarm_ids, unsigned int num_ids,
+                               SFmAlarmDataT *alarm,
+                               unsigned int *max_alarms_to_get) {
+  if (num_ids == 0) return FM_ERR_INVALID_PARAMETER;
+  return fm_get_alarm_list(EFmGetFaultsByIds, alarm_ids, num_ids * FM_MAX_BUFFER_LENGTH,
+                           alarm, max_alarms_to_get);
+}
+
+/**
+ * Retrieves one page of the alarms of an entity instance id (prefix, as
+ * for fm_get_faults()) or of an alarm id.
+ *
+ * Alarms are ordered by entity instance id and alarm id. A page holds up
+ * to `page->limit` alarms following the alarm `page->after`; leave
+ * `page->after` empty for the first page, and set it to the last alarm
+ * received to get the next one. `max_alarms_to_get` must be at least
+ * `page->limit`.
+ */
+EFmErrorT fm_get_faults_page(SFmAlarmPageT *page, SFmAlarmDataT *alarm,
+                             unsigned int *max_alarms_to_get) {
+  if (page->limit == 0) return FM_ERR_INVALID_PARAMETER;
+  return fm_get_alarm_list(EFmGetFaultsPage, page, sizeof(*page),
+                           alarm, max_alarms_to_get);
+}
+
+EFmErrorT fm_get_faults_by_id_page(SFmAlarmPageT *page, SFmAlarmDataT *alarm,
+                                   unsigned int *max_alarms_to_get) {
+  if (page->limit == 0) return FM_ERR_INVALID_PARAMETER;
+  return fm_get_alarm_list(EFmGetFaultsByIdPage, page, sizeof(*page),
+                           alarm, max_alarms_to_get);
+}
+
 
 /*
  * APIs that enqueue the request and return ok for acknowledgment.
@@ -649,7 +778,6 @@ EFmErrorT fm_get_faults_by_id_n_eid(AlarmFilter *filter,
 EFmErrorT fm_set_fault_async(const SFmAlarmDataT *alarm, fm_uuid_t *uuid) {
 
   if ( !fm_lib_thread()) return FM_ERR_RESOURCE_UNAVAILABLE;
-  CHECK_LIST_FULL(GetListOfFmRequests());
 
   fm_uuid_t id;
   fm_buff_t buff;
@@ -660,9 +788,14 @@ EFmErrorT fm_set_fault_async(const SFmAlarmDataT *alarm, fm_uuid_t *uuid) {
   if (erc != FM_ERR_OK) return erc;
   memcpy(ptr_to_data(buff), id, sizeof(fm_uuid_t)-1);
 
+  erc = enqueue(buff);
+  if (erc != FM_ERR_OK) {
+    FM_WARNING_LOG("Request queue full, drop raise alarm request: alarm id (%s) instant id (%s)",
+                   alarm->alarm_id, alarm->entity_instance_id);
+    return erc;
+  }
   FM_INFO_LOG("Enqueue raise alarm request: UUID (%s) alarm id (%s) instant id (%s)",
               id, alarm->alarm_id, alarm->entity_instance_id);
-  enqueue(buff);
 
   if (uuid != NULL) {
     memcpy(*uuid,id,sizeof(*uuid)-1);
@@ -674,7 +807,6 @@ EFmErrorT fm_set_fault_async(const SFmAlarmDataT *alarm, fm_uuid_t *uuid) {
 EFmErrorT fm_clear_fault_async(AlarmFilter *filter) {
 
   if ( !fm_lib_thread()) return FM_ERR_RESOURCE_UNAVAILABLE;
-  CHECK_LIST_FULL(GetListOfFmRequests());
 
   fm_buff_t buff;
   buff.clear();
@@ -682,9 +814,14 @@ EFmErrorT fm_clear_fault_async(AlarmFilter *filter) {
                                                filter, sizeof(*filter));
   if (erc!=FM_ERR_OK) return erc;
 
+  erc = enqueue(buff);
+  if (erc != FM_ERR_OK) {
+    FM_WARNING_LOG("Request queue full, drop clear alarm request: alarm id (%s), instant id (%s)",
+                   filter->alarm_id, filter->entity_instance_id);
+    return erc;
+  }
   FM_INFO_LOG("Enqueue clear alarm request: alarm id (%s), instant id (%s)",
               filter->alarm_id, filter->entity_instance_id);
-  enqueue(buff);
 
   return FM_ERR_OK;
 }
@@ -693,7 +830,6 @@ EFmErrorT fm_clear_fault_async(AlarmFilter *filter) {
 EFmErrorT fm_clear_all_async(fm_ent_inst_t *inst_id) {
 
   if ( !fm_lib_thread()) return FM_ERR_RESOURCE_UNAVAILABLE;
-  CHECK_LIST_FULL(GetListOfFmRequests());
 
   fm_buff_t buff;
   buff.clear();
@@ -701,8 +837,24 @@ EFmErrorT fm_clear_all_async(fm_ent_inst_t *inst_id) {
                                                (*inst_id), sizeof(*inst_id));
   if (erc!=FM_ERR_OK) return erc;
 
+  erc = enqueue(buff);
+  if (erc != FM_ERR_OK) {
+    FM_WARNING_LOG("Request queue full, drop clear all alarm request: instant id (%s)",
+                   *inst_id);
+    return erc;
+  }
   FM_INFO_LOG("Enqueue clear all alarm request: instant id (%s)", *inst_id);
-  enqueue(buff);
+  return FM_ERR_OK;
+}
+
+
+EFmErrorT fm_get_async_stats(SFmAsyncStatsT *stats) {
+
+  if (stats == NULL) return FM_ERR_INVALID_PARAMETER;
+
+  CFmMutexGuard m(getListMutex());
+  *stats = m_async_stats;
+  stats->pending = GetListOfFmRequests().size();
   return FM_ERR_OK;
 }
 
@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2017, 2024-2025 Wind River Systems, Inc.
+// Copyright (c) 2017, 2024-2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -190,6 +190,21 @@ typedef struct {
   fm_ent_inst_t entity_instance_id;
 }AlarmFilter;
 
+/* One page of a paged alarm query */
+typedef struct {
+  char id[FM_MAX_BUFFER_LENGTH];   //entity instance id or alarm id queried
+  AlarmFilter after;               //last alarm of the previous page
+  unsigned int limit;              //max alarms in the page
+}SFmAlarmPageT;
+
+/* Counters of the queue behind the async APIs */
+typedef struct {
+  unsigned int pending;            //requests waiting to be sent
+  unsigned long long enqueued;     //requests accepted into the queue
+  unsigned long long sent;         //requests acknowledged by the FM Manager
+  unsigned long long dropped;      //requests rejected because the queue was full
+}SFmAsyncStatsT;
+
 
 /*
  * APIs to create, clear and query alarms.
@@ -216,6 +231,20 @@ EFmErrorT fm_get_faults_by_id_n_eid(AlarmFilter *filter,
                                     SFmAlarmDataT *alarm,
                                     unsigned int *max_alarms_to_get);
 
+EFmErrorT fm_get_faults_by_eids(fm_ent_inst_t *inst_ids, unsigned int num_ids,
+                                SFmAlarmDataT *alarm,
+                                unsigned int *max_alarms_to_get);
+
+EFmErrorT fm_get_faults_by_ids(fm_alarm_id *alarm_ids, unsigned int num_ids,
+                               SFmAlarmDataT *alarm,
+                               unsigned int *max_alarms_to_get);
+
+EFmErrorT fm_get_faults_page(SFmAlarmPageT *page, SFmAlarmDataT *alarm,
+                             unsigned int *max_alarms_to_get);
+
+EFmErrorT fm_get_faults_by_id_page(SFmAlarmPageT *page, SFmAlarmDataT *alarm,
+                                   unsigned int *max_alarms_to_get);
+
 
 /*
  * APIs that enqueue the request and return ok for acknowledgment.
@@ -228,6 +257,8 @@ EFmErrorT fm_clear_fault_async(AlarmFilter *filter);
 
 EFmErrorT fm_clear_all_async(fm_ent_inst_t *inst_id);
 
+EFmErrorT fm_get_async_stats(SFmAsyncStatsT *stats);
+
 //used by fmManager
 EFmErrorT fm_server_create(const char *fn) ;
 
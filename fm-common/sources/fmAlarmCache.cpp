@@ -0,0 +1,335 @@
+//
+// Copyright (c) 2026 Wind River Systems, Inc.
+//
+// SPDX-License-Identifier: Apache-2.0
+//
+
+#include <string.h>
+
+#include "fmAlarmCache.h"
+#include "fmAlarmUtils.h"
+#include "fmConstants.h"
+#include "fmDbAlarm.h"
+#include "fmDbUtils.h"
+#include "fmLog.h"
+
+static bool starts_with(const std::string &s, const std::string &prefix) {
+	return s.compare(0, prefix.size(), prefix) == 0;
+}
+
+// Entity instance id an alarm filter matches, an empty one stands for ' '
+static std::string filter_eid(const AlarmFilter &af) {
+	if (strlen(af.entity_instance_id) == 0)
+		return " ";
+	return af.entity_instance_id;
+}
+
+// Whether the DB columns of two alarms are the same
+static bool same_alarm(const SFmAlarmDataT &a, const SFmAlarmDataT &b) {
+	std::string va, vb;
+
+	for (int ix = FM_ALM_IX_UUID; ix < FM_ALM_IX_KEEP_EXISTING_ALARM; ++ix) {
+		fm_alarm_get_field((EFmAlarmIndexMap)ix, &a, va);
+		fm_alarm_get_field((EFmAlarmIndexMap)ix, &b, vb);
+		if (va != vb)
+			return false;
+	}
+	return true;
+}
+
+static bool query_unsuppressed(CFmDBSession &sess,
+		std::set<std::string> &ids) {
+	fm_db_result_t res;
+	std::string sql = "SELECT " FM_EVENT_SUPPRESSION_COLUMN_ALARM_ID
+			" FROM " FM_EVENT_SUPPRESSION_TABLE_NAME " WHERE "
+			FM_EVENT_SUPPRESSION_COLUMN_SUPPRESSION_STATUS " = '"
+			FM_EVENT_SUPPRESSION_UNSUPPRESSED "'";
+
+	if (!sess.query(sql.c_str(), res))
+		return false;
+	for (size_t ix = 0; ix < res.size(); ++ix)
+		ids.insert(res[ix][FM_EVENT_SUPPRESSION_COLUMN_ALARM_ID]);
+	return true;
+}
+
+CFmAlarmCache::CFmAlarmCache() : m_valid(false), m_generation(0) {
+}
+
+// Load the alarm table and the suppression status of the alarm ids. Once
+// the cache is loaded, the alarms it got wrong are logged, they were
+// changed in the DB by others than fmManager. The load is dropped if the
+// cache is updated while the table is read, the next call retries.
+bool CFmAlarmCache::reconcile(CFmDBSession &sess) {
+	unsigned long generation;
+	{
+		CFmMutexGuard m(m_mutex);
+		generation = m_generation;
+	}
+
+	fm_db_result_t res;
+	std::set<std::string> unsuppressed;
+	std::string sql = FM_DB_SELECT_FROM_TABLE(FM_ALARM_TABLE_NAME);
+	if (!sess.query(sql.c_str(), res) || !query_unsuppressed(sess, unsuppressed))
+		return false;
+
+	alarm_map_t alarms;
+	for (size_t ix = 0; ix < res.size(); ++ix) {
+		SFmAlarmDataT alarm;
+		CFmDbAlarm::convert_to(res[ix], &alarm);
+		alarms[alarm_key_t(alarm.entity_instance_id, alarm.alarm_id)] = alarm;
+	}
+
+	CFmMutexGuard m(m_mutex);
+	if (m_generation != generation) {
+		FM_DEBUG_LOG("Alarm cache updated while reloading, retry later\n");
+		return false;
+	}
+	if (m_valid) {
+		size_t stale = 0;
+		alarm_map_t::iterator it = m_alarms.begin();
+		for (; it != m_alarms.end(); ++it) {
+			alarm_map_t::iterator db = alarms.find(it->first);
+			if ((db == alarms.end()) || !same_alarm(it->second, db->second))
+				stale++;
+		}
+		for (it = alarms.begin(); it != alarms.end(); ++it) {
+			if (m_alarms.find(it->first) == m_alarms.end())
+				stale++;
+		}
+		if (stale > 0)
+			FM_WARNING_LOG("Alarm cache: (%zu) alarms differed from the DB\n",
+					stale);
+	}
+
+	m_alarms.clear();
+	m_by_id.clear();
+	for (alarm_map_t::iterator it = alarms.begin(); it != alarms.end(); ++it)
+		add(it->second);
+	m_unsuppressed.swap(unsuppressed);
+	if (!m_valid)
+		FM_INFO_LOG("Alarm cache loaded: (%zu) alarms\n", m_alarms.size());
+	m_valid = true;
+	return true;
+}
+
+// Reload the suppression status of the alarm ids
+bool CFmAlarmCache::load_suppression(CFmDBSession &sess) {
+	std::set<std::string> unsuppressed;
+
+	if (!query_unsuppressed(sess, unsuppressed))
+		return false;
+	CFmMutexGuard m(m_mutex);
+	m_unsuppressed.swap(unsuppressed);
+	return true;
+}
+
+// Serve the gets from the DB until the next reconcile()
+void CFmAlarmCache::invalidate() {
+	CFmMutexGuard m(m_mutex);
+	m_generation++;
+	m_valid = false;
+}
+
+void CFmAlarmCache::add(const SFmAlarmDataT &alarm) {
+	SFmAlarmDataT &a = m_alarms[alarm_key_t(alarm.entity_instance_id,
+			alarm.alarm_id)];
+	a = alarm;
+	// a control field, not a DB column
+	a.keep_existing_alarm = FM_FALSE;
+	m_by_id[alarm.alarm_id].insert(alarm.entity_instance_id);
+}
+
+void CFmAlarmCache::remove(alarm_map_t::iterator it) {
+	alarm_index_t::iterator id = m_by_id.find(it->first.second);
+	if (id != m_by_id.end()) {
+		id->second.erase(it->first.first);
+		if (id->second.empty())
+			m_by_id.erase(id);
+	}
+	m_alarms.erase(it);
+}
+
+// The alarm was raised, or updated, in the DB
+void CFmAlarmCache::set_alarm(const SFmAlarmDataT &alarm) {
+	CFmMutexGuard m(m_mutex);
+	m_generation++;
+	add(alarm);
+}
+
+// The alarms matching af were deleted from the DB, the alarm of the
+// entity instance id and of its children
+void CFmAlarmCache::delete_alarm(const AlarmFilter &af) {
+	CFmMutexGuard m(m_mutex);
+	std::string eid = filter_eid(af);
+	std::set<alarm_key_t> keys;
+
+	m_generation++;
+	if (strlen(af.entity_instance_id) == 0) {
+		keys.insert(alarm_key_t(eid, af.alarm_id));
+	} else {
+		collect(eid, af.alarm_id, keys);
+	}
+	for (std::set<alarm_key_t>::iterator it = keys.begin(); it != keys.end(); ++it) {
+		alarm_map_t::iterator a = m_alarms.find(*it);
+		if (a != m_alarms.end())
+			remove(a);
+	}
+}
+
+// All the alarms of the entity instance id and of its children were
+// deleted from the DB
+void CFmAlarmCache::delete_alarms(const char *entity_instance_id) {
+	CFmMutexGuard m(m_mutex);
+	std::string prefix = entity_instance_id;
+
+	m_generation++;
+	alarm_map_t::iterator it = m_alarms.lower_bound(alarm_key_t(prefix, ""));
+	while ((it != m_alarms.end()) && starts_with(it->first.first, prefix)) {
+		remove(it++);
+	}
+}
+
+bool CFmAlarmCache::has_alarm(const SFmAlarmDataT &alarm) {
+	CFmMutexGuard m(m_mutex);
+	return m_alarms.find(alarm_key_t(alarm.entity_instance_id,
+			alarm.alarm_id)) != m_alarms.end();
+}
+
+// Keys of the alarms of the entity instance ids starting with prefix, of
+// alarm_id if not NULL
+void CFmAlarmCache::collect(const std::string &prefix, const char *alarm_id,
+		std::set<alarm_key_t> &keys) {
+	alarm_map_t::iterator it = m_alarms.lower_bound(alarm_key_t(prefix, ""));
+	for (; (it != m_alarms.end()) && starts_with(it->first.first, prefix); ++it) {
+		if ((alarm_id == NULL) || (it->first.second == alarm_id))
+			keys.insert(it->first);
+	}
+}
+
+// Copy the alarms of keys, leaving out the suppressed ones as the DB
+// queries joining the event_suppression table do
+void CFmAlarmCache::copy(const std::set<alarm_key_t> &keys,
+		alarm_list_t &alarms) {
+	std::set<alarm_key_t>::const_iterator it = keys.begin();
+	for (; it != keys.end(); ++it) {
+		if (m_unsuppressed.find(it->second) != m_unsuppressed.end())
+			alarms.push_back(m_alarms[*it]);
+	}
+}
+
+bool CFmAlarmCache::get_alarm(const AlarmFilter &af, alarm_list_t &alarms) {
+	CFmMutexGuard m(m_mutex);
+	if (!m_valid)
+		return false;
+	alarm_map_t::iterator it =
+			m_alarms.find(alarm_key_t(filter_eid(af), af.alarm_id));
+	if (it != m_alarms.end())
+		alarms.push_back(it->second);
+	return true;
+}
+
+bool CFmAlarmCache::get_alarms(const char *entity_instance_id,
+		alarm_list_t &alarms) {
+	CFmMutexGuard m(m_mutex);
+	std::set<alarm_key_t> keys;
+
+	if (!m_valid)
+		return false;
+	collect(entity_instance_id ? entity_instance_id : "", NULL, keys);
+	copy(keys, alarms);
+	return true;
+}
+
+void CFmAlarmCache::copy_by_id(const std::string &alarm_id,
+		alarm_list_t &alarms) {
+	alarm_index_t::iterator id = m_by_id.find(alarm_id);
+	if (id == m_by_id.end())
+		return;
+	std::set<std::string>::iterator it = id->second.begin();
+	for (; it != id->second.end(); ++it)
+		alarms.push_back(m_alarms[alarm_key_t(*it, alarm_id)]);
+}
+
+bool CFmAlarmCache::get_alarms_by_id(const char *alarm_id,
+		alarm_list_t &alarms) {
+	CFmMutexGuard m(m_mutex);
+
+	if (!m_valid)
+		return false;
+	copy_by_id(alarm_id, alarms);
+	return true;
+}
+
+bool CFmAlarmCache::get_alarms_by_id_n_eid(const AlarmFilter &af,
+		alarm_list_t &alarms) {
+	CFmMutexGuard m(m_mutex);
+	std::set<alarm_key_t> keys;
+
+	if (!m_valid)
+		return false;
+	collect(af.entity_instance_id, af.alarm_id, keys);
+	copy(keys, alarms);
+	return true;
+}
+
+bool CFmAlarmCache::get_alarms_by_eids(const std::vector<std::string> &ids,
+		alarm_list_t &alarms) {
+	CFmMutexGuard m(m_mutex);
+	std::set<alarm_key_t> keys;
+
+	if (!m_valid)
+		return false;
+	// an alarm matching several of the ids is returned once
+	for (size_t ix = 0; ix < ids.size(); ++ix)
+		collect(ids[ix], NULL, keys);
+	copy(keys, alarms);
+	return true;
+}
+
+bool CFmAlarmCache::get_alarms_by_ids(const std::vector<std::string> &ids,
+		alarm_list_t &alarms) {
+	CFmMutexGuard m(m_mutex);
+	std::set<std::string> unique(ids.begin(), ids.end());
+
+	if (!m_valid)
+		return false;
+	std::set<std::string>::iterator it = unique.begin();
+	for (; it != unique.end(); ++it)
+		copy_by_id(*it, alarms);
+	return true;
+}
+
+bool CFmAlarmCache::get_alarms_page(const SFmAlarmPageT &page, bool by_id,
+		alarm_list_t &alarms) {
+	CFmMutexGuard m(m_mutex);
+	bool has_after = (strlen(page.after.alarm_id) > 0);
+	alarm_key_t after(page.after.entity_instance_id, page.after.alarm_id);
+
+	if (!m_valid)
+		return false;
+
+	if (by_id) {
+		alarm_index_t::iterator id = m_by_id.find(page.id);
+		if (id == m_by_id.end())
+			return true;
+		std::set<std::string>::iterator it = has_after ?
+				id->second.lower_bound(after.first) : id->second.begin();
+		for (; (it != id->second.end()) && (alarms.size() < page.limit); ++it) {
+			alarm_key_t key(*it, page.id);
+			if (!has_after || (after < key))
+				alarms.push_back(m_alarms[key]);
+		}
+		return true;
+	}
+
+	std::string prefix = page.id;
+	alarm_key_t first(prefix, "");
+	alarm_map_t::iterator it = (has_after && !(after < first)) ?
+			m_alarms.upper_bound(after) : m_alarms.lower_bound(first);
+	for (; (it != m_alarms.end()) && starts_with(it->first.first, prefix) &&
+			(alarms.size() < page.limit); ++it) {
+		if (m_unsuppressed.find(it->first.second) != m_unsuppressed.end())
+			alarms.push_back(it->second);
+	}
+	return true;
+}
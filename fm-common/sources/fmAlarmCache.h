@@ -0,0 +1,76 @@
+//
+// Copyright (c) 2026 Wind River Systems, Inc.
+//
+// SPDX-License-Identifier: Apache-2.0
+//
+
+#ifndef FMALARMCACHE_H_
+#define FMALARMCACHE_H_
+
+#include <map>
+#include <set>
+#include <string>
+#include <vector>
+
+#include "fmAPI.h"
+#include "fmDb.h"
+#include "fmMutex.h"
+
+/*
+ * In-memory copy of the alarm table, so that get requests are served
+ * without querying the DB.
+ *
+ * fmManager updates it after each alarm it writes. It is reloaded from the
+ * DB periodically, which reconciles it with the changes others made to the
+ * alarm table, such as the REST API. The getters return the same alarms as
+ * the CFmDbAlarmOperation getters of the same name, and false while the
+ * cache is not loaded, in which case the caller queries the DB.
+ */
+class CFmAlarmCache {
+public:
+	typedef std::vector<SFmAlarmDataT> alarm_list_t;
+
+	CFmAlarmCache();
+
+	bool reconcile(CFmDBSession &sess);
+	bool load_suppression(CFmDBSession &sess);
+	void invalidate();
+
+	void set_alarm(const SFmAlarmDataT &alarm);
+	void delete_alarm(const AlarmFilter &af);
+	void delete_alarms(const char *entity_instance_id);
+	bool has_alarm(const SFmAlarmDataT &alarm);
+
+	bool get_alarm(const AlarmFilter &af, alarm_list_t &alarms);
+	bool get_alarms(const char *entity_instance_id, alarm_list_t &alarms);
+	bool get_alarms_by_id(const char *alarm_id, alarm_list_t &alarms);
+	bool get_alarms_by_id_n_eid(const AlarmFilter &af, alarm_list_t &alarms);
+	bool get_alarms_by_eids(const std::vector<std::string> &ids,
+			alarm_list_t &alarms);
+	bool get_alarms_by_ids(const std::vector<std::string> &ids,
+			alarm_list_t &alarms);
+	bool get_alarms_page(const SFmAlarmPageT &page, bool by_id,
+			alarm_list_t &alarms);
+
+private:
+	// (entity_instance_id, alarm_id), which is also the order of the pages
+	typedef std::pair<std::string,std::string> alarm_key_t;
+	typedef std::map<alarm_key_t,SFmAlarmDataT> alarm_map_t;
+	typedef std::map<std::string,std::set<std::string> > alarm_index_t;
+
+	void add(const SFmAlarmDataT &alarm);
+	void remove(alarm_map_t::iterator it);
+	void collect(const std::string &prefix, const char *alarm_id,
+			std::set<alarm_key_t> &keys);
+	void copy(const std::set<alarm_key_t> &keys, alarm_list_t &alarms);
+	void copy_by_id(const std::string &alarm_id, alarm_list_t &alarms);
+
+	CFmMutex m_mutex;
+	bool m_valid;
+	unsigned long m_generation;          // bumped by every update
+	alarm_map_t m_alarms;
+	alarm_index_t m_by_id;               // entity instance ids by alarm id
+	std::set<std::string> m_unsuppressed;  // alarm ids not suppressed
+};
+
+#endif /* FMALARMCACHE_H_ */
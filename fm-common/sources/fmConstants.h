@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014-2018, 2025 Wind River Systems, Inc.
+// Copyright (c) 2014-2018, 2025-2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -100,6 +100,49 @@
 #define FM_TRAP_SERVER_IP            "trap_server_ip"
 #define FM_TRAP_SERVER_PORT          "trap_server_port"
 #define FM_TRAP_SNMP_ENABLED         "snmp_enabled"
+#define FM_TRAP_SERVER_PERSISTENT    "trap_server_persistent"
+#define FM_MAX_CLIENT_CONNECTIONS    "max_client_connections"
+#define FM_EVENT_SUPPRESSION_DEBOUNCE     "event_suppression_debounce_ms"
+#define FM_EVENT_SUPPRESSION_DEBOUNCE_MAX "event_suppression_debounce_max_ms"
+#define FM_GET_WORKER_THREADS        "get_worker_threads"
+#define FM_ALARM_CACHE_RECONCILE_INTERVAL "alarm_cache_reconcile_interval"
+#define FM_EVENT_LOG_TRIM_PERCENT    "event_log_trim_percent"
+
+/* get worker pool defaults */
+#define FM_GET_WORKER_THREADS_DEFAULT    4
+#define FM_GET_WORKER_THREADS_MAX        32
+#define FM_GET_STATS_LOG_INTERVAL        60    /* seconds */
+
+/* clients connected to fmManager at once, also bound by the open files
+ * limit of the process */
+#define FM_MAX_CLIENT_CONNECTIONS_DEFAULT 1024
+#define FM_MAX_CLIENT_CONNECTIONS_MAX     65536
+
+/* seconds between alarm cache reloads, 0 disables the cache */
+#define FM_ALARM_CACHE_RECONCILE_INTERVAL_DEFAULT 60
+#define FM_ALARM_CACHE_RECONCILE_INTERVAL_MAX     86400
+
+/* share of event_log_max_size removed once the event log reaches it */
+#define FM_EVENT_LOG_TRIM_PERCENT_DEFAULT 10
+#define FM_EVENT_LOG_TRIM_PERCENT_MAX     90
+/* max event logs removed by one delete */
+#define FM_EVENT_LOG_TRIM_CHUNK           500
+
+/* quiet time after an event suppression change before the Warm Start
+ * trap, and the longest it is held back by further changes */
+#define FM_EVENT_SUPPRESSION_DEBOUNCE_DEFAULT      2000   /* msec */
+#define FM_EVENT_SUPPRESSION_DEBOUNCE_MAX_DEFAULT  30000  /* msec */
+#define FM_EVENT_SUPPRESSION_DEBOUNCE_MS_MAX       300000 /* msec */
+
+/* SNMP trap sender */
+#define FM_TRAP_QUEUE_MAX                1000
+#define FM_TRAP_BATCH_MAX                50    /* traps per write */
+#define FM_TRAP_RETRY_MIN                1     /* seconds */
+#define FM_TRAP_RETRY_MAX                60    /* seconds */
+#define FM_TRAP_STATS_LOG_INTERVAL       60    /* seconds */
+
+/* max set/clear jobs written to the DB in one transaction */
+#define FM_JOB_BATCH_MAX                 100
 
 #define CLEAR_ALL_REASON_TEXT        "System initiated hierarchical alarm clear"
 
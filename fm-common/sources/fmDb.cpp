@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2016-2018 Wind River Systems, Inc.
+// Copyright (c) 2016-2018, 2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -60,6 +60,8 @@ bool CFmDBSession::connect(const char *uri){
 	m_conn.status = DB_CONNECTED;
 	m_conn.pgconn = pgconn;
 	m_conn.uri = uri;
+	// prepared statements belong to the previous connection
+	m_prepared.clear();
 
 	val = get_parameter_status("standard_conforming_strings");
 	m_conn.equote = (val && (0 == strcmp("off", val)));
@@ -92,16 +94,11 @@ const char * CFmDBSession::get_parameter_status(const char *param){
 	return PQparameterStatus(m_conn.pgconn, param);
 }
 
-bool CFmDBSession::query(const char *db_cmd,fm_db_result_t & result) {
-	PGresult *res;
+// Append the rows of res to result, res is cleared
+static bool fm_db_collect_result(PGresult *res, const char *db_cmd,
+		fm_db_result_t & result) {
 	int nfields, ntuples, i, j;
 
-	if (check_conn() == false){
-		FM_ERROR_LOG("Failed to reconnect: %s", PQerrorMessage(m_conn.pgconn));
-		return false;
-	}
-
-	res = PQexec(m_conn.pgconn, db_cmd);
 	if (PQresultStatus(res) != PGRES_TUPLES_OK){
 		FM_ERROR_LOG("Status:(%s)\n", PQresStatus(PQresultStatus(res)));
 		FM_ERROR_LOG("Failed to execute (%s) (%s)", db_cmd, PQresultErrorMessage(res));
@@ -131,16 +128,10 @@ bool CFmDBSession::query(const char *db_cmd,fm_db_result_t & result) {
 // return value: -1: if there is PQ operation failure
 //                0: if cmd success and check_row == false
 //              row: row number if cmd success and check_row == true
-int CFmDBSession::cmd(const char *db_cmd, bool check_row){
-	PGresult *res;
+static int fm_db_cmd_result(PGresult *res, const char *db_cmd,
+		bool check_row) {
 	int rc = -1;
 
-	if (check_conn() == false){
-		FM_ERROR_LOG("Failed to reconnect: %s", PQerrorMessage(m_conn.pgconn));
-		return rc;
-	}
-
-	res = PQexec(m_conn.pgconn, db_cmd);
 	if (PQresultStatus(res) != PGRES_COMMAND_OK) {
 		FM_ERROR_LOG("Status:(%s)\n", PQresStatus(PQresultStatus(res)));
 		FM_ERROR_LOG("Failed to execute (%s) (%s)", db_cmd, PQresultErrorMessage(res));
@@ -155,6 +146,109 @@ int CFmDBSession::cmd(const char *db_cmd, bool check_row){
 	return rc;
 }
 
+bool CFmDBSession::query(const char *db_cmd,fm_db_result_t & result) {
+	if (check_conn() == false){
+		FM_ERROR_LOG("Failed to reconnect: %s", PQerrorMessage(m_conn.pgconn));
+		return false;
+	}
+
+	return fm_db_collect_result(PQexec(m_conn.pgconn, db_cmd), db_cmd, result);
+}
+
+// return value: -1: if there is PQ operation failure
+//                0: if cmd success and check_row == false
+//              row: row number if cmd success and check_row == true
+int CFmDBSession::cmd(const char *db_cmd, bool check_row){
+	if (check_conn() == false){
+		FM_ERROR_LOG("Failed to reconnect: %s", PQerrorMessage(m_conn.pgconn));
+		return -1;
+	}
+
+	return fm_db_cmd_result(PQexec(m_conn.pgconn, db_cmd), db_cmd, check_row);
+}
+
+// Name of the prepared statement of db_cmd, preparing it on first use.
+// Parameter types come from the casts in db_cmd or from the columns they
+// are compared with. NULL if it cannot be prepared, the caller then sends
+// the SQL text instead.
+const char *CFmDBSession::prepare(const char *db_cmd, int n_params){
+	std::map<std::string,std::string>::iterator it = m_prepared.find(db_cmd);
+	if (it != m_prepared.end())
+		return it->second.c_str();
+	if (m_prepared.size() >= FM_DB_MAX_PREPARED)
+		return NULL;
+
+	char name[32];
+	snprintf(name, sizeof(name), "fm_stmt_%zu", m_prepared.size());
+	PGresult *res = PQprepare(m_conn.pgconn, name, db_cmd, n_params, NULL);
+	if (PQresultStatus(res) != PGRES_COMMAND_OK) {
+		FM_ERROR_LOG("Failed to prepare (%s) (%s)", db_cmd, PQresultErrorMessage(res));
+		PQclear(res);
+		return NULL;
+	}
+	PQclear(res);
+	FM_DEBUG_LOG("Prepared (%s) as (%s)\n", db_cmd, name);
+	return (m_prepared[db_cmd] = name).c_str();
+}
+
+// Run the query db_cmd, with $1..$n_params text parameters, as a statement
+// prepared once per connection
+bool CFmDBSession::prepared_query(const char *db_cmd, int n_params,
+		const char * const *values, fm_db_result_t & result){
+	if (check_conn() == false){
+		FM_ERROR_LOG("Failed to reconnect: %s", PQerrorMessage(m_conn.pgconn));
+		return false;
+	}
+
+	PGresult *res;
+	const char *stmt = prepare(db_cmd, n_params);
+	if (stmt != NULL)
+		res = PQexecPrepared(m_conn.pgconn, stmt, n_params, values, NULL, NULL, 0);
+	else
+		res = PQexecParams(m_conn.pgconn, db_cmd, n_params, NULL, values,
+				NULL, NULL, 0);
+	return fm_db_collect_result(res, db_cmd, result);
+}
+
+// Command variant of prepared_query, returns like cmd()
+int CFmDBSession::prepared_cmd(const char *db_cmd, int n_params,
+		const char * const *values, bool check_row){
+	if (check_conn() == false){
+		FM_ERROR_LOG("Failed to reconnect: %s", PQerrorMessage(m_conn.pgconn));
+		return -1;
+	}
+
+	PGresult *res;
+	const char *stmt = prepare(db_cmd, n_params);
+	if (stmt != NULL)
+		res = PQexecPrepared(m_conn.pgconn, stmt, n_params, values, NULL, NULL, 0);
+	else
+		res = PQexecParams(m_conn.pgconn, db_cmd, n_params, NULL, values,
+				NULL, NULL, 0);
+	return fm_db_cmd_result(res, db_cmd, check_row);
+}
+
+// Query variant of params_cmd, for commands with a RETURNING clause
+bool CFmDBSession::params_query(fm_db_util_sql_params & sql_params,
+		fm_db_result_t & result){
+	if (check_conn() == false){
+		FM_ERROR_LOG("Failed to reconnect: %s", PQerrorMessage(m_conn.pgconn));
+		return false;
+	}
+
+	PGresult *res;
+	const char *stmt = prepare(sql_params.db_cmd.c_str(), sql_params.n_params);
+	if (stmt != NULL)
+		res = PQexecPrepared(m_conn.pgconn, stmt, sql_params.n_params,
+				(const char* const*)&(sql_params.param_values[0]),
+				(const int*)&(sql_params.param_lengths[0]), (const int*)&(sql_params.param_format[0]), 0);
+	else
+		res = PQexecParams(m_conn.pgconn, sql_params.db_cmd.c_str(), sql_params.n_params,
+				NULL,(const char* const*)&(sql_params.param_values[0]),
+				(const int*)&(sql_params.param_lengths[0]), (const int*)&(sql_params.param_format[0]), 0);
+	return fm_db_collect_result(res, sql_params.db_cmd.c_str(), result);
+}
+
 bool CFmDBSession::params_cmd(fm_db_util_sql_params & sql_params){
 	PGresult *res, *last_res;
 	bool rc = true;
@@ -164,9 +258,17 @@ bool CFmDBSession::params_cmd(fm_db_util_sql_params & sql_params){
 		return false;
 	}
 
-	res = PQexecParams(m_conn.pgconn, sql_params.db_cmd.c_str(), sql_params.n_params,
-			NULL,(const char* const*)&(sql_params.param_values[0]),
-			(const int*)&(sql_params.param_lengths[0]), (const int*)&(sql_params.param_format[0]), 1);
+	// The insert and update commands only differ by their parameters,
+	// run them as statements prepared once per connection
+	const char *stmt = prepare(sql_params.db_cmd.c_str(), sql_params.n_params);
+	if (stmt != NULL)
+		res = PQexecPrepared(m_conn.pgconn, stmt, sql_params.n_params,
+				(const char* const*)&(sql_params.param_values[0]),
+				(const int*)&(sql_params.param_lengths[0]), (const int*)&(sql_params.param_format[0]), 1);
+	else
+		res = PQexecParams(m_conn.pgconn, sql_params.db_cmd.c_str(), sql_params.n_params,
+				NULL,(const char* const*)&(sql_params.param_values[0]),
+				(const int*)&(sql_params.param_lengths[0]), (const int*)&(sql_params.param_format[0]), 1);
 	if (PQresultStatus(res) != PGRES_COMMAND_OK) {
 		FM_ERROR_LOG("Status:(%s)\n", PQresStatus(PQresultStatus(res)));
 		FM_ERROR_LOG("Failed to execute (%s) (%s)", sql_params.db_cmd.c_str(),
@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014-2018 Wind River Systems, Inc.
+// Copyright (c) 2014-2018, 2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -38,10 +38,16 @@ typedef struct{
 	PGconn *pgconn;          /* the postgresql connection */
 }SFmDBConn;
 
+/* max statements prepared on one DB session */
+#define FM_DB_MAX_PREPARED 64
+
 class CFmDBSession {
 protected:
 	SFmDBConn m_conn;
+	// names of the statements prepared on this connection, by SQL text
+	std::map<std::string,std::string> m_prepared;
 	const char *get_parameter_status(const char *param);
+	const char *prepare(const char *db_cmd, int n_params);
 
 public:
 	CFmDBSession();
@@ -55,6 +61,12 @@ public:
 	bool query(const char *db_cmd,fm_db_result_t & result);
 	int  cmd(const char *db_cmd, bool check_row=true);
 	bool params_cmd(fm_db_util_sql_params & sql_params);
+	bool params_query(fm_db_util_sql_params & sql_params,
+			fm_db_result_t & result);
+	bool prepared_query(const char *db_cmd, int n_params,
+			const char * const *values, fm_db_result_t & result);
+	int  prepared_cmd(const char *db_cmd, int n_params,
+			const char * const *values, bool check_row=true);
 
 	PGconn* get_pgconn(){
 		return m_conn.pgconn;
@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014-2025 Wind River Systems, Inc.
+// Copyright (c) 2014-2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -163,6 +163,28 @@ void CFmDbAlarm::print() {
 	FM_INFO_LOG("%s\n",str.c_str());
 }
 
+// SQL of cmd on the alarms matching af: the exact alarm, or with prefix
+// the alarm of the entity instance and of its children. An empty entity
+// instance id stands for ' '. The text only depends on the kind of match,
+// so the statement is prepared once; eid receives the $2 parameter.
+static std::string build_alarm_filter_sql(const std::string &cmd,
+		const AlarmFilter &af, bool prefix, std::string &eid) {
+	std::string sql = cmd;
+	sql += " WHERE " FM_ALARM_COLUMN_ALARM_ID " = $1 AND "
+			FM_ALARM_COLUMN_ENTITY_INSTANCE_ID;
+	if (strlen(af.entity_instance_id) == 0){
+		eid = " ";
+		sql += " = $2";
+	} else if (prefix){
+		eid = std::string(af.entity_instance_id) + "%";
+		sql += " LIKE $2";
+	} else {
+		eid = af.entity_instance_id;
+		sql += " = $2";
+	}
+	return sql;
+}
+
 bool CFmDbAlarmOperation::create_alarm(CFmDBSession &sess,CFmDbAlarm &a) {
 
 	CFmDbAlarm::data_type data;
@@ -184,82 +206,84 @@ bool CFmDbAlarmOperation::create_alarm(CFmDBSession &sess,CFmDbAlarm &a) {
 		data.erase(it);
 	}
 
-	std::string query;
-	FM_DB_UT_NAME_VAL(query,FM_ALARM_COLUMN_ALARM_ID,
-			data[FM_ALARM_COLUMN_ALARM_ID]);
-
-	query += " AND ";
-	FM_DB_UT_NAME_VAL(query,FM_ALARM_COLUMN_ENTITY_INSTANCE_ID,
-			data[FM_ALARM_COLUMN_ENTITY_INSTANCE_ID]);
-
-	std::string sql;
-	fm_db_util_build_sql_query((const char*)FM_ALARM_TABLE_NAME, query.c_str(), sql);
-
-	fm_db_result_t result;
-
-	if ((sess.query(sql.c_str(), result)) != true){
-		return false;
-	}
-
 	data[FM_ALARM_COLUMN_UUID] = a.find_field(FM_ALARM_COLUMN_UUID);
 	data[FM_ALARM_COLUMN_MASKED] = "False";
 
+	// Insert the alarm, or update the alarm already raised against the
+	// entity, in one statement relying on the unique index on
+	// (alarm_id, entity_instance_id)
 	fm_db_util_sql_params sql_params;
+	fm_db_result_t result;
+	bool keep = (a.find_field(FM_ALARM_KEEP_EXISTING_ALARM) == "True");
 
-	if (result.size() == 0){
-		fm_db_util_build_sql_insert((const char*)FM_ALARM_TABLE_NAME, data, sql_params);
-	}else{
-		if (a.find_field(FM_ALARM_KEEP_EXISTING_ALARM) == "True") {
-			FM_DEBUG_LOG("Alarm exists and keep_existing_alarm was provided, not updating...\n");
-			// Since alarm was kept, we need to set the uuid to the one from db
-			a.set_field(FM_ALARM_COLUMN_UUID, result[0][FM_ALARM_COLUMN_UUID]);
-			return true;
-		}
-		fm_db_single_result_t alm = result[0];
-		fm_db_util_build_sql_update((const char*)FM_ALARM_TABLE_NAME,
-				alm[FM_ALARM_COLUMN_ID],data, sql_params);
+	// An alarm to keep is looked up first, so raising it again writes
+	// nothing. An alarm inserted meanwhile by another session is not
+	// returned by the insert, it is read back.
+	if (keep && !get_alarm_uuid(sess, data, result))
+		return false;
+	if (result.empty()) {
+		fm_db_util_build_sql_upsert((const char*)FM_ALARM_TABLE_NAME, data,
+				FM_ALARM_COLUMN_ALARM_ID "," FM_ALARM_COLUMN_ENTITY_INSTANCE_ID,
+				keep, sql_params);
+		FM_DEBUG_LOG("execute CMD (%s)\n", sql_params.db_cmd.c_str());
+		if (sess.params_query(sql_params, result) != true)
+			return false;
+		if (result.empty() && keep && !get_alarm_uuid(sess, data, result))
+			return false;
 	}
-	sql_params.n_params = data.size();
-	FM_DEBUG_LOG("execute CMD (%s)\n", sql_params.db_cmd.c_str());
-	return sess.params_cmd(sql_params);
+	if (result.size() != 1)
+		return false;
+	// An existing alarm that was kept keeps its uuid
+	a.set_field(FM_ALARM_COLUMN_UUID, result[0][FM_ALARM_COLUMN_UUID]);
+	return true;
+}
+
+// The uuid of the alarm raised against the entity of data, if any
+bool CFmDbAlarmOperation::get_alarm_uuid(CFmDBSession &sess,
+		CFmDbAlarm::data_type &data, fm_db_result_t &result) {
+	const char *sql = "SELECT " FM_ALARM_COLUMN_UUID " FROM "
+			FM_ALARM_TABLE_NAME " WHERE " FM_ALARM_COLUMN_ALARM_ID " = $1 AND "
+			FM_ALARM_COLUMN_ENTITY_INSTANCE_ID " = $2";
+	const char *values[] = {data[FM_ALARM_COLUMN_ALARM_ID].c_str(),
+			data[FM_ALARM_COLUMN_ENTITY_INSTANCE_ID].c_str()};
+
+	FM_DEBUG_LOG("CMD:(%s) (%s) (%s)\n", sql, values[0], values[1]);
+	return sess.prepared_query(sql, 2, values, result);
 }
 
 // return value: -1: if cmd fail to execute
 //              row: Deleted row number, maybe 0.
 int CFmDbAlarmOperation::delete_alarms(CFmDBSession &sess, const char *id) {
-	std::string sql;
+	const char *sql = "DELETE FROM " FM_ALARM_TABLE_NAME " WHERE "
+			FM_ALARM_COLUMN_ENTITY_INSTANCE_ID " LIKE $1";
+	std::string eid = std::string(id) + "%";
+	const char *values[] = {eid.c_str()};
 
-	fm_db_util_build_sql_delete_all((const char*)FM_ALARM_TABLE_NAME, id, sql);
-	FM_DEBUG_LOG("CMD:(%s)\n", sql.c_str());
-	return sess.cmd(sql.c_str());
+	FM_DEBUG_LOG("CMD:(%s) (%s)\n", sql, eid.c_str());
+	return sess.prepared_cmd(sql, 1, values);
 }
 
 // return value: -1: if cmd fail to execute
 //              row: Deleted row number, maybe 0.
 int CFmDbAlarmOperation::delete_alarm(CFmDBSession &sess, AlarmFilter &af) {
-	std::string sql;
+	std::string eid;
+	std::string sql = build_alarm_filter_sql(
+			"DELETE FROM " FM_ALARM_TABLE_NAME, af, true, eid);
+	const char *values[] = {af.alarm_id, eid.c_str()};
 
-	fm_db_util_build_sql_delete((const char*)FM_ALARM_TABLE_NAME, &af, sql);
-	FM_DEBUG_LOG("CMD:(%s)\n", sql.c_str());
-	return sess.cmd(sql.c_str());
+	FM_DEBUG_LOG("CMD:(%s) (%s) (%s)\n", sql.c_str(), af.alarm_id, eid.c_str());
+	return sess.prepared_cmd(sql.c_str(), 2, values);
 }
 
 
 bool CFmDbAlarmOperation::get_alarm(CFmDBSession &sess, AlarmFilter &af, fm_db_result_t & alarms) {
-	std::string sql;
-	char query[FM_MAX_SQL_STATEMENT_MAX];
+	std::string eid;
+	std::string sql = build_alarm_filter_sql(
+			FM_DB_SELECT_FROM_TABLE(FM_ALARM_TABLE_NAME), af, false, eid);
+	const char *values[] = {af.alarm_id, eid.c_str()};
 
-	if (strlen(af.entity_instance_id) == 0){
-		snprintf(query, sizeof(query),"%s = '%s' AND %s = ' '", FM_ALARM_COLUMN_ALARM_ID, af.alarm_id,
-						FM_ALARM_COLUMN_ENTITY_INSTANCE_ID);
-	}
-	else{
-		snprintf(query, sizeof(query),"%s = '%s' AND %s = '%s'", FM_ALARM_COLUMN_ALARM_ID, af.alarm_id,
-				FM_ALARM_COLUMN_ENTITY_INSTANCE_ID, af.entity_instance_id);
-	}
-	fm_db_util_build_sql_query((const char*)FM_ALARM_TABLE_NAME, query, sql);
-	FM_DEBUG_LOG("get_alarm:(%s)\n", sql.c_str());
-	if ((sess.query(sql.c_str(), alarms)) != true){
+	FM_DEBUG_LOG("get_alarm:(%s) (%s) (%s)\n", sql.c_str(), af.alarm_id, eid.c_str());
+	if ((sess.prepared_query(sql.c_str(), 2, values, alarms)) != true){
 		return false;
 	}
 	return true;
@@ -269,23 +293,13 @@ bool CFmDbAlarmOperation::get_alarm(CFmDBSession &sess, AlarmFilter &af, fm_db_r
  *  several rows, since this is using the LIKE % clause.
  */
 bool CFmDbAlarmOperation::get_alarms_eid_not_strict(CFmDBSession &sess, AlarmFilter &af, fm_db_result_t & alarms) {
+	std::string eid;
+	std::string sql = build_alarm_filter_sql(
+			FM_DB_SELECT_FROM_TABLE(FM_ALARM_TABLE_NAME), af, true, eid);
+	const char *values[] = {af.alarm_id, eid.c_str()};
 
-	std::string sql;
-	char query[FM_MAX_SQL_STATEMENT_MAX];
-
-	if (strlen(af.entity_instance_id) == 0){
-		snprintf(query, sizeof(query),"%s = '%s' AND %s = ' '",
-				FM_ALARM_COLUMN_ALARM_ID, af.alarm_id,
-				FM_ALARM_COLUMN_ENTITY_INSTANCE_ID);
-	}
-	else {
-		snprintf(query, sizeof(query), "%s = '%s' AND %s LIKE '%s%%'",
-				FM_ALARM_COLUMN_ALARM_ID, af.alarm_id,
-				FM_ALARM_COLUMN_ENTITY_INSTANCE_ID, af.entity_instance_id);
-	}
-	fm_db_util_build_sql_query((const char*)FM_ALARM_TABLE_NAME, query, sql);
-	FM_DEBUG_LOG("get_alarm:(%s)\n", sql.c_str());
-	if ((sess.query(sql.c_str(), alarms)) != true){
+	FM_DEBUG_LOG("get_alarm:(%s) (%s) (%s)\n", sql.c_str(), af.alarm_id, eid.c_str());
+	if ((sess.prepared_query(sql.c_str(), 2, values, alarms)) != true){
 		return false;
 	}
 	return true;
@@ -339,6 +353,152 @@ bool CFmDbAlarmOperation::get_alarms_by_id_n_eid(CFmDBSession &sess, const Alarm
     return true;
 }
 
+// Pattern of LIKE matching the values that start with prefix, its LIKE
+// metacharacters escaped with the default escape character
+static std::string build_like_prefix(const std::string &prefix) {
+	std::string pattern;
+
+	for (size_t c = 0; c < prefix.size(); ++c) {
+		if (prefix[c] == '\\' || prefix[c] == '%' || prefix[c] == '_')
+			pattern += '\\';
+		pattern += prefix[c];
+	}
+	pattern += "%";
+	return pattern;
+}
+
+// Text form of a PostgreSQL text[] holding values, for a single query
+// parameter whatever the number of values
+static std::string build_sql_array(const std::vector<std::string> &values) {
+	std::string array = "{";
+
+	for (size_t ix = 0; ix < values.size(); ++ix) {
+		if (ix > 0)
+			array += ",";
+		array += '"';
+		for (size_t c = 0; c < values[ix].size(); ++c) {
+			if (values[ix][c] == '"' || values[ix][c] == '\\')
+				array += '\\';
+			array += values[ix][c];
+		}
+		array += '"';
+	}
+	array += "}";
+	return array;
+}
+
+/** The alarms get_alarms() returns for any of the entity instance ids,
+ *  each id matching as a prefix, in a single query.
+ */
+bool CFmDbAlarmOperation::get_alarms_by_eids(CFmDBSession &sess,
+		const std::vector<std::string> &ids, fm_db_result_t &alarms) {
+	std::string sql = CFmDbAlarmOperation::build_base_alarm_query(nullptr);
+	std::vector<std::string> patterns;
+
+	if (ids.empty())
+		return true;
+
+	for (size_t ix = 0; ix < ids.size(); ++ix)
+		patterns.push_back(build_like_prefix(ids[ix]));
+	std::string array = build_sql_array(patterns);
+	const char *values[] = {array.c_str()};
+
+	sql += " AND ";
+	sql += FM_ALARM_TABLE_NAME;
+	sql += ".";
+	sql += FM_ALARM_COLUMN_ENTITY_INSTANCE_ID;
+	sql += " LIKE ANY ($1::text[])";
+
+	FM_DEBUG_LOG("CMD:(%s) (%s)\n", sql.c_str(), array.c_str());
+	if (!sess.prepared_query(sql.c_str(), 1, values, alarms))
+		return false;
+
+	return true;
+}
+
+/** Same alarms as one get_alarms_by_id() call per alarm id, in a
+ *  single query.
+ */
+bool CFmDbAlarmOperation::get_alarms_by_ids(CFmDBSession &sess,
+		const std::vector<std::string> &ids, fm_db_result_t &alarms) {
+	std::string sql;
+
+	if (ids.empty())
+		return true;
+
+	std::string array = build_sql_array(ids);
+	const char *values[] = {array.c_str()};
+
+	fm_db_util_build_sql_query((const char*)FM_ALARM_TABLE_NAME,
+			FM_ALARM_COLUMN_ALARM_ID " = ANY ($1::text[])", sql);
+	FM_DEBUG_LOG("CMD:(%s) (%s)\n", sql.c_str(), array.c_str());
+	if (!sess.prepared_query(sql.c_str(), 1, values, alarms))
+		return false;
+
+	return true;
+}
+
+/** One page of the alarms of an alarm id (by_id) or of an entity instance
+ *  id prefix, ordered by entity instance id and alarm id and starting
+ *  after page.after. Keyset paging keeps every page an index range scan,
+ *  however deep into the result it is. The ids are compared in the "C"
+ *  collation, byte by byte as the alarm cache pages them, whatever the
+ *  collation of the DB.
+ */
+bool CFmDbAlarmOperation::get_alarms_page(CFmDBSession &sess,
+		const SFmAlarmPageT &page, bool by_id, fm_db_result_t &alarms) {
+	std::string sql;
+	std::string id = by_id ? std::string(page.id) :
+			build_like_prefix(page.id);
+	std::string limit = fm_db_util_int_to_string(page.limit);
+	const char *values[4] = {id.c_str()};
+	int n_params = 1;
+
+	if (by_id) {
+		fm_db_util_build_sql_query((const char*)FM_ALARM_TABLE_NAME,
+				FM_ALARM_COLUMN_ALARM_ID " = $1", sql);
+	} else {
+		sql = CFmDbAlarmOperation::build_base_alarm_query(nullptr);
+		sql += " AND ";
+		sql += FM_ALARM_TABLE_NAME;
+		sql += ".";
+		sql += FM_ALARM_COLUMN_ENTITY_INSTANCE_ID;
+		sql += " COLLATE \"C\" LIKE $1";
+	}
+
+	if (strlen(page.after.alarm_id) > 0) {
+		sql += " AND (";
+		sql += FM_ALARM_TABLE_NAME;
+		sql += ".";
+		sql += FM_ALARM_COLUMN_ENTITY_INSTANCE_ID;
+		sql += " COLLATE \"C\", ";
+		sql += FM_ALARM_TABLE_NAME;
+		sql += ".";
+		sql += FM_ALARM_COLUMN_ALARM_ID;
+		sql += " COLLATE \"C\") > ($2, $3)";
+		values[n_params++] = page.after.entity_instance_id;
+		values[n_params++] = page.after.alarm_id;
+	}
+
+	sql += " ORDER BY ";
+	sql += FM_ALARM_TABLE_NAME;
+	sql += ".";
+	sql += FM_ALARM_COLUMN_ENTITY_INSTANCE_ID;
+	sql += " COLLATE \"C\", ";
+	sql += FM_ALARM_TABLE_NAME;
+	sql += ".";
+	sql += FM_ALARM_COLUMN_ALARM_ID;
+	sql += " COLLATE \"C\" LIMIT $";
+	sql += fm_db_util_int_to_string(n_params + 1);
+	values[n_params++] = limit.c_str();
+
+	FM_DEBUG_LOG("CMD:(%s) (%s)\n", sql.c_str(), id.c_str());
+	if (!sess.prepared_query(sql.c_str(), n_params, values, alarms))
+		return false;
+
+	return true;
+}
+
 std::string CFmDbAlarmOperation::build_base_alarm_query(const char *entity_instance_id) {
     std::string sql;
     char query[FM_MAX_SQL_STATEMENT_MAX];
@@ -486,7 +646,7 @@ bool CFmDbAlarmOperation::mask_unmask_alarms(CFmDBSession &sess,
 
 		fm_db_util_build_sql_update((const char*)FM_ALARM_TABLE_NAME,
 						(*it)[FM_ALARM_COLUMN_ID],data, sql_params, mask);
-		sql_params.n_params = data.size();
+		sql_params.n_params = sql_params.param_values.size();
 		FM_DEBUG_LOG("execute CMD (%s)\n", sql_params.db_cmd.c_str());
 		sess.params_cmd(sql_params);
 	}
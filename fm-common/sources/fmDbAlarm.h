@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014-2018 Wind River Systems, Inc.
+// Copyright (c) 2014-2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -70,12 +70,23 @@ public:
 
 	bool get_alarms_eid_not_strict(CFmDBSession &sess, AlarmFilter &af, fm_db_result_t & alarms);
 
+	bool get_alarms_by_eids(CFmDBSession &sess, const std::vector<std::string> &ids,
+			fm_db_result_t &alarms);
+
+	bool get_alarms_by_ids(CFmDBSession &sess, const std::vector<std::string> &ids,
+			fm_db_result_t &alarms);
+
+	bool get_alarms_page(CFmDBSession &sess, const SFmAlarmPageT &page, bool by_id,
+			fm_db_result_t &alarms);
+
 	bool mask_unmask_alarms(CFmDBSession &sess, SFmAlarmDataT &a, bool mask = true);
 
 	bool add_alarm_history(CFmDBSession &sess, SFmAlarmDataT &a, bool set);
 
 private:
     static std::string build_base_alarm_query(const char *entity_instance_id);
+    bool get_alarm_uuid(CFmDBSession &sess, CFmDbAlarm::data_type &data,
+            fm_db_result_t &result);
 };
 
 #endif /* FMDBALARM_H_ */
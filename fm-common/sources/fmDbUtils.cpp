@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014-2019 Wind River Systems, Inc.
+// Copyright (c) 2014-2019, 2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -12,6 +12,7 @@
 #include <assert.h>
 #include <sstream>
 #include <map>
+#include <algorithm>
 #include <iostream>
 #include <assert.h>
 #include <arpa/inet.h>
@@ -60,26 +61,6 @@ static inline std::string add_quote(const std::string &s) {
 	return std::string("'")+s+"'";
 }
 
-static int get_oldest_id(CFmDBSession &sess, const char* db_table){
-	fm_db_result_t res;
-	int id = 0;
-	char sql[FM_MAX_SQL_STATEMENT_MAX];
-
-	memset(sql, 0, sizeof(sql));
-	snprintf(sql, sizeof(sql), "SELECT %s FROM %s order by %s limit 1",
-			FM_ALARM_COLUMN_ID, db_table,
-			FM_ALARM_COLUMN_CREATED_AT);
-
-	if (sess.query(sql, res)){
-		if (res.size() > 0){
-			std::map<std::string,std::string>  entry = res[0];
-			id = fm_db_util_string_to_int(entry[FM_ALARM_COLUMN_ID]);
-		}
-	}
-	return id;
-}
-
-
 static inline CFmDBSession & FmDbSessionFromHandle(TFmAlarmSessionT *p){
 	return *((CFmDBSession*)p);
 }
@@ -264,6 +245,44 @@ bool fm_db_util_build_sql_insert(const char* db_table,
 	return true;
 }
 
+// Insert of map that updates the row already holding its conflict_keys
+// values instead, in one statement returning the uuid of the row. With
+// keep_existing the existing row is left unchanged, and nothing is
+// returned for it.
+bool fm_db_util_build_sql_upsert(const char* db_table,
+		std::map<std::string,std::string> &map, const char *conflict_keys,
+		FMBoolTypeT keep_existing, fm_db_util_sql_params &params) {
+
+	if (!fm_db_util_build_sql_insert(db_table, map, params))
+		return false;
+
+	// drop the ';' ending the insert
+	params.db_cmd.resize(params.db_cmd.size()-1);
+	params.db_cmd += " ON CONFLICT (";
+	params.db_cmd += conflict_keys;
+	if (keep_existing) {
+		// even a no-op update would write a new version of the row
+		params.db_cmd += ") DO NOTHING";
+	} else {
+		params.db_cmd += ") DO UPDATE SET ";
+		// the creation time of the new row is the update time of the
+		// existing one, which keeps its own creation time
+		params.db_cmd += FM_ALARM_COLUMN_UPDATED_AT " = EXCLUDED."
+				FM_ALARM_COLUMN_CREATED_AT;
+		std::map<std::string,std::string>::iterator it = map.begin();
+		for ( ; it != map.end() ; ++it ) {
+			if ((it->first == FM_ALARM_COLUMN_CREATED_AT) ||
+			    (it->first == FM_ALARM_COLUMN_ID))
+				continue;
+			params.db_cmd += ", " + it->first + " = EXCLUDED." + it->first;
+		}
+	}
+	params.db_cmd += " RETURNING " FM_ALARM_COLUMN_UUID;
+	params.n_params = params.param_values.size();
+
+	return true;
+}
+
 
 bool fm_db_util_event_log_build_sql_insert(std::map<std::string,std::string> &map,
 		fm_db_util_sql_params &params) {
@@ -422,8 +441,17 @@ bool fm_db_util_build_sql_update(const char* db_table,
 		FM_DB_UT_NAME_PARAM(params.db_cmd, it->first, param);
 	}
 
+	// the row id is a parameter too, so the command text is the same for
+	// every row and can be prepared once
+	params.id = htonl(atoi(id.c_str()));
+	params.param_values.push_back((char*)&params.id);
+	params.param_lengths.push_back(sizeof(int));
+	params.param_format.push_back(1);
+	sprintf(str, "$%lu::int", ++i);
+	param.assign(str);
 	params.db_cmd += " WHERE ";
-	FM_DB_UT_NAME_VAL(params.db_cmd, FM_ALARM_COLUMN_ID, id);
+	FM_DB_UT_NAME_PARAM(params.db_cmd, FM_ALARM_COLUMN_ID, param);
+	params.n_params = params.param_values.size();
 
 	return true;
 }
@@ -541,40 +569,109 @@ bool fm_db_util_get_row_counts(CFmDBSession &sess,
 	return false;
 }
 
+// Rows of the event_log table as counted by the last trim plus the logs
+// added since, -1 until the first trim
+static int log_rows = -1;
+static bool log_trim_pending = false;
+static pthread_cond_t log_trim_cond = PTHREAD_COND_INITIALIZER;
+
+static int fm_get_log_trim_percent(){
+	int percent = FM_EVENT_LOG_TRIM_PERCENT_DEFAULT;
+	std::string val;
+	std::string key = FM_EVENT_LOG_TRIM_PERCENT;
+	if (fm_get_config_key(key, val)){
+		int num = fm_db_util_string_to_int(val);
+		if (num < 1 || num > FM_EVENT_LOG_TRIM_PERCENT_MAX){
+			FM_ERROR_LOG("Invalid (%s) (%s), using (%d)\n", key.c_str(),
+					val.c_str(), percent);
+		}else{
+			percent = num;
+		}
+	}
+	return percent;
+}
+
 bool fm_db_util_get_next_log_id(CFmDBSession &sess, int &id){
 
+	// The id comes from the table sequence. The oldest logs are not
+	// replaced one by one, fm_db_util_trim_event_log removes them in
+	// chunks once the table reaches its max size.
+	id = 0;
 	pthread_mutex_lock(&mutex);
-	static bool has_max_rows = false;
-	static int max = 0;
-	int active = 0;
+	if ((log_rows >= 0) && (++log_rows >= fm_get_log_max_size()) &&
+			!log_trim_pending){
+		log_trim_pending = true;
+		pthread_cond_signal(&log_trim_cond);
+	}
+	pthread_mutex_unlock(&mutex);
+	FM_DEBUG_LOG("Return next log id: (%d)\n", id);
 
-	if (max == 0){
-		max = fm_get_log_max_size();
+	return true;
+}
+
+void fm_db_util_wait_event_log_trim(){
+	pthread_mutex_lock(&mutex);
+	while (!log_trim_pending){
+		pthread_cond_wait(&log_trim_cond, &mutex);
 	}
+	pthread_mutex_unlock(&mutex);
+}
 
-	if (!has_max_rows){
-		fm_db_util_get_row_counts(sess, FM_EVENT_LOG_TABLE_NAME, active);
-		FM_INFO_LOG("Active row accounts:(%d), max:(%d)\n", active, max);
-		if (active >= max) {
-			has_max_rows = true;
-		}
+bool fm_db_util_trim_event_log(CFmDBSession &sess){
+	static int percent = fm_get_log_trim_percent();
+	int max = fm_get_log_max_size();
+	int rows = 0;
+	int trimmed = 0;
+	bool rc = true;
+
+	if (max <= 0){
+		FM_ERROR_LOG("Invalid event log max size (%d)\n", max);
+		return false;
+	}
+
+	// Logs added while trimming count on top of the rows counted here
+	pthread_mutex_lock(&mutex);
+	log_rows = 0;
+	log_trim_pending = false;
+	pthread_mutex_unlock(&mutex);
+
+	if (!fm_db_util_get_row_counts(sess, FM_EVENT_LOG_TABLE_NAME, rows)){
+		pthread_mutex_lock(&mutex);
+		log_rows = -1;
+		pthread_mutex_unlock(&mutex);
+		return false;
 	}
 
-	if (has_max_rows){
-		std::string sql;
-		id = get_oldest_id(sess, FM_EVENT_LOG_TABLE_NAME);
-		fm_db_util_build_sql_delete_row(FM_EVENT_LOG_TABLE_NAME, id, sql);
-		FM_DEBUG_LOG("Delete row (%s)\n", sql.c_str());
-		if (sess.cmd(sql.c_str()) <= 0){
-			FM_INFO_LOG("Fail to delete the old event log: (%d)", id);
-			pthread_mutex_unlock(&mutex);
-			return false;
+	// Trim from the high watermark (max size) down to the low watermark,
+	// oldest first, in chunks to keep each delete short
+	if (rows >= max){
+		int low = max - std::max(1, max * percent / 100);
+		const char *sql =
+				"DELETE FROM " FM_EVENT_LOG_TABLE_NAME " WHERE "
+				FM_EVENT_LOG_COLUMN_ID " IN (SELECT " FM_EVENT_LOG_COLUMN_ID
+				" FROM " FM_EVENT_LOG_TABLE_NAME " ORDER BY "
+				FM_EVENT_LOG_COLUMN_CREATED_AT ", " FM_EVENT_LOG_COLUMN_ID
+				" LIMIT $1)";
+		while (rows > low){
+			std::string limit = fm_db_util_int_to_string(
+					std::min(rows - low, FM_EVENT_LOG_TRIM_CHUNK));
+			const char *values[1] = { limit.c_str() };
+			int deleted = sess.prepared_cmd(sql, 1, values);
+			if (deleted <= 0){
+				rc = (deleted == 0);
+				break;
+			}
+			rows -= deleted;
+			trimmed += deleted;
 		}
+		FM_INFO_LOG("Trimmed (%d) event logs, (%d) left, max:(%d)\n",
+				trimmed, rows, max);
 	}
-	FM_DEBUG_LOG("Return next log id: (%d)\n", id);
-	pthread_mutex_unlock(&mutex);
 
-	return true;
+	pthread_mutex_lock(&mutex);
+	log_rows += rows;
+	pthread_mutex_unlock(&mutex);
+	return rc;
 }
 
 bool fm_db_util_create_session(CFmDBSession **sess, std::string key){
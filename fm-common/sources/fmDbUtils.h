@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014-2018 Wind River Systems, Inc.
+// Copyright (c) 2014-2018, 2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -54,6 +54,10 @@ bool fm_db_util_build_sql_insert(const char* db_table,
 		std::map<std::string,std::string> &map,
 		fm_db_util_sql_params &parms);
 
+bool fm_db_util_build_sql_upsert(const char* db_table,
+		std::map<std::string,std::string> &map, const char *conflict_keys,
+		FMBoolTypeT keep_existing, fm_db_util_sql_params &parms);
+
 bool fm_db_util_event_log_build_sql_insert(std::map<std::string,std::string> &map,
 		fm_db_util_sql_params &params);
 
@@ -84,6 +88,10 @@ void fm_db_util_set_conf_file(const char *fn);
 
 bool fm_db_util_get_next_log_id(CFmDBSession &sess, int &id);
 
+bool fm_db_util_trim_event_log(CFmDBSession &sess);
+
+void fm_db_util_wait_event_log_trim();
+
 std::string fm_db_util_int_to_string(int val);
 
 int fm_db_util_string_to_int(std::string val);
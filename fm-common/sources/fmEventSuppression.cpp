@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2016-2018 Wind River Systems, Inc.
+// Copyright (c) 2016-2018, 2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 
@@ -52,12 +52,10 @@ bool CFmEventSuppressionOperation::get_single_event_suppression(CFmDBSession &se
 
 	sql += " WHERE ";
 	sql += FM_EVENT_SUPPRESSION_COLUMN_ALARM_ID;
-	sql += " = '";
-	sql += std::string(alarm_id);
-	sql += "'";
+	sql += " = $1";
 
-	FM_DEBUG_LOG("CMD:(%s)\n", sql.c_str());
-	if ((sess.query(sql.c_str(), event_suppression)) != true){
+	FM_DEBUG_LOG("CMD:(%s) (%s)\n", sql.c_str(), alarm_id);
+	if ((sess.prepared_query(sql.c_str(), 1, &alarm_id, event_suppression)) != true){
 		return false;
 	}
 	return true;
@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014, 2024-2025 Wind River Systems, Inc.
+// Copyright (c) 2014, 2024-2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -39,6 +39,10 @@ typedef enum {
   EFmGetFaultsByIdnEid,
   EFmCreateFaultList,
   EFmDeleteFaultList,
+  EFmGetFaultsByEids,
+  EFmGetFaultsByIds,
+  EFmGetFaultsPage,
+  EFmGetFaultsByIdPage,
   EFmActMax
 }EFmMsgActionsT;
 
@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2017-2025 Wind River Systems, Inc.
+// Copyright (c) 2017-2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -43,6 +43,8 @@
 #include "fmConstants.h"
 #include "fmEventSuppression.h"
 #include "fmConfig.h"
+#include "fmTime.h"
+#include "fmAlarmCache.h"
 
 #define FM_UUID_LENGTH 36
 
@@ -57,6 +59,14 @@ typedef struct{
 	SFmAlarmDataT data;
 }sFmJobReq;
 
+// One thread of the get request pool, each has its own DB session
+typedef struct{
+	FmSocketServerProcessor *srv;
+	unsigned int id;
+	unsigned long requests;   // requests served since the last stats log
+	FMTimeT busy;             // usec spent serving them
+}sFmGetWorkerT;
+
 typedef std::list<sFmGetReq> fmGetList;
 typedef std::list<sFmJobReq> fmJobList;
 
@@ -70,6 +80,23 @@ CFmMutex & getListMutex(){
 	return *m;
 }
 
+// Signalled when a job or get request is queued
+CFmCondition & getJobCond(){
+	static CFmCondition *c = new CFmCondition;
+	return *c;
+}
+
+CFmCondition & getListCond(){
+	static CFmCondition *c = new CFmCondition;
+	return *c;
+}
+
+// Active alarms, serving the get requests
+CFmAlarmCache & getAlarmCache(){
+	static CFmAlarmCache *c = new CFmAlarmCache;
+	return *c;
+}
+
 CFmMutex & getSockMutex(){
 	static CFmMutex *m = new CFmMutex;
 	return *m;
@@ -95,35 +122,119 @@ fmGetList& getList(){
 static void enqueue_job(sFmJobReq &req){
 	CFmMutexGuard m(getJobMutex());
 	getJobList().push_back(req);
+	getJobCond().signal();
 }
 
-static bool dequeue_job(sFmJobReq &req){
-	if (getJobList().size() == 0){
-		//FM_DEBUG_LOG("Job queue is empty\n");
-		return false;
-	}
+// Wait for jobs, then take up to max of them in queue order
+static void dequeue_jobs(std::vector<sFmJobReq> &jobs, size_t max){
 	CFmMutexGuard m(getJobMutex());
-	fmJobList::iterator it = getJobList().begin();
-	req = (*it);
-	getJobList().pop_front();
-	return true;
+	while (getJobList().size() == 0){
+		getJobCond().wait(getJobMutex());
+	}
+	jobs.clear();
+	while (getJobList().size() > 0 && jobs.size() < max){
+		jobs.push_back(getJobList().front());
+		getJobList().pop_front();
+	}
+}
+
+static size_t m_get_queue_max = 0;
+static FMTimeT m_get_stats_time = 0;
+
+std::vector<sFmGetWorkerT> & getGetWorkers(){
+	static std::vector<sFmGetWorkerT> workers;
+	return workers;
 }
 
 static void enqueue_get(sFmGetReq &req){
 	CFmMutexGuard m(getListMutex());
 	getList().push_back(req);
+	if (getList().size() > m_get_queue_max)
+		m_get_queue_max = getList().size();
+	getListCond().signal();
 }
 
-static bool dequeue_get(sFmGetReq &req){
-	if (getList().size() == 0){
-		//FM_DEBUG_LOG("Job queue is empty\n");
-		return false;
-	}
+// Wait for the next get request
+static void dequeue_get(sFmGetReq &req){
 	CFmMutexGuard m(getListMutex());
-	fmGetList::iterator it = getList().begin();
-	req = (*it);
+	while (getList().size() == 0){
+		getListCond().wait(getListMutex());
+	}
+	req = getList().front();
 	getList().pop_front();
-	return true;
+}
+
+// Account a served get request, and log the queue depth and the worker
+// utilisation every FM_GET_STATS_LOG_INTERVAL seconds
+static void get_request_done(sFmGetWorkerT &worker, FMTimeT start){
+	CFmMutexGuard m(getListMutex());
+	FMTimeT now = fmGetCurrentHrt();
+	worker.requests++;
+	worker.busy += now - start;
+
+	FMTimeT interval = now - m_get_stats_time;
+	if (interval < (FMTimeT)FM_GET_STATS_LOG_INTERVAL * 1000000)
+		return;
+	FM_INFO_LOG("Get requests: queue depth (%zu), max (%zu)\n",
+			getList().size(), m_get_queue_max);
+	std::vector<sFmGetWorkerT> &workers = getGetWorkers();
+	for (size_t i = 0; i < workers.size(); i++){
+		FM_INFO_LOG("Get worker (%u): requests (%lu), busy (%llu%%)\n",
+				workers[i].id, workers[i].requests,
+				(unsigned long long)(workers[i].busy * 100 / interval));
+		workers[i].requests = 0;
+		workers[i].busy = 0;
+	}
+	m_get_queue_max = getList().size();
+	m_get_stats_time = now;
+}
+
+static unsigned int fm_get_worker_threads(){
+	unsigned int threads = FM_GET_WORKER_THREADS_DEFAULT;
+	std::string val;
+	std::string key = FM_GET_WORKER_THREADS;
+	if (fm_get_config_key(key, val)){
+		int num = fm_db_util_string_to_int(val);
+		if (num < 1 || num > FM_GET_WORKER_THREADS_MAX){
+			FM_ERROR_LOG("Invalid (%s) (%s), using (%u)\n", key.c_str(),
+					val.c_str(), threads);
+		}else{
+			threads = num;
+		}
+	}
+	return threads;
+}
+
+static unsigned int fm_alarm_cache_interval(){
+	unsigned int interval = FM_ALARM_CACHE_RECONCILE_INTERVAL_DEFAULT;
+	std::string val;
+	std::string key = FM_ALARM_CACHE_RECONCILE_INTERVAL;
+	if (fm_get_config_key(key, val)){
+		int num = fm_db_util_string_to_int(val);
+		if (num < 0 || num > FM_ALARM_CACHE_RECONCILE_INTERVAL_MAX){
+			FM_ERROR_LOG("Invalid (%s) (%s), using (%u)\n", key.c_str(),
+					val.c_str(), interval);
+		}else{
+			interval = num;
+		}
+	}
+	return interval;
+}
+
+static unsigned int fm_max_client_connections(){
+	unsigned int conns = FM_MAX_CLIENT_CONNECTIONS_DEFAULT;
+	std::string val;
+	std::string key = FM_MAX_CLIENT_CONNECTIONS;
+	if (fm_get_config_key(key, val)){
+		int num = fm_db_util_string_to_int(val);
+		if (num < 1 || num > FM_MAX_CLIENT_CONNECTIONS_MAX){
+			FM_ERROR_LOG("Invalid (%s) (%s), using (%u)\n", key.c_str(),
+					val.c_str(), conns);
+		}else{
+			conns = num;
+		}
+	}
+	return conns;
 }
 
 void create_db_log(sFmJobReq &req){
@@ -139,6 +250,18 @@ void create_db_log(sFmJobReq &req){
 	fm_snmp_util_gen_trap(FM_ALARM_MESSAGE, alarm);
 }
 
+// Alarms of the rows of a DB alarm query
+static void fm_db_result_to_alarms(fm_db_result_t &res,
+		CFmAlarmCache::alarm_list_t &alarmv) {
+	SFmAlarmDataT alarm;
+
+	alarmv.reserve(res.size());
+	for (size_t ix = 0; ix < res.size(); ++ix) {
+		CFmDbAlarm::convert_to(res[ix],&alarm);
+		alarmv.push_back(alarm);
+	}
+}
+
 void get_db_alarm(CFmDBSession &sess, sFmGetReq &req, void *context){
 
 	fm_buff_t buff = req.data;
@@ -148,17 +271,22 @@ void get_db_alarm(CFmDBSession &sess, sFmGetReq &req, void *context){
 	FmSocketServerProcessor *srv = (FmSocketServerProcessor *)context;
 	CFmDbAlarmOperation op;
 	fm_db_result_t res;
+	CFmAlarmCache::alarm_list_t alarmv;
 	SFmAlarmDataT alarm;
+	bool ok = true;
 
 	memset(&alarm, 0, sizeof(alarm));
 	hdr->msg_rc = FM_ERR_OK;
-	res.clear();
-	if ((op.get_alarm(sess, *filter, res)) != true){
+	if (!getAlarmCache().get_alarm(*filter, alarmv)){
+		ok = op.get_alarm(sess, *filter, res);
+		fm_db_result_to_alarms(res, alarmv);
+	}
+	if (!ok){
 		hdr->msg_rc = FM_ERR_DB_OPERATION_FAILURE;
-	}else if (res.size() > 0){
+	}else if (alarmv.size() > 0){
 		FM_INFO_LOG("Get  alarm: (%s) (%s)\n", filter->alarm_id,
 				filter->entity_instance_id);
-		CFmDbAlarm::convert_to(res[0],&alarm);
+		alarm = alarmv[0];
 	}else{
 		hdr->msg_rc = FM_ERR_ENTITY_NOT_FOUND;
 	}
@@ -175,47 +303,30 @@ void get_db_alarm(CFmDBSession &sess, sFmGetReq &req, void *context){
 	}
 }
 
-void get_db_alarms(CFmDBSession &sess, sFmGetReq &req, void *context){
-
-	fm_buff_t buff = req.data;
-	SFmMsgHdrT *hdr = (SFmMsgHdrT *)&buff[0];
-	void * data = &buff[sizeof(SFmMsgHdrT)];
-	fm_ent_inst_t *pid = (fm_ent_inst_t *)(data);
-	fm_ent_inst_t &id = *pid;
-	FmSocketServerProcessor *srv = (FmSocketServerProcessor *)context;
-	CFmDbAlarmOperation op;
-	fm_db_result_t res;
-	std::vector<SFmAlarmDataT> alarmv;
-
-	FM_DEBUG_LOG("handle get_db_alarms:%s\n", id);
+// Send the result of an alarm list query: the number of alarms followed
+// by the alarms, FM_ERR_ENTITY_NOT_FOUND if there are none
+static void send_alarm_list(FmSocketServerProcessor *srv, int fd,
+		SFmMsgHdrT *hdr, bool ok, CFmAlarmCache::alarm_list_t &alarmv) {
 
 	hdr->msg_rc = FM_ERR_OK;
-	res.clear();
-	if (op.get_alarms(sess, id, res) != true){
+	if (!ok){
 		hdr->msg_rc = FM_ERR_DB_OPERATION_FAILURE;
-	}else if (res.size() > 0){
-		int ix = 0;
-		int resp_len = res.size();
-		SFmAlarmDataT alarm;
-		alarmv.clear();
-		for ( ; ix < resp_len ; ++ix ) {
-			CFmDbAlarm::convert_to(res[ix],&alarm);
-			alarmv.push_back(alarm);
-		}
-	}else{
-		FM_DEBUG_LOG("No alarms found for entity_instance_id (%s)\n", id);
+	}else if (alarmv.size() == 0){
 		hdr->msg_rc = FM_ERR_ENTITY_NOT_FOUND;
 	}
 
 	if ((hdr->msg_rc==FM_ERR_OK) && (alarmv.size() > 0)){
 		int found_num_alarms=alarmv.size();
+		FM_DEBUG_LOG("Get faults: found alarms: (%d)", found_num_alarms);
 
+		// (num of alarms found * size of alarm structure) +
+		// space to report number of alarms found.
 		int total_len =(found_num_alarms * sizeof(SFmAlarmDataT)) + sizeof(uint32_t);
 
 		void * buffer = malloc(total_len);
 		if (buffer==NULL) {
 			hdr->msg_rc =FM_ERR_SERVER_NO_MEM;
-			srv->send_response(req.fd,hdr,NULL,0);
+			srv->send_response(fd,hdr,NULL,0);
 			return;
 		}
 		uint32_t *alen = (uint32_t*) buffer;
@@ -224,76 +335,66 @@ void get_db_alarms(CFmDBSession &sess, sFmGetReq &req, void *context){
 		SFmAlarmDataT * alarms = (SFmAlarmDataT*) ( ((char*)buffer)+sizeof(uint32_t));
 
 		memcpy(alarms,&(alarmv[0]),alarmv.size() * sizeof(SFmAlarmDataT));
-		srv->send_response(req.fd,hdr,buffer,total_len);
+		srv->send_response(fd,hdr,buffer,total_len);
 		free(buffer);
 	} else {
-		srv->send_response(req.fd,hdr,NULL,0);
+		srv->send_response(fd,hdr,NULL,0);
 	}
 }
 
-void get_db_alarms_by_id(CFmDBSession &sess, sFmGetReq &req, void *context){
+void get_db_alarms(CFmDBSession &sess, sFmGetReq &req, void *context){
 
 	fm_buff_t buff = req.data;
 	SFmMsgHdrT *hdr = (SFmMsgHdrT *)&buff[0];
 	void * data = &buff[sizeof(SFmMsgHdrT)];
-	fm_alarm_id *aid = (fm_alarm_id *)(data);
-	fm_alarm_id &id = *aid;
-	FmSocketServerProcessor *srv = (FmSocketServerProcessor *)context;
+	fm_ent_inst_t *pid = (fm_ent_inst_t *)(data);
+	fm_ent_inst_t &id = *pid;
 	CFmDbAlarmOperation op;
 	fm_db_result_t res;
-	std::vector<SFmAlarmDataT> alarmv;
+	CFmAlarmCache::alarm_list_t alarmv;
+	bool ok = true;
 
-	FM_DEBUG_LOG("handle get_db_alarms_by_id:%s\n", id);
+	FM_DEBUG_LOG("handle get_db_alarms:%s\n", id);
 
-	hdr->msg_rc = FM_ERR_OK;
-	res.clear();
-	if (op.get_alarms_by_id(sess, id, res) != true){
-		hdr->msg_rc = FM_ERR_DB_OPERATION_FAILURE;
-	}else if (res.size() > 0){
-		int ix = 0;
-		int resp_len = res.size();
-		CFmDbAlarm dbAlm;
-		SFmAlarmDataT alarm;
-		alarmv.clear();
-		for ( ; ix < resp_len ; ++ix ) {
-			CFmDbAlarm::convert_to(res[ix],&alarm);
-			alarmv.push_back(alarm);
-		}
-	}else{
-		FM_DEBUG_LOG("No alarms found for alarm_id (%s)\n", id);
-		hdr->msg_rc = FM_ERR_ENTITY_NOT_FOUND;
+	if (!getAlarmCache().get_alarms(id, alarmv)){
+		ok = op.get_alarms(sess, id, res);
+		fm_db_result_to_alarms(res, alarmv);
 	}
+	if (ok && alarmv.size() == 0)
+		FM_DEBUG_LOG("No alarms found for entity_instance_id (%s)\n", id);
+	send_alarm_list((FmSocketServerProcessor *)context, req.fd, hdr, ok, alarmv);
+}
 
-	if ((hdr->msg_rc==FM_ERR_OK) && (alarmv.size() > 0)){
-		int found_num_alarms=alarmv.size();
-
-		int total_len =(found_num_alarms * sizeof(SFmAlarmDataT)) + sizeof(uint32_t);
+void get_db_alarms_by_id(CFmDBSession &sess, sFmGetReq &req, void *context){
 
-		void * buffer = malloc(total_len);
-		if (buffer==NULL) {
-			hdr->msg_rc =FM_ERR_SERVER_NO_MEM;
-			srv->send_response(req.fd,hdr,NULL,0);
-			return;
-		}
-		uint32_t *alen = (uint32_t*) buffer;
-		*alen =found_num_alarms;
+	fm_buff_t buff = req.data;
+	SFmMsgHdrT *hdr = (SFmMsgHdrT *)&buff[0];
+	void * data = &buff[sizeof(SFmMsgHdrT)];
+	fm_alarm_id *aid = (fm_alarm_id *)(data);
+	fm_alarm_id &id = *aid;
+	CFmDbAlarmOperation op;
+	fm_db_result_t res;
+	CFmAlarmCache::alarm_list_t alarmv;
+	bool ok = true;
 
-		SFmAlarmDataT * alarms = (SFmAlarmDataT*) ( ((char*)buffer)+sizeof(uint32_t));
+	FM_DEBUG_LOG("handle get_db_alarms_by_id:%s\n", id);
 
-		memcpy(alarms,&(alarmv[0]),alarmv.size() * sizeof(SFmAlarmDataT));
-		srv->send_response(req.fd,hdr,buffer,total_len);
-		free(buffer);
-	} else {
-		srv->send_response(req.fd,hdr,NULL,0);
+	if (!getAlarmCache().get_alarms_by_id(id, alarmv)){
+		ok = op.get_alarms_by_id(sess, id, res);
+		fm_db_result_to_alarms(res, alarmv);
 	}
+	if (ok && alarmv.size() == 0)
+		FM_DEBUG_LOG("No alarms found for alarm_id (%s)\n", id);
+	send_alarm_list((FmSocketServerProcessor *)context, req.fd, hdr, ok, alarmv);
 }
 
 /**
- * Retrieves faults from the database based on the specified alarm ID and entity instance ID.
+ * Retrieves faults based on the specified alarm ID and entity instance ID.
  *
- * This function queries the database for alarms that match the provided alarm ID
- * and entity instance ID. The results are then sent back to the client through
- * the provided socket server processor.
+ * This function looks up the alarms that match the provided alarm ID and
+ * entity instance ID in the alarm cache, or in the database while the
+ * cache is not loaded. The results are then sent back to the client
+ * through the provided socket server processor.
  *
  * **Parameters:**
  * - `sess`: A reference to a `CFmDBSession` object representing the database session.
@@ -305,7 +406,7 @@ void get_db_alarms_by_id(CFmDBSession &sess, sFmGetReq &req, void *context){
  * sections.
  *    - It casts the data section to an `AlarmFilter` pointer and the context to an
  * `FmSocketServerProcessor` pointer.
- *    - Database Query
+ *    - Alarm cache or database query, an empty alarm ID is a database failure
  *    - If alarms are found, it fills a vector with the alarm data.
  *    - Sets the number of alarms found in the buffer and copies the alarm data into the buffer.
  *    - It sends the response back to the client using the `send_response` method of the
@@ -324,70 +425,109 @@ void get_db_alarms_by_id_n_eid(CFmDBSession &sess, sFmGetReq &req, void *context
 	SFmMsgHdrT *hdr = (SFmMsgHdrT *)&buff[0];
 	void * data = &buff[sizeof(SFmMsgHdrT)];
 	AlarmFilter *filter = (AlarmFilter *)data;
-	FmSocketServerProcessor *srv = (FmSocketServerProcessor *)context;
 	CFmDbAlarmOperation op;
 	fm_db_result_t res;
-	std::vector<SFmAlarmDataT> alarmv;
+	CFmAlarmCache::alarm_list_t alarmv;
+	bool ok = true;
 
 	FM_DEBUG_LOG("handle get_db_alarms_by_id_n_eid:%s\n", filter->alarm_id);
 
-	hdr->msg_rc = FM_ERR_OK;
-	res.clear();
-	if (op.get_alarms_by_id_n_eid(sess, *filter, res) != true){
-		hdr->msg_rc = FM_ERR_DB_OPERATION_FAILURE;
-	}else if (res.size() > 0){
-		int ix = 0;
-		int resp_len = res.size();
-		SFmAlarmDataT alarm;
-		alarmv.clear();
-		// Fill the tuple data vector for the response.
-		for ( ; ix < resp_len ; ++ix ) {
-			CFmDbAlarm::convert_to(res[ix],&alarm);
-			alarmv.push_back(alarm);
-		}
-	} else {
+	// the DB operation rejects an empty alarm id
+	if ((strlen(filter->alarm_id) == 0) ||
+	    !getAlarmCache().get_alarms_by_id_n_eid(*filter, alarmv)){
+		ok = op.get_alarms_by_id_n_eid(sess, *filter, res);
+		fm_db_result_to_alarms(res, alarmv);
+	}
+	if (ok && alarmv.size() == 0)
 		FM_DEBUG_LOG("No alarms found for alarm id (%s), "
 					 "entity_instance_id (%s)\n",
 					 filter->alarm_id, filter->entity_instance_id);
-		hdr->msg_rc = FM_ERR_ENTITY_NOT_FOUND;
+	send_alarm_list((FmSocketServerProcessor *)context, req.fd, hdr, ok, alarmv);
+}
+
+/**
+ * Retrieves the alarms of several entity instance ids or alarm ids in one
+ * request (EFmGetFaultsByEids / EFmGetFaultsByIds).
+ *
+ * The request data is an array of FM_MAX_BUFFER_LENGTH sized ids. All
+ * alarms are read with a single cache lookup or DB query and sent back in
+ * one response, the number of alarms followed by the alarms, as for
+ * EFmGetFaults.
+ */
+void get_db_alarms_by_id_list(CFmDBSession &sess, sFmGetReq &req, void *context){
+
+	fm_buff_t buff = req.data;
+	SFmMsgHdrT *hdr = (SFmMsgHdrT *)&buff[0];
+	const char *data = &buff[sizeof(SFmMsgHdrT)];
+	size_t num_ids = hdr->msg_size / FM_MAX_BUFFER_LENGTH;
+	CFmDbAlarmOperation op;
+	fm_db_result_t res;
+	CFmAlarmCache::alarm_list_t alarmv;
+	std::vector<std::string> ids;
+	bool eids = (hdr->action == EFmGetFaultsByEids);
+	bool ok = true;
+
+	for (size_t ix = 0; ix < num_ids; ++ix) {
+		const char *id = data + (ix * FM_MAX_BUFFER_LENGTH);
+		ids.push_back(std::string(id, strnlen(id, FM_MAX_BUFFER_LENGTH)));
 	}
 
-	if ((hdr->msg_rc==FM_ERR_OK) && (alarmv.size() > 0)){
-		int found_num_alarms=alarmv.size();
-		FM_DEBUG_LOG("Get faults: found alarms: (%d)", found_num_alarms);
+	FM_DEBUG_LOG("handle get_db_alarms_by_id_list, action:%u, ids:%zu\n",
+			hdr->action, ids.size());
 
-		// (num of alarms found * size of alarm structure) +
-		// space to report number of alarms found.
-		int total_len =(found_num_alarms * sizeof(SFmAlarmDataT)) + sizeof(uint32_t);
+	if (eids ? !getAlarmCache().get_alarms_by_eids(ids, alarmv) :
+			!getAlarmCache().get_alarms_by_ids(ids, alarmv)){
+		if (eids)
+			ok = op.get_alarms_by_eids(sess, ids, res);
+		else
+			ok = op.get_alarms_by_ids(sess, ids, res);
+		fm_db_result_to_alarms(res, alarmv);
+	}
+	send_alarm_list((FmSocketServerProcessor *)context, req.fd, hdr, ok, alarmv);
+}
 
-		void * buffer = malloc(total_len);
-		if (buffer==NULL) {
-			hdr->msg_rc =FM_ERR_SERVER_NO_MEM;
-			srv->send_response(req.fd,hdr,NULL,0);
-			return;
-		}
-		uint32_t *alen = (uint32_t*) buffer;
-		*alen = found_num_alarms;
+/**
+ * Retrieves one page of the alarms of an entity instance id or of an
+ * alarm id (EFmGetFaultsPage / EFmGetFaultsByIdPage).
+ *
+ * The request data is an SFmAlarmPageT. Alarms are ordered by entity
+ * instance id and alarm id, and the page starts after the alarm in
+ * page.after, so a client can walk a large result in bounded chunks.
+ */
+void get_db_alarms_page(CFmDBSession &sess, sFmGetReq &req, void *context){
 
-		SFmAlarmDataT * alarms = (SFmAlarmDataT*) ( ((char*)buffer)+sizeof(uint32_t));
+	fm_buff_t buff = req.data;
+	SFmMsgHdrT *hdr = (SFmMsgHdrT *)&buff[0];
+	SFmAlarmPageT *page = (SFmAlarmPageT *)&buff[sizeof(SFmMsgHdrT)];
+	bool by_id = (hdr->action == EFmGetFaultsByIdPage);
+	CFmDbAlarmOperation op;
+	fm_db_result_t res;
+	CFmAlarmCache::alarm_list_t alarmv;
+	bool ok = true;
 
-		memcpy(alarms,&(alarmv[0]),alarmv.size() * sizeof(SFmAlarmDataT));
-		srv->send_response(req.fd,hdr,buffer,total_len);
-		free(buffer);
-	} else {
-		srv->send_response(req.fd,hdr,NULL,0);
+	// ids from the wire may not be terminated
+	page->id[sizeof(page->id) - 1] = '\0';
+	page->after.alarm_id[sizeof(page->after.alarm_id) - 1] = '\0';
+	page->after.entity_instance_id[sizeof(page->after.entity_instance_id) - 1] = '\0';
+
+	FM_DEBUG_LOG("handle get_db_alarms_page, action:%u, id:%s, limit:%u\n",
+			hdr->action, page->id, page->limit);
+
+	if (!getAlarmCache().get_alarms_page(*page, by_id, alarmv)){
+		ok = op.get_alarms_page(sess, *page, by_id, res);
+		fm_db_result_to_alarms(res, alarmv);
 	}
+	send_alarm_list((FmSocketServerProcessor *)context, req.fd, hdr, ok, alarmv);
 }
 
-void fm_handle_job_request(CFmDBSession &sess, sFmJobReq &req){
+// DB part of a job: mask/unmask the alarms it inhibits, add the alarm
+// history and look up the suppression of the alarm. suppression_ok is
+// false when the lookup failed and no trap must be sent.
+static void fm_job_db_update(CFmDBSession &sess, sFmJobReq &req,
+		bool &is_event_suppressed, bool &suppression_ok){
 	CFmDbAlarmOperation op;
 	CFmEventSuppressionOperation event_suppression_op;
 
-	//check if it is a customer log request
-	if (req.type == FM_CUSTOMER_LOG) {
-		return create_db_log(req);
-	}
-
 	// check to see if there are any alarms need to be masked/unmasked
 	if (req.type != FM_ALARM_HIERARCHICAL_CLEAR){
 		if (req.data.inhibit_alarms){
@@ -401,19 +541,97 @@ void fm_handle_job_request(CFmDBSession &sess, sFmJobReq &req){
 				req.data.alarm_id, req.data.entity_instance_id);
 	}
 
-	bool is_event_suppressed = false;
-
+	is_event_suppressed = false;
+	suppression_ok = true;
 	if ((req.type != FM_ALARM_HIERARCHICAL_CLEAR) &&
 			(!event_suppression_op.get_event_suppressed(sess, req.data, is_event_suppressed))) {
 		FM_ERROR_LOG("Failed to retrieve event suppression status in DB for (%s)",
 				req.data.alarm_id);
-	} else {
-        if (!is_event_suppressed)
-		    fm_snmp_util_gen_trap(req.type, req.data);
+		suppression_ok = false;
 	}
+}
+
+// Notification part of a job: the SNMP trap and the event log
+static void fm_job_notify(sFmJobReq &req, bool is_event_suppressed,
+		bool suppression_ok){
+	if (suppression_ok && !is_event_suppressed)
+		fm_snmp_util_gen_trap(req.type, req.data);
 
 	fmLogAddEventLog(&req.data, is_event_suppressed);
+}
 
+void fm_handle_job_request(CFmDBSession &sess, sFmJobReq &req){
+	//check if it is a customer log request
+	if (req.type == FM_CUSTOMER_LOG) {
+		return create_db_log(req);
+	}
+
+	bool is_event_suppressed = false;
+	bool suppression_ok = true;
+	fm_job_db_update(sess, req, is_event_suppressed, suppression_ok);
+	fm_job_notify(req, is_event_suppressed, suppression_ok);
+}
+
+// Run the DB part of the jobs [begin, end) in one transaction, then send
+// their traps and event logs in queue order once it is committed. If the
+// transaction fails it is rolled back and the jobs are handled one by one
+// as before.
+static void fm_handle_job_run(CFmDBSession &sess,
+		std::vector<sFmJobReq> &jobs, size_t begin, size_t end){
+	if (end - begin == 1){
+		fm_handle_job_request(sess, jobs[begin]);
+		return;
+	}
+
+	// the DB part updates the alarm state of the job, keep the originals
+	// for a retry
+	std::vector<sFmJobReq> done(jobs.begin() + begin, jobs.begin() + end);
+	std::vector<bool> suppressed(done.size(), false);
+	std::vector<bool> suppression_ok(done.size(), true);
+
+	bool ok = (sess.cmd("BEGIN", false) == 0);
+	for (size_t i = 0; ok && i < done.size(); i++){
+		bool is_suppressed = false, lookup_ok = true;
+		fm_job_db_update(sess, done[i], is_suppressed, lookup_ok);
+		suppressed[i] = is_suppressed;
+		suppression_ok[i] = lookup_ok;
+	}
+	// A failed statement aborts the whole transaction, and COMMIT of an
+	// aborted transaction rolls it back
+	ok = ok && (PQtransactionStatus(sess.get_pgconn()) == PQTRANS_INTRANS);
+	ok = ok && (sess.cmd("COMMIT", false) == 0);
+	if (!ok){
+		FM_ERROR_LOG("Failed to commit a batch of (%zu) jobs, retry one by one\n",
+				done.size());
+		sess.cmd("ROLLBACK", false);
+		for (size_t i = begin; i < end; i++){
+			fm_handle_job_request(sess, jobs[i]);
+		}
+		return;
+	}
+
+	for (size_t i = 0; i < done.size(); i++){
+		fm_job_notify(done[i], suppressed[i], suppression_ok[i]);
+	}
+}
+
+// Handle a batch of jobs in queue order. The alarm jobs between two
+// customer logs share a transaction; a customer log is handled on its own,
+// after the jobs queued before it are committed and before the ones queued
+// after it are written, so the batch keeps the order of the event logs.
+static void fm_handle_job_batch(CFmDBSession &sess,
+		std::vector<sFmJobReq> &jobs){
+	size_t begin = 0;
+	for (size_t i = 0; i < jobs.size(); i++){
+		if (jobs[i].type != FM_CUSTOMER_LOG)
+			continue;
+		if (begin < i)
+			fm_handle_job_run(sess, jobs, begin, i);
+		fm_handle_job_request(sess, jobs[i]);
+		begin = i + 1;
+	}
+	if (begin < jobs.size())
+		fm_handle_job_run(sess, jobs, begin, jobs.size());
 }
 
 void fm_handle_get_request(CFmDBSession &sess, sFmGetReq &req,
@@ -425,6 +643,10 @@ void fm_handle_get_request(CFmDBSession &sess, sFmGetReq &req,
 	case EFmGetFaults:get_db_alarms(sess,req,context); break;
 	case EFmGetFaultsById:get_db_alarms_by_id(sess,req,context); break;
 	case EFmGetFaultsByIdnEid:get_db_alarms_by_id_n_eid(sess,req,context); break;
+	case EFmGetFaultsByEids:
+	case EFmGetFaultsByIds:get_db_alarms_by_id_list(sess,req,context); break;
+	case EFmGetFaultsPage:
+	case EFmGetFaultsByIdPage:get_db_alarms_page(sess,req,context); break;
 	default:
 		FM_ERROR_LOG("Unexpected job request, action:%u\n",hdr->action);
 		break;
@@ -451,17 +673,16 @@ inline void * prep_msg_buffer(std::vector<char> &buff, int reserved_size,
 void FmSocketServerProcessor::send_response(int fd, SFmMsgHdrT *hdr, void *data, size_t len) {
 	fm_buff_t resp;
 	CFmMutexGuard m(getSockMutex());
+	// called from the job threads too, the socket is left to run() to close
 	if (fm_msg_utils_prep_requet_msg(resp,hdr->action,data,len)!=FM_ERR_OK) {
-		rm_socket(fd);
 		FM_INFO_LOG("Failed to prepare response, close fd:(%d)", fd);
-		::close(fd);
+		shutdown_socket(fd);
 		return;
 	}
 	ptr_to_hdr(resp)->msg_rc = hdr->msg_rc;
 	if (!write_packet(fd,resp)){
 		FM_INFO_LOG("Failed to send response, close fd:(%d)", fd);
-		rm_socket(fd);
-		::close(fd);
+		shutdown_socket(fd);
 		return;
 	}
 }
@@ -511,6 +732,15 @@ void FmSocketServerProcessor::handle_create_fault(int fd,
 		//a.print();
 		if (op.create_alarm(sess, a)) {
 			std::string uuid_str = a.find_field(FM_ALARM_COLUMN_UUID);
+			// with keep_existing_alarm the DB keeps the alarm it has and
+			// returns its uuid, which the cache must have as well
+			bool kept = alarm->keep_existing_alarm &&
+					getAlarmCache().has_alarm(*alarm);
+			if (!kept && (uuid_str == alarm->uuid)) {
+				getAlarmCache().set_alarm(*alarm);
+			} else if (!kept) {
+				getAlarmCache().invalidate();
+			}
 			strncpy(alarm->uuid, uuid_str.c_str(), sizeof(alarm->uuid));
 			FM_INFO_LOG("Alarm created/updated/kept: (%s) (%s) (%d) (%s)\n",
 						alarm->alarm_id, alarm->entity_instance_id, alarm->severity, alarm->uuid);
@@ -593,6 +823,7 @@ void FmSocketServerProcessor::handle_delete_faults(int fd,
 	rc = op.delete_alarms(sess,id);
 	if (rc > 0){
 		FM_DEBUG_LOG("Deleted alarms (%s)\n", id);
+		getAlarmCache().delete_alarms(id);
 		SFmAlarmDataT alarm;
 		memset(&alarm, 0, sizeof(alarm));
 		//only cares about entity_instance_id in hierarchical alarm clear trap
@@ -660,6 +891,7 @@ void FmSocketServerProcessor::handle_delete_fault(
 			if (op.delete_alarm(sess, *filter) > 0) {
 				FM_INFO_LOG("Deleted alarm(s): (%s) (%s)\n",
 				            filter->alarm_id, filter->entity_instance_id);
+				getAlarmCache().delete_alarm(*filter);
 				if (res.size() == 1) {
 					// normal workflow, just one alarm match
 					CFmDbAlarm::convert_to(res[0], &alarm);
@@ -782,6 +1014,33 @@ void FmSocketServerProcessor::handle_get_faults(int fd,
 	enqueue_get(req);
 }
 
+void FmSocketServerProcessor::handle_get_faults_by_id_list(int fd,
+		SFmMsgHdrT *hdr, std::vector<char> &rdata) {
+
+	// A variable number of ids, each FM_MAX_BUFFER_LENGTH long
+	if ((hdr->msg_size == 0) || (hdr->msg_size % FM_MAX_BUFFER_LENGTH != 0)) {
+		FM_ERROR_LOG("Invalid message size: %u, expected multiple of %d",
+			hdr->msg_size, FM_MAX_BUFFER_LENGTH);
+		hdr->msg_rc = FM_ERR_INVALID_REQ;
+		send_response(fd, hdr, NULL, 0);
+		return;
+	}
+	sFmGetReq req;
+	req.fd = fd;
+	req.data = rdata;
+	enqueue_get(req);
+}
+
+void FmSocketServerProcessor::handle_get_faults_page(int fd,
+		SFmMsgHdrT *hdr, std::vector<char> &rdata) {
+
+	is_request_valid(hdr->msg_size,SFmAlarmPageT);
+	sFmGetReq req;
+	req.fd = fd;
+	req.data = rdata;
+	enqueue_get(req);
+}
+
 void FmSocketServerProcessor::handle_get_fault(int fd,
 		SFmMsgHdrT *hdr, std::vector<char> &rdata) {
 
@@ -806,6 +1065,10 @@ void FmSocketServerProcessor::handle_socket_data(int fd,
 	case EFmGetFaults:handle_get_faults(fd,hdr,rdata); break;
 	case EFmGetFaultsById:handle_get_faults_by_id(fd,hdr,rdata); break;
 	case EFmGetFaultsByIdnEid:handle_get_faults_by_id_n_eid(fd,hdr,rdata); break;
+	case EFmGetFaultsByEids:
+	case EFmGetFaultsByIds:handle_get_faults_by_id_list(fd,hdr,rdata); break;
+	case EFmGetFaultsPage:
+	case EFmGetFaultsByIdPage:handle_get_faults_page(fd,hdr,rdata); break;
 	case EFmCreateFaultList:handle_create_fault_list(fd,hdr,rdata, sess); break;
 	case EFmDeleteFaultList:handle_delete_fault_list(fd,hdr,rdata,sess); break;
 	default:
@@ -846,10 +1109,41 @@ EFmErrorT fm_server_create(const char *fn) {
         	exit(-1);
         }
 
-        if (!fmCreateThread(fmRegHandlerThread,&srv)) {
+        // The oldest event logs are removed in the background once the
+        // table reaches its max size, the job thread only inserts
+        if (!fmCreateThread(fmEventLogTrimThread,NULL)) {
         	exit(-1);
         }
 
+        // Get requests are served from the alarm cache once the thread
+        // reconciling it with the DB has loaded it, from the DB until then
+        static unsigned int cache_interval = fm_alarm_cache_interval();
+        if (cache_interval > 0) {
+        	if (!fmCreateThread(fmAlarmCacheThread,&cache_interval)) {
+        		exit(-1);
+        	}
+        } else {
+        	FM_INFO_LOG("Alarm cache disabled\n");
+        }
+
+        // Get requests are served by a pool of threads, set and clear
+        // jobs stay on the single job thread to keep their order. A client
+        // waits for each response, so a connection has one get at a time.
+        unsigned int get_threads = fm_get_worker_threads();
+        std::vector<sFmGetWorkerT> &workers = getGetWorkers();
+        workers.resize(get_threads);
+        m_get_stats_time = fmGetCurrentHrt();
+        for (unsigned int i = 0; i < get_threads; i++) {
+        	workers[i].srv = &srv;
+        	workers[i].id = i;
+        	workers[i].requests = 0;
+        	workers[i].busy = 0;
+        	if (!fmCreateThread(fmRegHandlerThread,&workers[i])) {
+        		exit(-1);
+        	}
+        }
+        FM_INFO_LOG("Started (%u) get worker threads\n", get_threads);
+
         if (!fmCreateThread(fmEventSuppressionMonitorThread,NULL)) {
         	exit(-1);
         }
@@ -894,6 +1188,7 @@ EFmErrorT fm_server_create(const char *fn) {
         if ( rt == false)
         	return (EFmErrorT)-1;
 
+        srv.set_max_connections(fm_max_client_connections());
         srv.run();
         return FM_ERR_OK;
 }
@@ -907,17 +1202,18 @@ void fmJobHandlerThread(void *context){
 		exit (-1);
 	}
 
+	// Jobs are not held back to fill a batch: a batch is whatever was
+	// queued while the previous one was written, so it adds no latency
+	std::vector<sFmJobReq> jobs;
 	while (true){
-		sFmJobReq req;
-		while (dequeue_job(req)){
-			fm_handle_job_request(*sess,req);
-		}
-		fmThreadSleep(200);
+		dequeue_jobs(jobs, FM_JOB_BATCH_MAX);
+		fm_handle_job_batch(*sess, jobs);
 	}
 }
 
 void fmRegHandlerThread(void *context){
 
+	sFmGetWorkerT *worker = (sFmGetWorkerT *)context;
 	CFmDBSession *sess;
 	if (fm_db_util_create_session(&sess) != true){
 		FM_ERROR_LOG("Fail to create DB session, exit ...\n");
@@ -925,46 +1221,173 @@ void fmRegHandlerThread(void *context){
 	}
 	while (true){
 		sFmGetReq req;
-		while (dequeue_get(req)){
-			fm_handle_get_request(*sess, req, context);
+		dequeue_get(req);
+		FMTimeT start = fmGetCurrentHrt();
+		fm_handle_get_request(*sess, req, worker->srv);
+		get_request_done(*worker, start);
+	}
+}
+
+void fmAlarmCacheThread(void *context){
+
+	unsigned int interval = *(unsigned int *)context;
+	CFmDBSession *sess;
+	if (fm_db_util_create_session(&sess) != true){
+		FM_ERROR_LOG("Fail to create DB session, exit ...\n");
+		exit (-1);
+	}
+	while (true){
+		if (!getAlarmCache().reconcile(*sess)){
+			// retry soon, the cache keeps serving meanwhile if loaded
+			fmThreadSleep(1000);
+			continue;
 		}
-		fmThreadSleep(100);
+		fmThreadSleep(interval * 1000);
 	}
 }
 
-bool fm_handle_event_suppress_changes(CFmDBSession &sess){
+void fmEventLogTrimThread(void *context){
 
-    int sock_fd;
-    fd_set  readset;
-    PGconn  *pgconn = NULL;
+	CFmDBSession *sess;
+	if (fm_db_util_create_session(&sess) != true){
+		FM_ERROR_LOG("Fail to create DB session, exit ...\n");
+		exit (-1);
+	}
+	while (true){
+		if (!fm_db_util_trim_event_log(*sess)){
+			fmThreadSleep(1000);
+			continue;
+		}
+		fm_db_util_wait_event_log_trim();
+	}
+}
+
+// Drop the pending notifications, 1 if there were any, 0 if none and -1
+// if the connection failed
+static int fm_clear_notifies(PGconn *pgconn){
     PGnotify  *notify;
+    int found = 0;
 
-    pgconn = sess.get_pgconn();
-    sock_fd = PQsocket(pgconn);
+    if (PQconsumeInput(pgconn) == 0){
+        FM_ERROR_LOG("Failed to read notifications: %s\n",
+                PQerrorMessage(pgconn));
+        return -1;
+    }
+    while ((notify = PQnotifies(pgconn)) != NULL)
+    {
+        PQfreemem(notify);
+        found = 1;
+    }
+    return found;
+}
+
+// Wait up to timeout_ms, forever if negative, for event_suppression
+// notifications. Same return as fm_clear_notifies, which it calls to drop
+// them, 0 on timeout.
+static int fm_wait_notifies(PGconn *pgconn, int timeout_ms){
+    int sock_fd = PQsocket(pgconn);
+    fd_set  readset;
+    struct timeval tv;
+    struct timeval *ptv = NULL;
+
+    // libpq may have read notifications along with a query result,
+    // select() would not see them
+    int rc = fm_clear_notifies(pgconn);
+    if (rc != 0)
+        return rc;
 
     FD_ZERO(&readset);
     FD_SET(sock_fd, &readset);
+    if (timeout_ms >= 0){
+        tv.tv_sec = timeout_ms / 1000;
+        tv.tv_usec = (timeout_ms % 1000) * 1000;
+        ptv = &tv;
+    }
 
-    // Wait for event_suppression update to occur
-    if (select(sock_fd + 1, &readset, NULL, NULL, NULL) < 0)
-    {
-		FM_ERROR_LOG("select() failed: %s\n", strerror(errno));
+    rc = select(sock_fd + 1, &readset, NULL, NULL, ptv);
+    if (rc < 0){
+        if (errno == EINTR)
+            return 0;
+        FM_ERROR_LOG("select() failed: %s\n", strerror(errno));
+        return -1;
+    }
+    if (rc == 0)
+        return 0;
+    return fm_clear_notifies(pgconn);
+}
 
-		if (errno!=EINTR)
-			return false;
+static uint64_t fm_monotonic_ms(){
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000 + ts.tv_nsec / 1000000;
+}
+
+static unsigned int fm_event_suppression_debounce(const char *name,
+        unsigned int def){
+    unsigned int ms = def;
+    std::string val;
+    std::string key = name;
+    if (fm_get_config_key(key, val)){
+        int num = fm_db_util_string_to_int(val);
+        if (num < 0 || num > FM_EVENT_SUPPRESSION_DEBOUNCE_MS_MAX){
+            FM_ERROR_LOG("Invalid (%s) (%s), using (%u)\n", key.c_str(),
+                    val.c_str(), ms);
+        }else{
+            ms = num;
+        }
     }
+    return ms;
+}
 
-    // Now check for input. This will clear the queue
-    PQconsumeInput(pgconn);
-    while ((notify = PQnotifies(pgconn)) != NULL)
-    {
-        PQfreemem(notify);
+// The alarm cache leaves out the alarms of suppressed events, it serves the
+// gets from the DB until its next reconcile if their status can't be read
+static void fm_reload_event_suppression(CFmDBSession &sess){
+    if (!getAlarmCache().load_suppression(sess)){
+        getAlarmCache().invalidate();
     }
+}
+
+bool fm_handle_event_suppress_changes(CFmDBSession &sess){
+    static unsigned int window = fm_event_suppression_debounce(
+            FM_EVENT_SUPPRESSION_DEBOUNCE,
+            FM_EVENT_SUPPRESSION_DEBOUNCE_DEFAULT);
+    static unsigned int cap = std::max(window, fm_event_suppression_debounce(
+            FM_EVENT_SUPPRESSION_DEBOUNCE_MAX,
+            FM_EVENT_SUPPRESSION_DEBOUNCE_MAX_DEFAULT));
+    PGconn  *pgconn = sess.get_pgconn();
+
+    // Wait for event_suppression update to occur
+    int rc = fm_wait_notifies(pgconn, -1);
+    if (rc <= 0)
+        return (rc == 0);
+
+    // Get requests see the change right away
+    fm_reload_event_suppression(sess);
+
+    // A change often comes with more, send a single Warm Start trap once
+    // no change came for the debounce window, or the cap since the first
+    bool changed = false;
+    uint64_t now = fm_monotonic_ms();
+    uint64_t quiet_end = now + window;
+    uint64_t cap_end = now + cap;
+    while (rc >= 0){
+        uint64_t end = std::min(quiet_end, cap_end);
+        if (now >= end)
+            break;
+        rc = fm_wait_notifies(pgconn, end - now);
+        now = fm_monotonic_ms();
+        if (rc > 0){
+            quiet_end = now + window;
+            changed = true;
+        }
+    }
+    if (changed)
+        fm_reload_event_suppression(sess);
 
     SFmAlarmDataT *alarm = NULL;
     fm_snmp_util_gen_trap(FM_WARM_START, *alarm);
 
-    return true;
+    return (rc >= 0);
 }
 
 void fmEventSuppressionMonitorThread(void *context){
@@ -981,11 +1404,22 @@ void fmEventSuppressionMonitorThread(void *context){
 		FM_ERROR_LOG("Fail to set DB table notify and listen, exit ...\n");
 		exit (-1);
 	}
+	PGconn *listening = sess->get_pgconn();
 
 	while (true){
-		fm_handle_event_suppress_changes(*sess);
-		fmThreadSleep(30000);   // 30 second wait allows some time to buffer in multiple notify events
-		                        // and send only 1 Warm Start trap as a result
+		// A reconnected session no longer listens
+		if (sess->get_pgconn() != listening ||
+				PQstatus(sess->get_pgconn()) != CONNECTION_OK){
+			if (event_suppression_op.set_table_notify_listen(*sess) != true){
+				FM_ERROR_LOG("Fail to set DB table notify and listen\n");
+				fmThreadSleep(1000);
+				continue;
+			}
+			listening = sess->get_pgconn();
+		}
+		if (!fm_handle_event_suppress_changes(*sess)){
+			fmThreadSleep(1000);
+		}
 	}
 }
 
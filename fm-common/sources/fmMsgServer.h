@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014, 2025 Wind River Systems, Inc.
+// Copyright (c) 2014, 2025-2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -33,6 +33,10 @@ protected:
 			std::vector<char> &rdata);
 	virtual void handle_get_faults_by_id_n_eid(int fd, SFmMsgHdrT *hdr,
 			std::vector<char> &rdata);
+	virtual void handle_get_faults_by_id_list(int fd, SFmMsgHdrT *hdr,
+			std::vector<char> &rdata);
+	virtual void handle_get_faults_page(int fd, SFmMsgHdrT *hdr,
+			std::vector<char> &rdata);
 	virtual void handle_create_fault_list(int fd, SFmMsgHdrT *hdr,
 		std::vector<char> &rdata, CFmDBSession &sess);
 	virtual void handle_delete_fault_list(int fd, SFmMsgHdrT *hdr,
@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014 Wind River Systems, Inc.
+// Copyright (c) 2014,2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -46,3 +46,39 @@ CFmMutex::~CFmMutex() {
 
 }
 
+
+CFmCondition::CFmCondition() {
+
+  cntx = NULL;
+
+  pthread_cond_t * pCond = new pthread_cond_t;
+  if (pthread_cond_init(pCond, NULL) == 0) {
+    cntx = pCond;
+  } else {
+    delete pCond;
+  }
+
+}
+
+CFmCondition::~CFmCondition() {
+
+  if (cntx != NULL) {
+    pthread_cond_destroy((pthread_cond_t*)cntx);
+    delete ((pthread_cond_t*)cntx);
+  }
+  cntx = NULL;
+
+}
+
+bool CFmCondition::wait(CFmMutex & m) {
+
+  return pthread_cond_wait((pthread_cond_t*)cntx,
+                           (pthread_mutex_t*)m.cntx)==0;
+
+}
+
+bool CFmCondition::signal() {
+
+  return pthread_cond_signal((pthread_cond_t*)cntx)==0;
+
+}
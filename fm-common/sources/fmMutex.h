@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014 Wind River Systems, Inc.
+// Copyright (c) 2014,2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -11,6 +11,8 @@
 class CFmMutex {
 
   void * cntx;
+
+  friend class CFmCondition;
     
 public:
   CFmMutex();
@@ -39,6 +41,19 @@ public:
   }
 };
 
+// Condition variable to wait on while holding a CFmMutex, the mutex must
+// be locked exactly once by the waiting thread
+class CFmCondition {
+
+  void * cntx;
+
+public:
+  CFmCondition();
+  ~CFmCondition();
+  bool wait(CFmMutex & m);
+  bool signal();
+};
+
 
 #endif
 
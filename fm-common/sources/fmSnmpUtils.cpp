@@ -1,10 +1,11 @@
 //
-// Copyright (c) 2014-2023 Wind River Systems, Inc.
+// Copyright (c) 2014-2023, 2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
 
 #include <assert.h>
+#include <deque>
 #include <iostream>
 #include <json-c/json.h>
 #include <map>
@@ -24,9 +25,12 @@
 #include "fmFile.h"
 #include "fmLog.h"
 #include "fmMsg.h"
+#include "fmMutex.h"
 #include "fmSnmpConstants.h"
 #include "fmSnmpUtils.h"
 #include "fmSocket.h"
+#include "fmThread.h"
+#include "fmTime.h"
 
 #define JSON_TRAP_TAG_ALARM    "alarm"
 #define JSON_TRAP_TAG_OP_TYPE  "operation_type"
@@ -114,56 +118,256 @@ void add_value_json_trap(struct json_object* json_trap, std::string obj_type,
 }
 
 
-/**
-This method opens an socket and writes a message given a server name,
-port number and the number of bytes of the message.
+/*
+ * Sends the traps to the trap server from its own thread, so that a slow
+ * or unreachable trap server does not hold up the job thread.
+ *
+ * The traps wait in a bounded queue, the oldest are dropped once it is
+ * full. Each trap is sent over a connection of its own, as trap servers
+ * may read a single trap per connection. With trap_server_persistent=1 the
+ * connection is kept open instead and the traps queued meanwhile are
+ * written to it at once. A failed send is retried with a backoff of up to
+ * FM_TRAP_RETRY_MAX seconds.
+ */
+class CFmTrapSender {
+public:
+    CFmTrapSender();
+
+    bool enqueue(const std::string &trap);
+    void get_stats(SFmTrapStatsT &stats);
+    void run();
+
+private:
+    bool resolve();
+    bool connect(CFmSocket &client);
+    size_t send(const std::vector<std::string> &traps);
+    void log_stats();
+
+    CFmMutex m_mutex;
+    CFmCondition m_cond;
+    std::deque<std::string> m_queue;
+    bool m_started;
+    SFmTrapStatsT m_stats;
+
+    // used by the sender thread only
+    CFmSocket m_client;
+    bool m_connected;
+    bool m_persistent;
+    std::string m_server;
+    int m_port;
+    std::string m_addr;      // resolved address, empty until resolved
+    int m_family;
+    unsigned int m_retry;    // seconds before the next send attempt
+    FMTimeT m_stats_time;
+};
+
+static CFmTrapSender & getTrapSender(){
+    static CFmTrapSender *sender = new CFmTrapSender;
+    return *sender;
+}
 
-Returns True if message is write succesfully else returns False.
+CFmTrapSender::CFmTrapSender() {
+    memset(&m_stats, 0, sizeof(m_stats));
+    m_started = false;
+    m_connected = false;
+    m_persistent = false;
+    m_port = 0;
+    m_family = AF_UNSPEC;
+    m_retry = FM_TRAP_RETRY_MIN;
+    m_stats_time = 0;
+}
 
-*/
-bool send_data(const char * server_name, int portno, const void * message,
-    int message_len){
+bool CFmTrapSender::enqueue(const std::string &trap) {
+    CFmMutexGuard m(m_mutex);
 
+    if (!m_started) {
+        if (!fmCreateThread(fmSnmpTrapSenderThread, NULL)) {
+            FM_ERROR_LOG("Failed to start the SNMP trap sender\n");
+            return false;
+        }
+        m_started = true;
+    }
+    if (m_queue.size() >= FM_TRAP_QUEUE_MAX) {
+        FM_ERROR_LOG("SNMP trap queue full, dropping the oldest trap\n");
+        m_queue.pop_front();
+        m_stats.dropped++;
+    }
+    m_queue.push_back(trap);
+    m_stats.queued++;
+    m_cond.signal();
+    return true;
+}
+
+void CFmTrapSender::get_stats(SFmTrapStatsT &stats) {
+    CFmMutexGuard m(m_mutex);
+    stats = m_stats;
+}
+
+// Look up the trap server address once, again after a failed connect
+bool CFmTrapSender::resolve() {
     char addr[INET6_ADDRSTRLEN];
-    static bool m_connected = false;
-    static CFmSocket m_client;
     struct addrinfo hints;
     struct addrinfo *res = NULL;
     memset(&hints,0,sizeof(hints));
     hints.ai_family = AF_UNSPEC;     /* Allow IPv4 or IPv6 */
-    hints.ai_socktype = SOCK_STREAM; /* Datagram socket */
-    hints.ai_flags = 0;              /* For wildcard IP address */
-    hints.ai_protocol = 0;           /* Any protocol */
-    hints.ai_canonname = NULL;
-    hints.ai_addr = NULL;
-    hints.ai_next = NULL;
-    bool result = false;
-
-    int rc = getaddrinfo(server_name, NULL, &hints, &res);
+    hints.ai_socktype = SOCK_STREAM;
+
+    int rc = getaddrinfo(m_server.c_str(), NULL, &hints, &res);
     if (rc != 0) {
-      FM_ERROR_LOG("ERROR failed to get SNMP trap server address info :%d", errno);
-    } else {
-        if (res->ai_family == AF_INET || res->ai_family==AF_INET6) {
-          if(res->ai_family == AF_INET) {
-            inet_ntop(AF_INET, &(((sockaddr_in*)res->ai_addr)->sin_addr),
-                        addr, sizeof(addr));
-          } else if (res->ai_family == AF_INET6) {
-            inet_ntop(AF_INET6, &(((sockaddr_in6*)res->ai_addr)->sin6_addr),
-                        addr, sizeof(addr));
-          }
-          m_connected = m_client.connect(addr, portno, res->ai_family);
-          if (m_connected == true) {
-            result = m_client.write_packet(message, message_len);
-            if (result){
-                FM_INFO_LOG("SNMP sent data successfully");
+        FM_ERROR_LOG("ERROR failed to get SNMP trap server address info :%d", errno);
+        return false;
+    }
+    if (res->ai_family == AF_INET) {
+        inet_ntop(AF_INET, &(((sockaddr_in*)res->ai_addr)->sin_addr),
+                addr, sizeof(addr));
+        m_addr = addr;
+    } else if (res->ai_family == AF_INET6) {
+        inet_ntop(AF_INET6, &(((sockaddr_in6*)res->ai_addr)->sin6_addr),
+                addr, sizeof(addr));
+        m_addr = addr;
+    }
+    m_family = res->ai_family;
+    freeaddrinfo(res);
+    return !m_addr.empty();
+}
+
+bool CFmTrapSender::connect(CFmSocket &client) {
+    if (m_addr.empty() && !resolve()) {
+        return false;
+    }
+    if (!client.connect(m_addr.c_str(), m_port, m_family)) {
+        FM_ERROR_LOG("ERROR failed to connect with SNMP trap server: %d", errno);
+        m_addr.clear();
+        return false;
+    }
+    return true;
+}
+
+// Send the traps in order, returns how many of them were sent
+size_t CFmTrapSender::send(const std::vector<std::string> &traps) {
+    if (!m_persistent) {
+        size_t ix = 0;
+        for ( ; ix < traps.size(); ix++) {
+            CFmSocket client;
+            if (!connect(client) ||
+                    !client.write_packet(traps[ix].c_str(), traps[ix].length()))
+                break;
+        }
+        return ix;
+    }
+
+    // The server closes an idle connection, reconnect if it did
+    if (m_connected && !m_client.fd_valid()) {
+        m_connected = false;
+    }
+    if (!m_connected) {
+        m_connected = connect(m_client);
+        if (!m_connected) {
+            return 0;
+        }
+    }
+
+    std::vector<char> buff;
+    for (size_t ix = 0; ix < traps.size(); ix++) {
+        uint32_t len = htonl(traps[ix].length());
+        buff.insert(buff.end(), (char *)&len, (char *)&len + sizeof(len));
+        buff.insert(buff.end(), traps[ix].begin(), traps[ix].end());
+    }
+    if (!m_client.write(&(buff[0]), buff.size())) {
+        m_connected = false;
+        return 0;
+    }
+    return traps.size();
+}
+
+void CFmTrapSender::log_stats() {
+    FMTimeT now = fmGetCurrentHrt();
+    if (now - m_stats_time < (FMTimeT)FM_TRAP_STATS_LOG_INTERVAL * 1000000)
+        return;
+
+    SFmTrapStatsT stats;
+    size_t waiting;
+    {
+        CFmMutexGuard m(m_mutex);
+        stats = m_stats;
+        waiting = m_queue.size();
+    }
+    FM_INFO_LOG("SNMP traps: queued (%lu), sent (%lu), dropped (%lu), "
+            "failed sends (%lu), waiting (%lu)\n", stats.queued, stats.sent,
+            stats.dropped, stats.failed, (unsigned long)waiting);
+    m_stats_time = now;
+}
+
+void CFmTrapSender::run() {
+    std::string key = FM_TRAP_SERVER_IP;
+    std::string val;
+    fm_get_config_key(key, m_server);
+    key = FM_TRAP_SERVER_PORT;
+    if (fm_get_config_key(key, val)) {
+        m_port = atoi(val.c_str());
+    }
+    key = FM_TRAP_SERVER_PERSISTENT;
+    if (fm_get_config_key(key, val)) {
+        m_persistent = (val == "1");
+    }
+    m_stats_time = fmGetCurrentHrt();
+
+    std::vector<std::string> traps;
+    while (true) {
+        traps.clear();
+        {
+            CFmMutexGuard m(m_mutex);
+            while (m_queue.empty()) {
+                m_cond.wait(m_mutex);
             }
-          } else {
-            FM_ERROR_LOG("ERROR failed to connect with SNMP trap server: %d", errno);
-          }
+            while (!m_queue.empty() && traps.size() < FM_TRAP_BATCH_MAX) {
+                traps.push_back(m_queue.front());
+                m_queue.pop_front();
+            }
+        }
+
+        size_t sent = send(traps);
+        for (size_t ix = 0; ix < sent; ix++) {
+            FM_INFO_LOG("SNMP trap metadata sent succesfully %s %d",
+                    traps[ix].c_str(), traps[ix].length());
         }
+
+        if (sent < traps.size()) {
+            CFmMutexGuard m(m_mutex);
+            m_stats.sent += sent;
+            m_stats.failed++;
+            // Put the unsent traps back in order, ahead of the newer ones
+            for (size_t ix = traps.size(); ix > sent; ix--) {
+                if (m_queue.size() >= FM_TRAP_QUEUE_MAX) {
+                    m_stats.dropped += ix - sent;
+                    break;
+                }
+                m_queue.push_front(traps[ix - 1]);
+            }
+        } else {
+            CFmMutexGuard m(m_mutex);
+            m_stats.sent += sent;
+        }
+
+        if (sent < traps.size()) {
+            FM_ERROR_LOG("ERROR failed to send (%lu) SNMP traps, retry in "
+                    "(%u) seconds", (unsigned long)(traps.size() - sent),
+                    m_retry);
+            fmThreadSleep(m_retry * 1000);
+            m_retry = std::min(m_retry * 2, (unsigned int)FM_TRAP_RETRY_MAX);
+        } else {
+            m_retry = FM_TRAP_RETRY_MIN;
+        }
+        log_stats();
     }
-    freeaddrinfo(res);
-    return result;
+}
+
+void fmSnmpTrapSenderThread(void *context) {
+    getTrapSender().run();
+}
+
+void fm_snmp_util_get_trap_stats(SFmTrapStatsT &stats) {
+    getTrapSender().get_stats(stats);
 }
 
 static std::string get_trap_objtype(int type){
@@ -271,11 +475,13 @@ static std::string format_trap_json(int type, SFmAlarmDataT &data){
 
 /**
 
-This method sends a JSON string representing the trap
+This method queues a JSON string representing the trap, to be sent
 to a trap server listening in a specific port.
 
 The server name and port are readed from fm.conf file.
 
+Returns True if the trap is queued, it is sent later by the trap sender.
+
 */
 bool fm_snmp_util_gen_trap(int type, SFmAlarmDataT &data) {
 
@@ -324,15 +530,11 @@ bool fm_snmp_util_gen_trap(int type, SFmAlarmDataT &data) {
             return false;
         }
 
-        send_json_success = send_data(trap_server_ip.c_str(),
-                atoi(trap_server_port.c_str()), json_trap.c_str(),
-                        json_trap.length());
+        // Sent by the trap sender thread, see CFmTrapSender
+        send_json_success = getTrapSender().enqueue(json_trap);
 
-        if(send_json_success){
-            FM_INFO_LOG("SNMP trap metadata sent succesfully %s %d",
-                    json_trap.c_str(), json_trap.length());
-        } else {
-            FM_ERROR_LOG("ERROR failed to send SNMP trap metadata %s %d",
+        if(!send_json_success){
+            FM_ERROR_LOG("ERROR failed to queue SNMP trap metadata %s %d",
                     json_trap.c_str(), json_trap.length());
         }
     }else{
@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014-2020 Wind River Systems, Inc.
+// Copyright (c) 2014-2020, 2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -11,7 +11,16 @@
 #include "fmAPI.h"
 #include "fmDb.h"
 
+typedef struct {
+	unsigned long queued;    // traps queued for the trap server
+	unsigned long sent;      // traps written to the trap server
+	unsigned long dropped;   // traps dropped from the full queue
+	unsigned long failed;    // failed send attempts
+} SFmTrapStatsT;
+
 bool fm_snmp_util_gen_trap(int type, SFmAlarmDataT &data);
 
+void fm_snmp_util_get_trap_stats(SFmTrapStatsT &stats);
+
 
 #endif
@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2017,2023-2024 Wind River Systems, Inc.
+// Copyright (c) 2017,2023-2024, 2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -10,7 +10,9 @@
 #include <arpa/inet.h>
 #include <netinet/in.h>
 #include <stdlib.h>
+#include <sys/epoll.h>
 #include <sys/poll.h>
+#include <sys/resource.h>
 #include <sys/select.h>
 #include <errno.h>
 #include <unistd.h>
@@ -160,6 +162,13 @@ bool CFmSocket::write(int fd, const void *data, long len) {
 	int offset = 0;
 	while (offset!=len) {
 		int rc = ::write(fd, ((char*)data)+offset,len-offset);
+		if (rc==-1 && (errno==EAGAIN || errno==EWOULDBLOCK)) {
+			// the server sockets are non blocking, wait for the peer to
+			// read as a blocking socket would
+			struct pollfd pfd = {.fd = fd, .events = POLLOUT};
+			if (poll(&pfd, 1, SOCKET_TIMEOUT_DEFAULT * 1000) > 0) continue;
+			errno = ETIMEDOUT;
+		}
 		if (rc==0 || (rc==-1 && errno!=EINTR)) {
 			FM_ERROR_LOG("Socket Error: Failed to write to fd:(%d), len:(%d), rc:(%d), error:(%s)",
 					fd, len, rc, strerror(errno));
@@ -172,10 +181,14 @@ bool CFmSocket::write(int fd, const void *data, long len) {
 }
 
 bool CFmSocket::write_packet(int fd, const void *data, long plen) {
+	// A single write, a separate write of the length would hold the data
+	// back until the peer acks the length (Nagle's algorithm)
+	std::vector<char> buff(sizeof(uint32_t) + plen);
 	uint32_t len = htonl(plen);
-	bool rc = write(fd,&len,sizeof(len));
-	if (!rc) return false;
-	return write(fd,data,plen);
+	memcpy(&(buff[0]), &len, sizeof(len));
+	if (plen > 0)
+		memcpy(&(buff[sizeof(len)]), data, plen);
+	return write(fd,&(buff[0]),buff.size());
 }
 
 bool CFmSocket::write_packet(int fd, const std::vector<char> &data) {
@@ -326,33 +339,113 @@ void FmSocketServer::rm_socket(int sock) {
 	}
 }
 
+// Give up on a connection from any thread. Only run() closes the client
+// sockets, once removed from the connections, so the fd cannot be reused
+// while it is found here. The shutdown wakes run() up to close it.
+void FmSocketServer::shutdown_socket(int sock) {
+	CFmMutexGuard m(getConnectionMutex());
+	conn_map_t::iterator it = connections.find(sock);
+	if (it != connections.end() && !it->second.dead) {
+		it->second.dead = true;
+		::shutdown(sock, SHUT_RDWR);
+	}
+}
+
 void FmSocketServer::handle_socket_data(int fd, std::vector<char> &data,
 		CFmDBSession &sess) {
 	FM_INFO_LOG("Received data from sock:%d len %lu\n",fd,data.size());
 }
 
-bool FmSocketServer::good_socket(int sock) {
-	bool timedout=false;
-	int rc = select(&sock,1,NULL,0,0,0,timedout);
-	return (rc!=-1);
+FmSocketServer::FmSocketServer() {
+	m_epfd = -1;
+	m_max_conns = 0;
+	m_conn_limit_logged = false;
+	server_port = 0;
+}
+
+// At most max_conns clients are connected at once, further connections are
+// closed as soon as they are accepted. 0 leaves it to the open files limit.
+void FmSocketServer::set_max_connections(unsigned int max_conns) {
+	m_max_conns = max_conns;
 }
 
-void FmSocketServer::find_bad_fd() {
-	if (!good_socket(m_fd)) {
-		server_reset();
+// Register the listening socket, non blocking so that accept() takes all
+// the pending connections
+bool FmSocketServer::watch_server_sock() {
+	struct epoll_event ev;
+	memset(&ev, 0, sizeof(ev));
+	ev.events = EPOLLIN;
+	ev.data.fd = m_fd;
+	int flags = fcntl(m_fd, F_GETFL, 0);
+	if (flags == -1 || fcntl(m_fd, F_SETFL, flags | O_NONBLOCK) == -1 ||
+			epoll_ctl(m_epfd, EPOLL_CTL_ADD, m_fd, &ev) == -1) {
+		FM_ERROR_LOG("Failed to watch server socket fd:(%d), error: (%d) (%s)",
+				m_fd, errno, strerror(errno));
+		return false;
 	}
-	std::vector<int> lsock;
-	to_sock_array(lsock);
+	return true;
+}
 
-	int ix = 0;
-	int mx =lsock.size();
-	for ( ; ix < mx ; ++ix) {
-		if (!good_socket(lsock[ix])) {
-			FM_INFO_LOG("Found bad fd, close it:(%d)", lsock[ix]);
-			::close(lsock[ix]);
-			rm_socket(lsock[ix]);
+// Read all the data fd has received, the edge triggered event reports it
+// once, and handle each packet it completes. Returns false once the peer
+// closed the connection or it failed.
+bool FmSocketServer::read_socket(int fd, CFmDBSession &sess) {
+	std::vector<std::vector<char> > packets;
+	std::vector<char> buff;
+	bool open = true;
+	char chunk[SOCKET_READ_CHUNK];
+
+	// the buffer is worked on outside the lock, the connection is never
+	// referenced out of it
+	{
+		CFmMutexGuard m(getConnectionMutex());
+		conn_map_t::iterator it = connections.find(fd);
+		if (it == connections.end() || it->second.dead)
+			return false;
+		buff.swap(it->second.rbuf);
+	}
+	while (true) {
+		ssize_t rc = ::read(fd, chunk, sizeof(chunk));
+		if (rc > 0) {
+			buff.insert(buff.end(), chunk, chunk + rc);
+			continue;
 		}
+		if (rc == -1 && errno == EINTR) continue;
+		if (rc == 0) {
+			// return code 0 means graceful close of TCP socket
+			open = false;
+		} else if (errno != EAGAIN && errno != EWOULDBLOCK) {
+			FM_ERROR_LOG("Failed to read from fd:(%d), error:(%s)",
+					fd, strerror(errno));
+			open = false;
+		}
+		break;
+	}
+
+	size_t offset = 0;
+	while (buff.size() - offset >= sizeof(uint32_t)) {
+		uint32_t len;
+		memcpy(&len, &(buff[offset]), sizeof(len));
+		len = ntohl(len);
+		if (buff.size() - offset - sizeof(len) < len)
+			break;
+		offset += sizeof(len);
+		packets.push_back(std::vector<char>(buff.begin() + offset,
+				buff.begin() + offset + len));
+		offset += len;
+	}
+	buff.erase(buff.begin(), buff.begin() + offset);
+	{
+		CFmMutexGuard m(getConnectionMutex());
+		conn_map_t::iterator it = connections.find(fd);
+		if (it != connections.end())
+			it->second.rbuf.swap(buff);
+	}
+
+	for (size_t ix = 0; ix < packets.size(); ++ix) {
+		handle_socket_data(fd, packets[ix], sess);
 	}
+	return open;
 }
 
 bool FmSocketServer::run() {
@@ -361,38 +454,53 @@ bool FmSocketServer::run() {
 		FM_ERROR_LOG("Fail to create DB session, exit ...\n");
 		exit (-1);
 	}
+
+	// The descriptors left for the clients, with some for the DB sessions
+	// and the other sockets of the process
+	struct rlimit rl;
+	if (getrlimit(RLIMIT_NOFILE, &rl) == 0 && rl.rlim_cur > 64) {
+		unsigned int fd_max = rl.rlim_cur - 64;
+		if (m_max_conns == 0 || m_max_conns > fd_max) {
+			m_max_conns = fd_max;
+		}
+	}
+	FM_INFO_LOG("Accepting up to (%u) client connections\n", m_max_conns);
+
+	m_epfd = epoll_create1(EPOLL_CLOEXEC);
+	if (m_epfd == -1 || !watch_server_sock()) {
+		FM_ERROR_LOG("Failed to set up epoll, exit ...\n");
+		exit (-1);
+	}
+
+	struct epoll_event events[SOCKET_EVENTS_MAX];
 	while (true) {
-		std::vector<int> lsock;
-		to_sock_array(lsock);
-		lsock.push_back(m_fd);
-
-		bool timedout =false;
-		int rc = select(&(lsock[0]),lsock.size(),NULL,0,1,0,timedout);
-		if (timedout) continue;
-		if (rc==-1) {
-			find_bad_fd();
+		int rc = epoll_wait(m_epfd, events, SOCKET_EVENTS_MAX, -1);
+		if (rc == -1) {
+			if (errno != EINTR) {
+				FM_ERROR_LOG("epoll_wait failed, error: (%d) (%s)",
+						errno, strerror(errno));
+				fmThreadSleep(100);
+			}
 			continue;
 		}
-		//listening socket and close all current sockets..
-		int ix = 0;
-		int mx = lsock.size();
-		for ( ; ix < mx ; ++ix ) {
-			if (lsock[ix]==-1) continue;
-			if (lsock[ix]==m_fd) {
+		for (int ix = 0; ix < rc; ++ix) {
+			int fd = events[ix].data.fd;
+			if (fd == m_fd) {
+				if (events[ix].events & (EPOLLERR | EPOLLHUP)) {
+					FM_ERROR_LOG("Server socket fd:(%d) failed, reset it", fd);
+					if (server_reset()) {
+						watch_server_sock();
+					}
+					continue;
+				}
 				accept();
 				continue;
 			}
-			std::vector<char>buff;
-			buff.clear();
-			bool rc = read_packet(lsock[ix],buff);
-			if (!rc) {
-				::close(lsock[ix]);
-				rm_socket(lsock[ix]);
-			} else {
-				//FM_INFO_LOG("handle_socket_data\n");
-				handle_socket_data(lsock[ix],buff, *sess);
+			if (!read_socket(fd, *sess)) {
+				epoll_ctl(m_epfd, EPOLL_CTL_DEL, fd, NULL);
+				rm_socket(fd);
+				::close(fd);
 			}
-
 		}
 	}
 	return false;
@@ -406,15 +514,6 @@ FmSocketServer::~FmSocketServer() {
 	}
 	connections.clear();
 }
-void FmSocketServer::to_sock_array(std::vector<int> &socks) {
-	CFmMutexGuard m(getConnectionMutex());
-	conn_map_t::iterator it = connections.begin();
-	conn_map_t::iterator end = connections.end();
-	for (; it != end ; ++it) {
-		socks.push_back(it->first);
-	}
-}
-
 bool FmSocketServer::server_reset() {
 	if (!create_socket()) {
 		FM_INFO_LOG("Failed to create socket for port:(%d)\n", server_port);
@@ -452,7 +551,7 @@ bool FmSocketServer::server_reset() {
 			}
 			FM_INFO_LOG("FM server socket binds the addr:(%s) port:(%d)\n",str, htons(server_port));
 
-			if (::listen(m_fd,10)==-1) {
+			if (::listen(m_fd,SOMAXCONN)==-1) {
 				FM_INFO_LOG("listen on fd:(%d) failed, errno: (%d) (%s)\n",
 							 m_fd, errno, strerror(errno));
 			}
@@ -475,7 +574,7 @@ bool FmSocketServer::server_reset() {
 			}
 			FM_INFO_LOG("FM server socket binds the addr:(%s) port:(%d)\n",str, htons(server_port));
 
-			if (::listen(m_fd,10)==-1) {
+			if (::listen(m_fd,SOMAXCONN)==-1) {
 				FM_INFO_LOG("listen on fd:(%d) failed, errno: (%d) (%s)\n",
 							 m_fd, errno, strerror(errno));
 			}
@@ -498,18 +597,44 @@ bool FmSocketServer::server_sock(const char *bindaddr, int port, int address_fam
 }
 
 bool  FmSocketServer::accept() {
-	client_conn con;
-	socklen_t alen =  sizeof(con.addr);
+	while (true) {
+		client_conn con;
+		socklen_t alen =  sizeof(con.addr.address);
+
+		int fd = ::accept4(m_fd,con.addr.get_sockaddr(),&alen,SOCK_NONBLOCK);
+		if (fd==-1) {
+			if (errno==EINTR) continue;
+			if (errno==EAGAIN || errno==EWOULDBLOCK) return true;
+			FM_INFO_LOG("accept returns fd: (%d) errno: (%d) (%s)\n",
+					fd, errno, strerror(errno));
+			return false;
+		}
 
-	int fd = ::accept(m_fd,con.addr.get_sockaddr(),&alen);
-	if (fd==-1) {
-		FM_INFO_LOG("accept returns fd: (%d) errno: (%d) (%s)\n",
-				fd, errno, strerror(errno));
-		return false;
+		if (m_max_conns != 0 && connections.size() >= m_max_conns) {
+			if (!m_conn_limit_logged) {
+				FM_ERROR_LOG("Too many client connections (%lu), closing the "
+						"new ones\n", connections.size());
+				m_conn_limit_logged = true;
+			}
+			::close(fd);
+			continue;
+		}
+		m_conn_limit_logged = false;
+
+		struct epoll_event ev;
+		memset(&ev, 0, sizeof(ev));
+		ev.events = EPOLLIN | EPOLLRDHUP | EPOLLET;
+		ev.data.fd = fd;
+		if (epoll_ctl(m_epfd, EPOLL_CTL_ADD, fd, &ev) == -1) {
+			FM_ERROR_LOG("Failed to watch fd:(%d), error: (%d) (%s)",
+					fd, errno, strerror(errno));
+			::close(fd);
+			continue;
+		}
+		con.sock = fd;
+		con.dead = false;
+		CFmMutexGuard m(getConnectionMutex());
+		connections[fd] = con;
 	}
-	con.sock = fd;
-	CFmMutexGuard m(getConnectionMutex());
-	connections[fd] = con;
-	return true;
 }
 
@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014,2023-2024 Wind River Systems, Inc.
+// Copyright (c) 2014,2023-2024, 2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -20,6 +20,8 @@
 #include <map>
 
 #define SOCKET_TIMEOUT_DEFAULT (5)
+#define SOCKET_EVENTS_MAX      (64)
+#define SOCKET_READ_CHUNK      (16 * 1024)
 
 typedef struct CFmSockAddr_s {
 	int type;
@@ -85,12 +87,16 @@ protected:
 	typedef struct {
 		CFmSockAddr addr;
 		int sock;
+		std::vector<char> rbuf;   // received bytes of incomplete packets
+		bool dead;                // shut down, to be closed by run()
 	} client_conn;
 
 	typedef std::map<int,client_conn> conn_map_t;
 	conn_map_t connections;
 
-	void to_sock_array(std::vector<int> &socks);
+	int m_epfd;
+	unsigned int m_max_conns;
+	bool m_conn_limit_logged;
 
 	bool accept();
 	virtual void handle_socket_data(int fd,std::vector<char> &data,
@@ -98,11 +104,15 @@ protected:
 
 	void add_socket(int sock);
 	void rm_socket(int sock);
-	bool good_socket(int sock);
-	void find_bad_fd();
+	void shutdown_socket(int sock);
+	bool watch_server_sock();
+	bool read_socket(int fd, CFmDBSession &sess);
 public:
+	FmSocketServer();
+
 	bool server_sock(const char *bindaddr, int port, int address_family);
 	bool server_reset();
+	void set_max_connections(unsigned int max_conns);
 
 	bool run();
 
@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2014 Wind River Systems, Inc.
+// Copyright (c) 2014, 2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -20,6 +20,9 @@ bool fmThreadSleep(unsigned int msec) ;
 void fmJobHandlerThread(void *context);
 void fmRegHandlerThread(void *context);
 void fmEventSuppressionMonitorThread(void *context);
+void fmAlarmCacheThread(void *context);
+void fmEventLogTrimThread(void *context);
+void fmSnmpTrapSenderThread(void *context);
 
 #ifdef __cplusplus
 }
@@ -0,0 +1,202 @@
+//
+// Copyright (c) 2026 Wind River Systems, Inc.
+//
+// SPDX-License-Identifier: Apache-2.0
+//
+
+// Checks the SNMP trap sender against a local trap server sink: every
+// queued trap must arrive whole and once, in order over a single
+// connection with trap_server_persistent=1 and over one connection per
+// trap otherwise.
+//
+// Usage: fmTrapSenderTest <trap_server_persistent>
+
+#include <arpa/inet.h>
+#include <netinet/in.h>
+#include <poll.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/socket.h>
+#include <unistd.h>
+#include <map>
+#include <string>
+#include <vector>
+
+#include "fmAPI.h"
+#include "fmConfig.h"
+#include "fmSnmpConstants.h"
+#include "fmSnmpUtils.h"
+
+#define TEST_TRAPS       200
+#define TEST_TIMEOUT_MS  10000
+
+
+static int fail(const char *msg) {
+	printf("FAIL: %s\n", msg);
+	return 1;
+}
+
+static int listen_local(int &port) {
+	struct sockaddr_in addr;
+	socklen_t alen = sizeof(addr);
+	int fd = socket(AF_INET, SOCK_STREAM, 0);
+
+	memset(&addr, 0, sizeof(addr));
+	addr.sin_family = AF_INET;
+	addr.sin_addr.s_addr = htonl(INADDR_LOOPBACK);
+	if (fd == -1 || bind(fd, (struct sockaddr *)&addr, sizeof(addr)) == -1 ||
+			listen(fd, TEST_TRAPS) == -1 ||
+			getsockname(fd, (struct sockaddr *)&addr, &alen) == -1)
+		return -1;
+	port = ntohs(addr.sin_port);
+	return fd;
+}
+
+static bool write_conf(char *path, int port, const char *persistent) {
+	int fd = mkstemp(path);
+	if (fd == -1)
+		return false;
+	FILE *f = fdopen(fd, "w");
+	if (f == NULL)
+		return false;
+	fprintf(f, "trap_server_ip=127.0.0.1\n");
+	fprintf(f, "trap_server_port=%d\n", port);
+	fprintf(f, "snmp_enabled=1\n");
+	fprintf(f, "trap_server_persistent=%s\n", persistent);
+	return fclose(f) == 0;
+}
+
+// Take the complete length prefixed packets out of buff
+static void split_packets(std::vector<char> &buff,
+		std::vector<std::string> &packets) {
+	size_t offset = 0;
+	while (buff.size() - offset >= sizeof(uint32_t)) {
+		uint32_t len;
+		memcpy(&len, &(buff[offset]), sizeof(len));
+		len = ntohl(len);
+		if (buff.size() - offset - sizeof(len) < len)
+			break;
+		offset += sizeof(len);
+		packets.push_back(std::string(buff.begin() + offset,
+				buff.begin() + offset + len));
+		offset += len;
+	}
+	buff.erase(buff.begin(), buff.begin() + offset);
+}
+
+// Read the traps until TEST_TRAPS arrived or the sink timed out
+static void run_sink(int lfd, std::vector<std::string> &packets,
+		int &connections) {
+	std::map<int, std::vector<char> > clients;
+	char chunk[4096];
+
+	while (packets.size() < TEST_TRAPS) {
+		std::vector<struct pollfd> fds(1);
+		fds[0].fd = lfd;
+		fds[0].events = POLLIN;
+		std::map<int, std::vector<char> >::iterator it = clients.begin();
+		for (; it != clients.end(); ++it) {
+			struct pollfd pfd = {it->first, POLLIN, 0};
+			fds.push_back(pfd);
+		}
+		if (poll(&fds[0], fds.size(), TEST_TIMEOUT_MS) <= 0)
+			break;
+		if (fds[0].revents & POLLIN) {
+			int fd = accept(lfd, NULL, NULL);
+			if (fd != -1) {
+				clients[fd];
+				connections++;
+			}
+		}
+		for (size_t ix = 1; ix < fds.size(); ++ix) {
+			if (fds[ix].revents == 0)
+				continue;
+			int fd = fds[ix].fd;
+			ssize_t rc = read(fd, chunk, sizeof(chunk));
+			if (rc <= 0) {
+				close(fd);
+				clients.erase(fd);
+				continue;
+			}
+			clients[fd].insert(clients[fd].end(), chunk, chunk + rc);
+			split_packets(clients[fd], packets);
+		}
+	}
+	std::map<int, std::vector<char> >::iterator it = clients.begin();
+	for (; it != clients.end(); ++it)
+		close(it->first);
+}
+
+int main(int argc, char **argv) {
+	char conf[] = "/tmp/fmTrapSenderTest.XXXXXX";
+	std::vector<std::string> packets;
+	int connections = 0;
+	int port;
+
+	if (argc != 2)
+		return fail("usage: fmTrapSenderTest <trap_server_persistent>");
+	bool persistent = (strcmp(argv[1], "1") == 0);
+
+	int lfd = listen_local(port);
+	if (lfd == -1)
+		return fail("cannot listen on the loopback");
+	if (!write_conf(conf, port, argv[1]))
+		return fail("cannot write the config file");
+	fm_conf_set_file(conf);
+
+	for (int ix = 0; ix < TEST_TRAPS; ++ix) {
+		SFmAlarmDataT data;
+		memset(&data, 0, sizeof(data));
+		snprintf(data.entity_instance_id, sizeof(data.entity_instance_id),
+				"host=test.trap=%d", ix);
+		if (!fm_snmp_util_gen_trap(FM_ALARM_HIERARCHICAL_CLEAR, data))
+			return fail("trap not queued");
+	}
+
+	run_sink(lfd, packets, connections);
+	close(lfd);
+	unlink(conf);
+
+	if (packets.size() != TEST_TRAPS) {
+		printf("received %lu traps\n", packets.size());
+		return fail("traps lost");
+	}
+	// A single connection keeps the order of the traps, separate ones are
+	// read by the sink in any order
+	std::vector<bool> seen(TEST_TRAPS, false);
+	for (size_t ix = 0; ix < packets.size(); ++ix) {
+		size_t pos = packets[ix].find("host=test.trap=");
+		unsigned int trap;
+		char end;
+		if (packets[ix].empty() || packets[ix][0] != '{' ||
+				pos == std::string::npos ||
+				sscanf(packets[ix].c_str() + pos, "host=test.trap=%u%c",
+						&trap, &end) != 2 || end != '"' ||
+				trap >= TEST_TRAPS || seen[trap] ||
+				(persistent && trap != ix)) {
+			printf("trap %lu: %s\n", ix, packets[ix].c_str());
+			return fail("trap out of order, repeated or not whole");
+		}
+		seen[trap] = true;
+	}
+	if (persistent ? connections != 1 : connections != TEST_TRAPS) {
+		printf("traps sent over %d connections\n", connections);
+		return fail("unexpected number of connections");
+	}
+
+	// the sender counts the traps once their write returned
+	SFmTrapStatsT stats;
+	for (int wait = 0; wait < 100; ++wait) {
+		fm_snmp_util_get_trap_stats(stats);
+		if (stats.sent == TEST_TRAPS)
+			break;
+		usleep(10000);
+	}
+	if (stats.sent != TEST_TRAPS || stats.dropped != 0)
+		return fail("unexpected trap counters");
+
+	printf("OK: %d traps over %d connections\n", TEST_TRAPS, connections);
+	return 0;
+}
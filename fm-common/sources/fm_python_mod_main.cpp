@@ -1,5 +1,5 @@
 //
-// Copyright (c) 2018, 2024-2025 Wind River Systems, Inc.
+// Copyright (c) 2018, 2024-2026 Wind River Systems, Inc.
 //
 // SPDX-License-Identifier: Apache-2.0
 //
@@ -64,26 +64,257 @@ static void log_msg(int type, const char *data,...)
     Py_DECREF(str);
 }
 
+/* The fm_* library calls block on a round trip to the FM manager and
+ * serialize access to its socket internally, so they are made with the
+ * GIL released to let other Python threads run meanwhile. They must not
+ * touch Python objects; log_msg() calls back into Python and is only
+ * used once the GIL has been re-acquired. */
+
+/* Besides the '###' separated strings used by fm_api historically, the
+ * alarm and filter arguments can be passed as Python objects, and the get
+ * calls can return tuples (structured=True), which avoids formatting and
+ * splitting strings on both sides and is not confused by separators in
+ * the reason text.
+ *
+ * An alarm object is a tuple or list in EFmAlarmIndexMap order, a dict
+ * keyed by the fm_api.Fault attribute names or an object with those
+ * attributes. Field values are the same strings as in the '###' format;
+ * None or a missing field is an empty value, except for the required
+ * alarm_id and entity_instance_id, and the boolean fields also take a
+ * Python truth value. Returned tuples hold every EFmAlarmIndexMap field,
+ * in that order, as strings. */
+
+static const char *alarm_attrs[FM_ALM_IX_MAX] = {
+	"uuid",
+	"alarm_id",
+	"alarm_state",
+	"entity_type_id",
+	"entity_instance_id",
+	"timestamp",
+	"severity",
+	"reason_text",
+	"alarm_type",
+	"probable_cause",
+	"proposed_repair_action",
+	"service_affecting",
+	"suppression",
+	"inhibit_alarms",
+	"keep_existing_alarm"
+};
+
+static bool pystr_to_string(PyObject *obj, std::string &str) {
+	const char *s = PyUnicode_AsUTF8(obj);
+	if (s == NULL) {
+		PyErr_Clear();
+		return false;
+	}
+	str.assign(s);
+	return true;
+}
+
+static bool alarm_field_from_pyobject(int ix, PyObject *val, SFmAlarmDataT *a) {
+	std::string field;
+
+	if (val == NULL || val == Py_None) {
+		field.assign(" ");
+	} else if (PyUnicode_Check(val)) {
+		if (!pystr_to_string(val, field))
+			return false;
+	} else if (ix >= FM_ALM_IX_SERVICE_AFFECT) {
+		int truth = PyObject_IsTrue(val);
+		if (truth < 0) {
+			PyErr_Clear();
+			return false;
+		}
+		field.assign(truth ? "True" : "False");
+	} else {
+		return false;
+	}
+	return fm_alarm_set_field((EFmAlarmIndexMap)ix, a, field);
+}
+
+// A required field must be a non blank string; None would be converted to
+// " " and pass the check of the converted alarm
+static bool alarm_required_field_set(PyObject *val) {
+	std::string field;
+
+	if (val == NULL || !PyUnicode_Check(val) || !pystr_to_string(val, field))
+		return false;
+	return field.find_first_not_of(" \t") != std::string::npos;
+}
+
+static bool alarm_from_pyobject(PyObject *obj, SFmAlarmDataT *a) {
+
+	if (PyUnicode_Check(obj)) {
+		std::string alarm;
+		if (!pystr_to_string(obj, alarm))
+			return false;
+		return fm_alarm_from_string(alarm, a);
+	}
+
+	bool is_seq = PyTuple_Check(obj) || PyList_Check(obj);
+	bool is_dict = PyDict_Check(obj);
+	Py_ssize_t seq_len = is_seq ? PySequence_Fast_GET_SIZE(obj) : 0;
+
+	if (is_seq && seq_len < FM_ALM_IX_KEEP_EXISTING_ALARM) {
+		ERROR_LOG("Alarm sequence has (%zd) fields, expected at least (%d)",
+				seq_len, FM_ALM_IX_KEEP_EXISTING_ALARM);
+		return false;
+	}
+
+	memset(a, 0, sizeof(*a));
+	for (int ix = 0; ix < FM_ALM_IX_MAX; ++ix) {
+		PyObject *val = NULL;
+		bool owned = false;
+		if (is_seq) {
+			if (ix < seq_len)
+				val = PySequence_Fast_GET_ITEM(obj, ix);
+		} else if (is_dict) {
+			val = PyDict_GetItemString(obj, alarm_attrs[ix]);
+		} else {
+			val = PyObject_GetAttrString(obj, alarm_attrs[ix]);
+			if (val == NULL)
+				PyErr_Clear();
+			else
+				owned = true;
+		}
+
+		bool required = (ix == FM_ALM_IX_ALARM_ID ||
+				ix == FM_ALM_IX_INSTANCE_ID);
+		if (required && !alarm_required_field_set(val)) {
+			if (owned)
+				Py_DECREF(val);
+			ERROR_LOG("Alarm id and entity instance id are required.");
+			return false;
+		}
+
+		bool ok = alarm_field_from_pyobject(ix, val, a);
+		if (owned)
+			Py_DECREF(val);
+		if (!ok) {
+			ERROR_LOG("Invalid value for alarm field (%s)", alarm_attrs[ix]);
+			return false;
+		}
+	}
+	return true;
+}
+
+static bool filter_field_from_pyobject(PyObject *val, char *buff, size_t len) {
+	std::string field;
+
+	if (val != Py_None) {
+		if (!PyUnicode_Check(val) || !pystr_to_string(val, field))
+			return false;
+	}
+	memset(buff, 0, len);
+	strncpy(buff, field.c_str(), len - 1);
+	return true;
+}
+
+static bool alarm_filter_from_pyargs(PyObject *filter, PyObject *eid,
+		AlarmFilter *af) {
+	/* Either the '###' filter string alone,
+	   or the alarm_id and entity_instance_id */
+	if (eid == NULL) {
+		std::string filter_str;
+		if (!PyUnicode_Check(filter) || !pystr_to_string(filter, filter_str)) {
+			ERROR_LOG("Alarm filter must be a string.");
+			return false;
+		}
+		if (!fm_alarm_filter_from_string(filter_str, af)) {
+			ERROR_LOG("Invalid alarm filter: (%s)", filter_str.c_str());
+			return false;
+		}
+		return true;
+	}
+
+	if (!filter_field_from_pyobject(filter, af->alarm_id, sizeof(af->alarm_id)) ||
+		!filter_field_from_pyobject(eid, af->entity_instance_id,
+				sizeof(af->entity_instance_id))) {
+		ERROR_LOG("Alarm id and entity instance id must be strings.");
+		return false;
+	}
+	return true;
+}
+
+static bool alarm_filter_from_pyobject(PyObject *item, AlarmFilter *af) {
+	/* A list item is a filter string or an
+	   (alarm_id, entity_instance_id) pair */
+	if ((PyTuple_Check(item) || PyList_Check(item)) &&
+		PySequence_Fast_GET_SIZE(item) == 2) {
+		return alarm_filter_from_pyargs(PySequence_Fast_GET_ITEM(item, 0),
+				PySequence_Fast_GET_ITEM(item, 1), af);
+	}
+	return alarm_filter_from_pyargs(item, NULL, af);
+}
+
+static PyObject * alarm_to_pyobject(const SFmAlarmDataT *a, bool structured) {
+	std::string s;
+
+	if (!structured) {
+		fm_alarm_to_string(a, s);
+		return PyUnicode_FromString(s.c_str());
+	}
+
+	PyObject *t = PyTuple_New(FM_ALM_IX_MAX);
+	if (t == NULL)
+		return NULL;
+	for (int ix = 0; ix < FM_ALM_IX_MAX; ++ix) {
+		fm_alarm_get_field((EFmAlarmIndexMap)ix, a, s);
+		PyObject *val = PyUnicode_FromString(s.c_str());
+		if (val == NULL) {
+			Py_DECREF(t);
+			return NULL;
+		}
+		PyTuple_SET_ITEM(t, ix, val);
+	}
+	return t;
+}
+
+static PyObject * alarm_list_to_pyobject(const std::vector< SFmAlarmDataT > &lst,
+		unsigned int num, bool structured) {
+	PyObject *__lst = PyList_New(0);
+	if (__lst == NULL)
+		return NULL;
+
+	for ( size_t ix = 0; ix < num; ++ix ) {
+		PyObject *item = alarm_to_pyobject(&lst[ix], structured);
+		if (item == NULL) {
+			PyErr_Clear();
+			ERROR_LOG("Failed to convert alarm (%s) (%s)",
+					lst[ix].alarm_id, lst[ix].entity_instance_id);
+			continue;
+		}
+		if (PyList_Append(__lst, item) != 0) {
+			ERROR_LOG("Failed to append alarm to the list");
+		}
+		Py_DECREF(item);
+	}
+	/* python will garbage collect if the reference count is correct
+	   (it should be 1 at this point) */
+	return __lst;
+}
+
 static PyObject * _fm_set(PyObject * self, PyObject *args) {
 
 	SFmAlarmDataT alm_data;
-	std::string alarm;
 	fm_uuid_t tmp_uuid;
-	const char *alm_str;
+	PyObject *alarm;
 	EFmErrorT rc;
 
-	if (!PyArg_ParseTuple(args, "s", &alm_str)) {
+	if (!PyArg_ParseTuple(args, "O", &alarm)) {
 		ERROR_LOG("Failed to parse args.");
 		Py_RETURN_NONE;
 	}
 
-    alarm.assign(alm_str);
-	if (!fm_alarm_from_string(alarm, &alm_data)) {
-		ERROR_LOG("Failed to convert string to alarm.");
+	if (!alarm_from_pyobject(alarm, &alm_data)) {
+		ERROR_LOG("Failed to convert argument to alarm.");
 		Py_RETURN_NONE;
 	}
 
+	Py_BEGIN_ALLOW_THREADS
 	rc = fm_set_fault(&alm_data, &tmp_uuid);
+	Py_END_ALLOW_THREADS
 	if (rc == FM_ERR_OK) {
 		return PyUnicode_FromString(&(tmp_uuid[0]));
 	}
@@ -100,12 +331,11 @@ static PyObject * _fm_set(PyObject * self, PyObject *args) {
 }
 
 static PyObject * _fm_set_list(PyObject * self, PyObject *args) {
-	/* Receives a PyObject expected to be a list of strings
-	   containing different alarm information.
-	   The function then parses each string into different alarm
+	/* Receives a PyObject expected to be a list of alarms, each one
+	   either a string containing the alarm information or an alarm
+	   object. The function then parses each item into different alarm
 	   structures, which are filled and sent to the C++ core. */
 
-	std::string alarm;
 	EFmErrorT rc = FM_ERR_INVALID_REQ;
 
 	PyObject *listObj = nullptr;
@@ -124,17 +354,10 @@ static PyObject * _fm_set_list(PyObject * self, PyObject *args) {
 
 	for (Py_ssize_t i = 0; i < num_items; i++) {
 		PyObject *item = PyList_GetItem(listObj, i);
-		if (!PyUnicode_Check(item)) {
-			ERROR_LOG("List items must be strings.");
-			Py_RETURN_FALSE;
-		}
-
-		const char *alm_str = PyUnicode_AsUTF8(item);
-		std::string alarm(alm_str);
 
 		SFmAlarmDataT alm_data;
-		if (!fm_alarm_from_string(alarm, &alm_data)) {
-			ERROR_LOG("Failed to convert string to alarm.");
+		if (!alarm_from_pyobject(item, &alm_data)) {
+			ERROR_LOG("Failed to convert list item to alarm.");
 			continue;
 		}
 		alarms_vector.push_back(alm_data);
@@ -145,7 +368,9 @@ static PyObject * _fm_set_list(PyObject * self, PyObject *args) {
 		Py_RETURN_NONE;
 	}
 
+	Py_BEGIN_ALLOW_THREADS
 	rc = fm_set_fault_list(&alarms_vector);
+	Py_END_ALLOW_THREADS
 	if (rc == FM_ERR_OK) {
 		Py_RETURN_TRUE;
 	} else if (rc == FM_ERR_NOCONNECT) {
@@ -157,29 +382,31 @@ static PyObject * _fm_set_list(PyObject * self, PyObject *args) {
 	Py_RETURN_FALSE;
 }
 
-static PyObject * _fm_get(PyObject * self, PyObject *args) {
+static PyObject * _fm_get(PyObject * self, PyObject *args, PyObject* kwargs) {
 
-	const char *filter;
-	std::string alm_str, filter_str;
+	PyObject *filter;
+	PyObject *eid = NULL;
+	int structured = 0;
 	AlarmFilter af;
 	SFmAlarmDataT ad;
 	EFmErrorT rc;
+	char* keywords[] = {"alarm_id", "entity_instance_id", "structured", (char*)NULL};
 
-	if (!PyArg_ParseTuple(args, "s", &filter)) {
+	if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|Op", keywords,
+			&filter, &eid, &structured)) {
 		ERROR_LOG("Failed to parse args");
 		Py_RETURN_FALSE;
 	}
 
-	filter_str.assign(filter);
-	if (!fm_alarm_filter_from_string(filter_str, &af)) {
-		ERROR_LOG("Invalid alarm filter: (%s)", filter_str.c_str());
+	if (!alarm_filter_from_pyargs(filter, eid, &af)) {
 		Py_RETURN_FALSE;
 	}
 
+	Py_BEGIN_ALLOW_THREADS
 	rc = fm_get_fault(&af,&ad);
+	Py_END_ALLOW_THREADS
 	if (rc == FM_ERR_OK) {
-		fm_alarm_to_string(&ad,alm_str);
-		return PyUnicode_FromString(alm_str.c_str());
+		return alarm_to_pyobject(&ad, structured);
 	}
 
 	if (rc == FM_ERR_ENTITY_NOT_FOUND) {
@@ -200,10 +427,12 @@ static PyObject * _fm_get_by_aid(PyObject * self, PyObject *args, PyObject* kwar
 	const char *aid;
 	fm_alarm_id alm_id;
 	unsigned int max = DEF_MAX_ALARMS;
-	char* keywords[] = {"alarm_id", "max", (char*)NULL};
+	int structured = 0;
+	char* keywords[] = {"alarm_id", "max", "structured", (char*)NULL};
 
 	memset(alm_id, 0 , sizeof(alm_id));
-	if (!PyArg_ParseTupleAndKeywords(args, kwargs, "s|i", keywords, &aid, &max)) {
+	if (!PyArg_ParseTupleAndKeywords(args, kwargs, "s|ip", keywords, &aid, &max,
+			&structured)) {
 		ERROR_LOG("Failed to parse args");
 		Py_RETURN_FALSE;
 	}
@@ -217,21 +446,12 @@ static PyObject * _fm_get_by_aid(PyObject * self, PyObject *args, PyObject* kwar
 		Py_RETURN_FALSE;
 	}
 	unsigned int max_alarms_to_get = max;
-	EFmErrorT rc = fm_get_faults_by_id(&alm_id, &(lst[0]), &max_alarms_to_get);
+	EFmErrorT rc;
+	Py_BEGIN_ALLOW_THREADS
+	rc = fm_get_faults_by_id(&alm_id, &(lst[0]), &max_alarms_to_get);
+	Py_END_ALLOW_THREADS
 	if (rc == FM_ERR_OK) {
-		PyObject *__lst = PyList_New(0);
-		for ( size_t ix = 0 ; ix < max_alarms_to_get ; ++ix ) {
-			std::string s;
-			fm_alarm_to_string(&lst[ix],s);
-			if (s.size() > 0) {
-				if (PyList_Append(__lst, PyUnicode_FromString(s.c_str())) != 0) {
-					ERROR_LOG("Failed to append alarm to the list");
-				}
-			}
-		}
-		/* python will garbage collect if the reference count is correct
-		   (it should be 1 at this point) */
-		return __lst;
+		return alarm_list_to_pyobject(lst, max_alarms_to_get, structured);
 	}
 
 	if (rc == FM_ERR_ENTITY_NOT_FOUND) {
@@ -250,10 +470,12 @@ static PyObject * _fm_get_by_eid(PyObject * self, PyObject *args, PyObject* kwar
 	fm_ent_inst_t inst_id;
 	std::vector< SFmAlarmDataT > lst;
 	unsigned int max= DEF_MAX_ALARMS;
-	char* keywords[] = {"entity_instance_id", "max", (char*)NULL};
+	int structured = 0;
+	char* keywords[] = {"entity_instance_id", "max", "structured", (char*)NULL};
 
 	memset(inst_id, 0 , sizeof(inst_id));
-	if (!PyArg_ParseTupleAndKeywords(args, kwargs, "s|i", keywords, &eid, &max)) {
+	if (!PyArg_ParseTupleAndKeywords(args, kwargs, "s|ip", keywords, &eid, &max,
+			&structured)) {
 		ERROR_LOG("Failed to parse args");
 		Py_RETURN_FALSE;
 	}
@@ -266,21 +488,12 @@ static PyObject * _fm_get_by_eid(PyObject * self, PyObject *args, PyObject* kwar
 		Py_RETURN_FALSE;
 	}
 	unsigned int max_alarms_to_get = max;
-	EFmErrorT rc = fm_get_faults(&inst_id, &(lst[0]), &max_alarms_to_get);
+	EFmErrorT rc;
+	Py_BEGIN_ALLOW_THREADS
+	rc = fm_get_faults(&inst_id, &(lst[0]), &max_alarms_to_get);
+	Py_END_ALLOW_THREADS
 	if (rc == FM_ERR_OK) {
-		PyObject *__lst = PyList_New(0);
-		for ( size_t ix = 0; ix < max_alarms_to_get; ++ix ) {
-			std::string s;
-			fm_alarm_to_string(&lst[ix], s);
-			if (s.size() > 0) {
-				if (PyList_Append(__lst,PyUnicode_FromString(s.c_str())) != 0) {
-					ERROR_LOG("Failed to append alarm to the list");
-				}
-			}
-		}
-		/* python will garbage collect if the reference count is correct
-		   (it should be 1 at this point) */
-		return __lst;
+		return alarm_list_to_pyobject(lst, max_alarms_to_get, structured);
 	}
 
 	if (rc == FM_ERR_ENTITY_NOT_FOUND) {
@@ -294,30 +507,182 @@ static PyObject * _fm_get_by_eid(PyObject * self, PyObject *args, PyObject* kwar
 	Py_RETURN_FALSE;
 }
 
-static PyObject * _fm_get_by_id_n_eid(PyObject * self, PyObject *args) {
+static PyObject * get_by_id_list(PyObject *args, PyObject* kwargs,
+		bool by_eid) {
+	/* Receive a list of entity instance ids (by_eid) or alarm ids
+	   and get the alarms of all of them with a single request */
+	PyObject *listObj = nullptr;
+	unsigned int max = DEF_MAX_ALARMS;
+	int structured = 0;
+	char* eid_keywords[] = {"entity_instance_ids", "max", "structured", (char*)NULL};
+	char* aid_keywords[] = {"alarm_ids", "max", "structured", (char*)NULL};
+
+	if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|ip",
+			by_eid ? eid_keywords : aid_keywords, &listObj, &max,
+			&structured)) {
+		ERROR_LOG("Failed to parse args");
+		Py_RETURN_FALSE;
+	}
+
+	if (!PyList_Check(listObj) && !PyTuple_Check(listObj)) {
+		ERROR_LOG("Expected a list.");
+		Py_RETURN_FALSE;
+	}
+
+	Py_ssize_t num_items = PySequence_Fast_GET_SIZE(listObj);
+	if (num_items == 0) {
+		Py_RETURN_NONE;
+	}
+
+	std::vector<char> ids;
+	std::vector< SFmAlarmDataT > lst;
+	try {
+		ids.resize(num_items * FM_MAX_BUFFER_LENGTH);
+		lst.resize(max);
+	} catch(...) {
+		ERROR_LOG("Failed to allocate memory");
+		Py_RETURN_FALSE;
+	}
+
+	for (Py_ssize_t i = 0; i < num_items; i++) {
+		PyObject *item = PySequence_Fast_GET_ITEM(listObj, i);
+		if (item == Py_None || !filter_field_from_pyobject(item,
+				&ids[i * FM_MAX_BUFFER_LENGTH], FM_MAX_BUFFER_LENGTH)) {
+			ERROR_LOG("%s must be strings.",
+					by_eid ? "Entity instance ids" : "Alarm ids");
+			Py_RETURN_FALSE;
+		}
+	}
+
+	unsigned int max_alarms_to_get = max;
+	EFmErrorT rc;
+	Py_BEGIN_ALLOW_THREADS
+	if (by_eid)
+		rc = fm_get_faults_by_eids((fm_ent_inst_t *)&ids[0], num_items,
+				&(lst[0]), &max_alarms_to_get);
+	else
+		rc = fm_get_faults_by_ids((fm_alarm_id *)&ids[0], num_items,
+				&(lst[0]), &max_alarms_to_get);
+	Py_END_ALLOW_THREADS
+	if (rc == FM_ERR_OK) {
+		return alarm_list_to_pyobject(lst, max_alarms_to_get, structured);
+	}
+
+	if (rc == FM_ERR_ENTITY_NOT_FOUND) {
+		DEBUG_LOG("No alarm found for the (%zd) ids", num_items);
+		Py_RETURN_NONE;
+	} else if (rc == FM_ERR_NOCONNECT) {
+		WARNING_LOG("Failed to connect to FM manager");
+	} else {
+		ERROR_LOG("Failed to get alarm list for (%zd) %s, error code: (%d)",
+				num_items, by_eid ? "entity ids" : "alarm ids", rc);
+	}
+	Py_RETURN_FALSE;
+}
+
+static PyObject * _fm_get_by_eids(PyObject * self, PyObject *args, PyObject* kwargs) {
+	return get_by_id_list(args, kwargs, true);
+}
+
+static PyObject * _fm_get_by_aids(PyObject * self, PyObject *args, PyObject* kwargs) {
+	return get_by_id_list(args, kwargs, false);
+}
+
+static PyObject * get_page(PyObject *args, PyObject* kwargs, bool by_id) {
+	/* Receive an alarm id (by_id) or entity instance id, the
+	   (alarm_id, entity_instance_id) of the last alarm of the previous
+	   page or None for the first page, and the page size */
+	const char *id;
+	PyObject *after = Py_None;
+	unsigned int max = DEF_MAX_ALARMS;
+	int structured = 0;
+	SFmAlarmPageT page;
+	char* eid_keywords[] = {"entity_instance_id", "after", "max", "structured",
+			(char*)NULL};
+	char* aid_keywords[] = {"alarm_id", "after", "max", "structured", (char*)NULL};
+
+	memset(&page, 0, sizeof(page));
+	if (!PyArg_ParseTupleAndKeywords(args, kwargs, "s|OIp",
+			by_id ? aid_keywords : eid_keywords, &id, &after, &max,
+			&structured)) {
+		ERROR_LOG("Failed to parse args");
+		Py_RETURN_FALSE;
+	}
+	strncpy(page.id, id, sizeof(page.id)-1);
+	if (after != Py_None && !alarm_filter_from_pyobject(after, &page.after)) {
+		ERROR_LOG("Expected an (alarm_id, entity_instance_id) pair.");
+		Py_RETURN_FALSE;
+	}
+	if (max == 0) {
+		ERROR_LOG("Page size must be positive");
+		Py_RETURN_FALSE;
+	}
+	page.limit = max;
+
+	std::vector< SFmAlarmDataT > lst;
+	try {
+		lst.resize(max);
+	} catch(...) {
+		ERROR_LOG("Failed to allocate memory");
+		Py_RETURN_FALSE;
+	}
+	unsigned int max_alarms_to_get = max;
+	EFmErrorT rc;
+	Py_BEGIN_ALLOW_THREADS
+	if (by_id)
+		rc = fm_get_faults_by_id_page(&page, &(lst[0]), &max_alarms_to_get);
+	else
+		rc = fm_get_faults_page(&page, &(lst[0]), &max_alarms_to_get);
+	Py_END_ALLOW_THREADS
+	if (rc == FM_ERR_OK) {
+		return alarm_list_to_pyobject(lst, max_alarms_to_get, structured);
+	}
+
+	if (rc == FM_ERR_ENTITY_NOT_FOUND) {
+		DEBUG_LOG("No more alarms for (%s) after (%s) (%s)", page.id,
+				page.after.alarm_id, page.after.entity_instance_id);
+		Py_RETURN_NONE;
+	} else if (rc == FM_ERR_NOCONNECT) {
+		WARNING_LOG("Failed to connect to FM manager");
+	} else {
+		ERROR_LOG("Failed to get alarm page for (%s), error code: (%d)",
+				page.id, rc);
+	}
+	Py_RETURN_FALSE;
+}
+
+static PyObject * _fm_get_by_eid_page(PyObject * self, PyObject *args, PyObject* kwargs) {
+	return get_page(args, kwargs, false);
+}
+
+static PyObject * _fm_get_by_aid_page(PyObject * self, PyObject *args, PyObject* kwargs) {
+	return get_page(args, kwargs, true);
+}
+
+static PyObject * _fm_get_by_id_n_eid(PyObject * self, PyObject *args, PyObject* kwargs) {
 	/*	Receive a PyObject expected to be a filter containing
-		alarm_id and entity_instance_id. The entity_instance_id
+		alarm_id and entity_instance_id, either as a filter string
+		or as two arguments. The entity_instance_id
 		does not need to be complete, allowing it to match
 		more than one row.
-		The function parses this object into different alarm
-		strings and fills a filter alarm structure that is
-		sent to the C++ core. */
-	const char *filter;
+		The function parses this object and fills a filter alarm
+		structure that is sent to the C++ core. */
+	PyObject *filter;
+	PyObject *eid = NULL;
+	int structured = 0;
 	AlarmFilter af;
-	std::string alm_str, filter_str;
 	std::vector< SFmAlarmDataT > lst;
 	unsigned int max= DEF_MAX_ALARMS;
 	EFmErrorT rc;
+	char* keywords[] = {"alarm_id", "entity_instance_id", "structured", (char*)NULL};
 
-	if (!PyArg_ParseTuple(args, "s", &filter)) {
+	if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|Op", keywords,
+			&filter, &eid, &structured)) {
 		ERROR_LOG("Failed to parse args.");
 		Py_RETURN_FALSE;
 	}
 
-	filter_str.assign(filter);
-	if (!fm_alarm_filter_from_string(filter_str, &af)) {
-		ERROR_LOG("Invalid alarm filter: (%s)",
-				 filter_str.c_str());
+	if (!alarm_filter_from_pyargs(filter, eid, &af)) {
 		Py_RETURN_FALSE;
 	}
 
@@ -329,21 +694,11 @@ static PyObject * _fm_get_by_id_n_eid(PyObject * self, PyObject *args) {
 	}
 
 	unsigned int max_alarms_to_get = max;
+	Py_BEGIN_ALLOW_THREADS
 	rc = fm_get_faults_by_id_n_eid(&af, &(lst[0]), &max_alarms_to_get);
+	Py_END_ALLOW_THREADS
 	if (rc == FM_ERR_OK) {
-		PyObject *__lst = PyList_New(0);
-		for ( size_t ix = 0; ix < max_alarms_to_get; ++ix ) {
-			std::string s;
-			fm_alarm_to_string(&lst[ix], s);
-			if (s.size() > 0) {
-				if (PyList_Append(__lst,PyUnicode_FromString(s.c_str())) != 0) {
-					ERROR_LOG("Failed to append alarm to the list");
-				}
-			}
-		}
-		/* python will garbage collect if the reference count is correct
-		   (it should be 1 at this point) */
-		return __lst;
+		return alarm_list_to_pyobject(lst, max_alarms_to_get, structured);
 	}
 
 	if (rc == FM_ERR_ENTITY_NOT_FOUND) {
@@ -361,23 +716,23 @@ static PyObject * _fm_get_by_id_n_eid(PyObject * self, PyObject *args) {
 
 static PyObject * _fm_clear(PyObject * self, PyObject *args) {
 
-	const char *filter;
-	std::string alm_str, filter_str;
+	PyObject *filter;
+	PyObject *eid = NULL;
 	AlarmFilter af;
 	EFmErrorT rc;
 
-	if (!PyArg_ParseTuple(args, "s", &filter)) {
+	if (!PyArg_ParseTuple(args, "O|O", &filter, &eid)) {
 		ERROR_LOG("Failed to parse args");
 		Py_RETURN_FALSE;
 	}
 
-	filter_str.assign(filter);
-	if (!fm_alarm_filter_from_string(filter_str, &af)) {
-		ERROR_LOG("Invalid alarm filter: (%s)", filter_str.c_str());
+	if (!alarm_filter_from_pyargs(filter, eid, &af)) {
 		Py_RETURN_FALSE;
 	}
 
+	Py_BEGIN_ALLOW_THREADS
 	rc = fm_clear_fault(&af);
+	Py_END_ALLOW_THREADS
 	if (rc == FM_ERR_OK) {
 		Py_RETURN_TRUE;
 	}
@@ -407,7 +762,9 @@ static PyObject * _fm_clear_all(PyObject * self, PyObject *args) {
 	}
 
 	strncpy(inst_id, eid ,sizeof(inst_id)-1);
+	Py_BEGIN_ALLOW_THREADS
 	rc = fm_clear_all(&inst_id);
+	Py_END_ALLOW_THREADS
 	if (rc == FM_ERR_OK) {
 		Py_RETURN_TRUE;
 	}
@@ -426,7 +783,6 @@ static PyObject * _fm_clear_all(PyObject * self, PyObject *args) {
 
 static PyObject * _fm_clear_list(PyObject * self, PyObject *args) {
 
-	std::string alm_str, filter_str;
 	EFmErrorT rc;
 
 	PyObject *listObj = nullptr;
@@ -435,26 +791,27 @@ static PyObject * _fm_clear_list(PyObject * self, PyObject *args) {
 		Py_RETURN_FALSE;
 	}
 
+	if (!PyList_Check(listObj)) {
+		ERROR_LOG("Expected a list.");
+		Py_RETURN_FALSE;
+	}
+
 	Py_ssize_t num_items = PyList_Size(listObj);
 	std::vector<AlarmFilter> alarms_vector;
 
 	for (Py_ssize_t i = 0; i < num_items; i++) {
 		PyObject *item = PyList_GetItem(listObj, i);
-		if (!PyUnicode_Check(item)) {
-			ERROR_LOG("List items must be strings.");
-			Py_RETURN_FALSE;
-		}
-		const char *alm_str = PyUnicode_AsUTF8(item);
 
 		AlarmFilter af;
-		if (!fm_alarm_filter_from_string(alm_str, &af)) {
-			ERROR_LOG("Invalid alarm filter: (%s)", filter_str.c_str());
+		if (!alarm_filter_from_pyobject(item, &af)) {
 			Py_RETURN_FALSE;
 		}
 		alarms_vector.push_back(af);
 	}
 
+	Py_BEGIN_ALLOW_THREADS
 	rc = fm_clear_fault_list(&alarms_vector);
+	Py_END_ALLOW_THREADS
 	if (rc == FM_ERR_OK) {
 		Py_RETURN_TRUE;
 	}
@@ -470,9 +827,116 @@ static PyObject * _fm_clear_list(PyObject * self, PyObject *args) {
 	Py_RETURN_FALSE;
 }
 
+static PyObject * _fm_set_async(PyObject * self, PyObject *args) {
+
+	SFmAlarmDataT alm_data;
+	fm_uuid_t tmp_uuid;
+	PyObject *alarm;
+	EFmErrorT rc;
+
+	if (!PyArg_ParseTuple(args, "O", &alarm)) {
+		ERROR_LOG("Failed to parse args.");
+		Py_RETURN_NONE;
+	}
+
+	if (!alarm_from_pyobject(alarm, &alm_data)) {
+		ERROR_LOG("Failed to convert argument to alarm.");
+		Py_RETURN_NONE;
+	}
+
+	memset(tmp_uuid, 0, sizeof(tmp_uuid));
+	rc = fm_set_fault_async(&alm_data, &tmp_uuid);
+	if (rc == FM_ERR_OK) {
+		return PyUnicode_FromString(&(tmp_uuid[0]));
+	}
+
+	if (rc == FM_ERR_NOT_ENOUGH_SPACE) {
+		WARNING_LOG("Request queue full, alarm dropped: (%s) (%s)",
+				alm_data.alarm_id, alm_data.entity_instance_id);
+	} else {
+		ERROR_LOG("Failed to queue alarm: (%s) (%s), error code: (%d)",
+				alm_data.alarm_id, alm_data.entity_instance_id, rc);
+	}
+	Py_RETURN_NONE;
+}
+
+static PyObject * _fm_clear_async(PyObject * self, PyObject *args) {
+
+	PyObject *filter;
+	PyObject *eid = NULL;
+	AlarmFilter af;
+	EFmErrorT rc;
+
+	if (!PyArg_ParseTuple(args, "O|O", &filter, &eid)) {
+		ERROR_LOG("Failed to parse args");
+		Py_RETURN_FALSE;
+	}
+
+	if (!alarm_filter_from_pyargs(filter, eid, &af)) {
+		Py_RETURN_FALSE;
+	}
+
+	rc = fm_clear_fault_async(&af);
+	if (rc == FM_ERR_OK) {
+		Py_RETURN_TRUE;
+	}
+
+	if (rc == FM_ERR_NOT_ENOUGH_SPACE) {
+		WARNING_LOG("Request queue full, clear dropped: (%s) (%s)",
+				af.alarm_id, af.entity_instance_id);
+	} else {
+		ERROR_LOG("Failed to queue clear by filter: (%s) (%s), error code: (%d)",
+				af.alarm_id, af.entity_instance_id, rc);
+	}
+	Py_RETURN_FALSE;
+}
+
+static PyObject * _fm_clear_all_async(PyObject * self, PyObject *args) {
+
+	fm_ent_inst_t inst_id;
+	const char *eid;
+	EFmErrorT rc;
+
+	memset(inst_id, 0 , sizeof(inst_id));
+	if (!PyArg_ParseTuple(args,"s", &eid)) {
+		ERROR_LOG("Failed to parse args");
+		Py_RETURN_FALSE;
+	}
+
+	strncpy(inst_id, eid ,sizeof(inst_id)-1);
+	rc = fm_clear_all_async(&inst_id);
+	if (rc == FM_ERR_OK) {
+		Py_RETURN_TRUE;
+	}
+
+	if (rc == FM_ERR_NOT_ENOUGH_SPACE) {
+		WARNING_LOG("Request queue full, clear all dropped: (%s)", inst_id);
+	} else {
+		ERROR_LOG("Failed to queue clear all with entity id (%s), error code: (%d)",
+				inst_id, rc);
+	}
+	Py_RETURN_FALSE;
+}
+
+static PyObject * _fm_async_stats(PyObject * self, PyObject *args) {
+
+	SFmAsyncStatsT stats;
+
+	if (fm_get_async_stats(&stats) != FM_ERR_OK) {
+		ERROR_LOG("Failed to get async request stats");
+		Py_RETURN_NONE;
+	}
+	return Py_BuildValue("{s:I,s:K,s:K,s:K}",
+			"pending", stats.pending,
+			"enqueued", stats.enqueued,
+			"sent", stats.sent,
+			"dropped", stats.dropped);
+}
+
 static PyMethodDef _methods [] = {
 		{ "set", _fm_set, METH_VARARGS, "Set or update an alarm" },
-		{ "get", _fm_get, METH_VARARGS, "Get alarms by filter" },
+		{ "get", (PyCFunction)_fm_get, METH_VARARGS | METH_KEYWORDS,
+				"Get alarms by filter" },
 		{ "clear", _fm_clear, METH_VARARGS, "Clear an alarm by filter" },
 		{ "clear_all", _fm_clear_all, METH_VARARGS,
 				"Clear alarms that match the entity instance id"},
@@ -482,10 +946,31 @@ static PyMethodDef _methods [] = {
 				"Get alarms by alarm id" },
 		{ "get_by_eid", (PyCFunction)_fm_get_by_eid, METH_VARARGS | METH_KEYWORDS,
 				"Get alarms by entity instance id" },
-		{ "get_by_id_n_eid", _fm_get_by_id_n_eid, METH_VARARGS,
+		{ "get_by_id_n_eid", (PyCFunction)_fm_get_by_id_n_eid,
+				METH_VARARGS | METH_KEYWORDS,
 				"Get list of alarms by filter" },
+		{ "get_by_eids", (PyCFunction)_fm_get_by_eids,
+				METH_VARARGS | METH_KEYWORDS,
+				"Get alarms of a list of entity instance ids" },
+		{ "get_by_aids", (PyCFunction)_fm_get_by_aids,
+				METH_VARARGS | METH_KEYWORDS,
+				"Get alarms of a list of alarm ids" },
+		{ "get_by_eid_page", (PyCFunction)_fm_get_by_eid_page,
+				METH_VARARGS | METH_KEYWORDS,
+				"Get a page of alarms by entity instance id" },
+		{ "get_by_aid_page", (PyCFunction)_fm_get_by_aid_page,
+				METH_VARARGS | METH_KEYWORDS,
+				"Get a page of alarms by alarm id" },
 		{ "set_fault_list", _fm_set_list, METH_VARARGS,
 				"Set alarm list" },
+		{ "set_async", _fm_set_async, METH_VARARGS,
+				"Queue an alarm to be set or updated" },
+		{ "clear_async", _fm_clear_async, METH_VARARGS,
+				"Queue an alarm clear by filter" },
+		{ "clear_all_async", _fm_clear_all_async, METH_VARARGS,
+				"Queue a clear of alarms that match the entity instance id" },
+		{ "async_stats", _fm_async_stats, METH_NOARGS,
+				"Get the async request queue counters" },
 	    { NULL, NULL, 0, NULL }
 };
 
@@ -10,7 +10,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 #
-# Copyright (c) 2018-2022 Wind River Systems, Inc.
+# Copyright (c) 2018-2022, 2026 Wind River Systems, Inc.
 #
 # SPDX-License-Identifier: Apache-2.0
 #
@@ -51,6 +51,8 @@ def setup_app(config=None):
     app_conf = dict(config.app)
     if app_conf['enable_acl']:
         app_conf['hooks'].append(hooks.AccessPolicyHook())
+    # After the policy check, a 304 skips the controller
+    app_conf.setdefault('hooks', []).append(hooks.ETagHook())
 
     app = pecan.make_app(
         app_conf.pop('root'),
@@ -1,5 +1,5 @@
 #
-# Copyright (c) 2018-2022 Wind River Systems, Inc.
+# Copyright (c) 2018-2022, 2026 Wind River Systems, Inc.
 #
 # SPDX-License-Identifier: Apache-2.0
 #
@@ -152,22 +152,13 @@ class AlarmCollection(collection.Collection):
 
     @classmethod
     def convert_with_links(cls, ialm, limit, url=None,
-                           expand=False, **kwargs):
-        # filter masked alarms
-        ialms = []
-        for a in ialm:
-            if isinstance(a, tuple):
-                ialm_instance = a[0]
-            else:
-                ialm_instance = a
-            if str(ialm_instance['masked']) != 'True':
-                ialms.append(a)
-
+                           expand=False, marker=None, **kwargs):
         collection = AlarmCollection()
         collection.alarms = [Alarm.convert_with_links(ch, expand)
-                             for ch in ialms]
+                             for ch in ialm]
         # url = url or None
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, marker=marker,
+                                              **kwargs)
         return collection
 
 
@@ -212,18 +203,14 @@ class AlarmController(rest.RestController):
     }
 
     def _get_alarm_summary(self, include_suppress):
-        kwargs = {}
-        kwargs["include_suppress"] = include_suppress
-        ialm = pecan.request.dbapi.alarm_get_all(**kwargs)
-        ialm_counts = {fm_constants.FM_ALARM_SEVERITY_CRITICAL: 0,
-                       fm_constants.FM_ALARM_SEVERITY_MAJOR: 0,
-                       fm_constants.FM_ALARM_SEVERITY_MINOR: 0,
-                       fm_constants.FM_ALARM_SEVERITY_WARNING: 0}
-        # filter masked alarms and sum by severity
-        for ialm_instance in ialm:
-            if str(ialm_instance['masked']) != 'True':
-                if ialm_instance['severity'] in ialm_counts:
-                    ialm_counts[ialm_instance['severity']] += 1
+        # masked alarms are not counted
+        counts = pecan.request.dbapi.alarm_get_summary(include_suppress)
+        ialm_counts = {}
+        for severity in (fm_constants.FM_ALARM_SEVERITY_CRITICAL,
+                         fm_constants.FM_ALARM_SEVERITY_MAJOR,
+                         fm_constants.FM_ALARM_SEVERITY_MINOR,
+                         fm_constants.FM_ALARM_SEVERITY_WARNING):
+            ialm_counts[severity] = counts.get(severity, 0)
 
         # Generate the status
         status = fm_constants.FM_ALARM_OK_STATUS
@@ -241,33 +228,37 @@ class AlarmController(rest.RestController):
                               q=None, include_suppress=False):
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
+        sort_keys = sort_key
         if isinstance(sort_key, str) and ',' in sort_key:
-            sort_key = sort_key.split(',')
+            sort_keys = sort_key.split(',')
 
         kwargs = {}
+        match = {}
         if q is not None:
             for i in q:
-                if i.op == 'eq':
+                if i.op in ('eq', 'prefix', 'contains'):
                     kwargs[i.field] = i.value
+                    if i.op != 'eq':
+                        match[i.field] = i.op
 
+        kwargs['match'] = match
         kwargs["include_suppress"] = include_suppress
+        kwargs['limit'] = limit
+        kwargs['marker'] = marker
+        kwargs['sort_key'] = sort_keys
+        kwargs['sort_dir'] = sort_dir
+        ialm = pecan.request.dbapi.alarm_get_all(**kwargs)
 
-        if marker:
-
-            marker_obj = objects.alarm.get_by_uuid(pecan.request.context,
-                                                   marker)
-            ialm = pecan.request.dbapi.alarm_get_list(
-                limit, marker_obj,
-                sort_key=sort_key,
-                sort_dir=sort_dir,
-                include_suppress=include_suppress)
-        else:
-            kwargs['limit'] = limit
-            ialm = pecan.request.dbapi.alarm_get_all(**kwargs)
+        next_marker = None
+        if ialm:
+            next_marker = pecan.request.dbapi.alarm_get_marker(ialm[-1],
+                                                               sort_keys)
 
         return AlarmCollection.convert_with_links(ialm, limit,
                                                   url=resource_url,
                                                   expand=expand,
+                                                  marker=next_marker,
+                                                  include_suppress=include_suppress or None,
                                                   sort_key=sort_key,
                                                   sort_dir=sort_dir)
 
@@ -294,14 +285,15 @@ class AlarmController(rest.RestController):
         return event_log_dict
 
     @wsme_pecan.wsexpose(AlarmCollection, [Query],
-                         types.uuid, int, wtypes.text, wtypes.text, bool, bool)
-    def get_all(self, q=[], marker=None, limit=None, sort_key='id',
+                         wtypes.text, int, wtypes.text, wtypes.text, bool, bool)
+    def get_all(self, q=[], marker=None, limit=None, sort_key=None,
                 sort_dir='asc', include_suppress=False, expand=False):
         """Retrieve a list of alarm.
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
-        :param sort_key: column to sort results by. Default: id.
+        :param sort_key: column to sort results by.
+               Default: severity,entity_instance_id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
         :param include_suppress: filter on suppressed alarms. Default: False
         :param expand: filter for getting all the data of the alarm.
@@ -311,7 +303,7 @@ class AlarmController(rest.RestController):
                                           sort_dir, expand=expand, q=q,
                                           include_suppress=include_suppress)
 
-    @wsme_pecan.wsexpose(AlarmCollection, types.uuid, int,
+    @wsme_pecan.wsexpose(AlarmCollection, wtypes.text, int,
                          wtypes.text, wtypes.text)
     def detail(self, marker=None, limit=None, sort_key='id', sort_dir='asc'):
         """Retrieve a list of alarm with detail.
@@ -339,8 +331,6 @@ class AlarmController(rest.RestController):
         """
         rpc_ialarm = objects.alarm.get_by_uuid(
             pecan.request.context, id)
-        if str(rpc_ialarm['masked']) == 'True':
-            raise exceptions.HTTPNotFound
 
         return Alarm.convert_with_links(rpc_ialarm)
 
@@ -350,7 +340,7 @@ class AlarmController(rest.RestController):
 
         :param id: uuid of an alarm.
         """
-        data = pecan.request.dbapi.alarm_get(id)
+        data = pecan.request.dbapi.alarm_get(id, include_masked=True)
         if data is None:
             raise wsme.exc.ClientSideError(_("can not find record to clear!"))
         pecan.request.dbapi.alarm_destroy(id)
@@ -405,7 +395,8 @@ class AlarmController(rest.RestController):
                 alarm_id = alarm_data_dict['alarm_id']
                 entity_instance_id = alarm_data_dict['entity_instance_id']
                 if clear_uuid is not None:
-                    data = pecan.request.dbapi.alarm_get(clear_uuid)
+                    data = pecan.request.dbapi.alarm_get(clear_uuid,
+                                                         include_masked=True)
                     pecan.request.dbapi.alarm_destroy(clear_uuid)
                     tmp_dict = data.as_dict()
                     self._alarm_save2event_log(tmp_dict, alarm_state, empty_uuid=True)
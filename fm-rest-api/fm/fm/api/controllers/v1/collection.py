@@ -16,13 +16,14 @@
 #    under the License.
 #
 #
-# Copyright (c) 2018 Wind River Systems, Inc.
+# Copyright (c) 2018, 2026 Wind River Systems, Inc.
 #
 # SPDX-License-Identifier: Apache-2.0
 #
 
 
 import pecan
+from six.moves.urllib.parse import urlencode
 from wsme import types as wtypes
 
 from fm.api.controllers.v1 import base
@@ -42,16 +43,23 @@ class Collection(base.APIBase):
         """Return whether collection has more items."""
         return len(self.collection) and len(self.collection) == limit
 
-    def get_next(self, limit, url=None, **kwargs):
-        """Return a link to the next subset of the collection."""
+    def get_next(self, limit, url=None, marker=None, **kwargs):
+        """Return a link to the next subset of the collection.
+
+        The query filters of the request are kept, so that the next subset
+        is of the same query.
+        """
         if not self.has_next(limit):
             return wtypes.Unset
 
         resource_url = url or self._type
-        q_args = ''.join(['%s=%s&' % (key, kwargs[key]) for key in kwargs])
-        next_args = '?%(args)slimit=%(limit)d&marker=%(marker)s' % {
-                    'args': q_args, 'limit': limit,
-                    'marker': self.collection[-1].uuid}
+        args = [(key, value) for key, value in pecan.request.GET.items()
+                if key.startswith('q.')]
+        args.extend((key, kwargs[key]) for key in kwargs
+                    if kwargs[key] is not None)
+        args.append(('limit', limit))
+        args.append(('marker', marker or self.collection[-1].uuid))
+        next_args = '?%s' % urlencode(args)
 
         return link.Link.make_link('next', pecan.request.host_url,
                                    resource_url, next_args).href
@@ -1,5 +1,5 @@
 #
-# Copyright (c) 2018-2022 Wind River Systems, Inc.
+# Copyright (c) 2018-2022, 2026 Wind River Systems, Inc.
 #
 # SPDX-License-Identifier: Apache-2.0
 #
@@ -148,7 +148,7 @@ class EventLogCollection(collection.Collection):
 
     @classmethod
     def convert_with_links(cls, ilog, limit=None, url=None,
-                           expand=False, **kwargs):
+                           expand=False, marker=None, **kwargs):
 
         ilogs = []
         for a in ilog:
@@ -158,7 +158,8 @@ class EventLogCollection(collection.Collection):
         collection.event_log = [EventLog.convert_with_links(ch, expand)
                                 for ch in ilogs]
 
-        collection.next = collection.get_next(limit, url=url, **kwargs)
+        collection.next = collection.get_next(limit, url=url, marker=marker,
+                                              **kwargs)
         return collection
 
 
@@ -202,7 +203,11 @@ class EventLogController(rest.RestController):
         if limit and limit < 0:
             raise wsme.exc.ClientSideError(_("Limit must be positive"))
         sort_dir = utils.validate_sort_dir(sort_dir)
+        sort_keys = sort_key
+        if isinstance(sort_key, str) and ',' in sort_key:
+            sort_keys = sort_key.split(',')
         kwargs = {}
+        match = {}
         if q is not None:
             for i in q:
                 if i.op == 'eq':
@@ -212,33 +217,37 @@ class EventLogController(rest.RestController):
                             .replace(tzinfo=None))
                         i.value = val.isoformat()
                     kwargs[i.field] = i.value
+                elif i.op in ('prefix', 'contains'):
+                    kwargs[i.field] = i.value
+                    match[i.field] = i.op
 
+        kwargs['match'] = match
         evtType = _getEventType(alarms, logs)
         kwargs["evtType"] = evtType
         kwargs["include_suppress"] = include_suppress
+        kwargs['limit'] = limit
+        kwargs['marker'] = marker
+        kwargs['sort_key'] = sort_keys
+        kwargs['sort_dir'] = sort_dir
+        ilog = pecan.request.dbapi.event_log_get_all(**kwargs)
 
-        if marker:
-            marker_obj = objects.event_log.get_by_uuid(pecan.request.context,
-                                                       marker)
-
-            ilog = pecan.request.dbapi.event_log_get_list(
-                limit, marker_obj,
-                sort_key=sort_key,
-                sort_dir=sort_dir,
-                evtType=evtType,
-                include_suppress=include_suppress)
-        else:
-            kwargs['limit'] = limit
-            ilog = pecan.request.dbapi.event_log_get_all(**kwargs)
+        next_marker = None
+        if ilog:
+            next_marker = pecan.request.dbapi.event_log_get_marker(ilog[-1],
+                                                                   sort_keys)
 
         return EventLogCollection.convert_with_links(ilog, limit,
                                                      url=resource_url,
                                                      expand=expand,
+                                                     marker=next_marker,
+                                                     alarms=alarms or None,
+                                                     logs=logs or None,
+                                                     include_suppress=include_suppress or None,
                                                      sort_key=sort_key,
                                                      sort_dir=sort_dir)
 
     @wsme_pecan.wsexpose(EventLogCollection, [Query],
-                         types.uuid, int, wtypes.text, wtypes.text,
+                         wtypes.text, int, wtypes.text, wtypes.text,
                          bool, bool, bool, bool)
     def get_all(self, q=[], marker=None, limit=None, sort_key='timestamp',
                 sort_dir='desc', alarms=False, logs=False,
@@ -247,8 +256,8 @@ class EventLogController(rest.RestController):
 
         :param marker: pagination marker for large data sets.
         :param limit: maximum number of resources to return in a single result.
-        :param sort_key: column to sort results by. Default: id.
-        :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param sort_key: column to sort results by. Default: timestamp.
+        :param sort_dir: direction to sort. "asc" or "desc". Default: desc.
         :param alarms: filter on alarms. Default: False
         :param logs: filter on logs. Default: False
         :param include_suppress: filter on suppressed alarms. Default: False
@@ -260,7 +269,7 @@ class EventLogController(rest.RestController):
                                              alarms=alarms, logs=logs,
                                              include_suppress=include_suppress)
 
-    @wsme_pecan.wsexpose(EventLogCollection, types.uuid, int,
+    @wsme_pecan.wsexpose(EventLogCollection, wtypes.text, int,
                          wtypes.text, wtypes.text, bool, bool)
     def detail(self, marker=None, limit=None, sort_key='id', sort_dir='asc',
                alarms=False, logs=False):
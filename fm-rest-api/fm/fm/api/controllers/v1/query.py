@@ -45,7 +45,8 @@ from fm.common.utils import get_debian_codename
 
 LOG = log.getLogger(__name__)
 
-operation_kind = wtypes.Enum(str, 'lt', 'le', 'eq', 'ne', 'ge', 'gt')
+operation_kind = wtypes.Enum(str, 'lt', 'le', 'eq', 'ne', 'ge', 'gt',
+                             'prefix', 'contains')
 
 
 class _Base(wtypes.Base):
@@ -1,5 +1,5 @@
 #
-# Copyright (c) 2018 Wind River Systems, Inc.
+# Copyright (c) 2018, 2026 Wind River Systems, Inc.
 #
 # SPDX-License-Identifier: Apache-2.0
 #
@@ -43,10 +43,11 @@ class Connection(object):
         """
 
     @abc.abstractmethod
-    def alarm_get(self, uuid):
+    def alarm_get(self, uuid, include_masked=False):
         """Return an alarm.
 
         :param uuid: The uuid of an alarm.
+        :param include_masked: Return the alarm even if it is masked.
         :returns: An alarm.
         """
 
@@ -61,7 +62,10 @@ class Connection(object):
 
     @abc.abstractmethod
     def alarm_get_all(self, uuid=None, alarm_id=None, entity_type_id=None,
-                      entity_instance_id=None, severity=None, alarm_type=None):
+                      entity_instance_id=None, severity=None, alarm_type=None,
+                      limit=None, include_suppress=False, marker=None,
+                      sort_key=None, sort_dir=None, include_masked=False,
+                      match=None):
         """Return a list of alarms for the given filters.
 
         :param uuid: The uuid of an alarm.
@@ -70,20 +74,42 @@ class Connection(object):
         :param entity_instance_id: The entity_instance_id of an alarm.
         :param severity: The severity of an alarm.
         :param alarm_type: The alarm_type of an alarm.
+        :param limit: Maximum number of alarms to return.
+        :param include_suppress: Return the alarms of suppressed events too.
+        :param marker: the marker of the last alarm of the previous page,
+                       from alarm_get_marker, or its uuid; we return the
+                       next result set.
+        :param sort_key: Attribute or list of attributes by which results
+                         should be sorted. Default: severity,
+                         entity_instance_id.
+        :param sort_dir: direction in which results should be sorted.
+                         (asc, desc)
+        :param include_masked: Return the masked alarms too.
+        :param match: How the filters match, by filter name: eq for the
+                      whole value, prefix for its beginning, contains for
+                      any part of it. Default: prefix for
+                      entity_instance_id, eq for the others.
         :returns:  alarms.
         """
 
     @abc.abstractmethod
-    def alarm_get_list(self, limit=None, marker=None,
-                       sort_key=None, sort_dir=None):
-        """Return a list of alarms.
-
-        :param limit: Maximum number of alarm to return.
-        :param marker: the last item of the previous page; we return the next
-                       result set.
-        :param sort_key: Attribute by which results should be sorted.
-        :param sort_dir: direction in which results should be sorted.
-                         (asc, desc)
+    def alarm_get_summary(self, include_suppress=False):
+        """Return the number of alarms of each severity.
+
+        Masked alarms are not counted.
+
+        :param include_suppress: Count the alarms of suppressed events too.
+        :returns: A dict of alarm counts keyed by severity.
+        """
+
+    @abc.abstractmethod
+    def alarm_get_marker(self, alarm, sort_key=None):
+        """Return the marker of the page of alarms that follows an alarm.
+
+        :param alarm: The last alarm of a page.
+        :param sort_key: Attribute or list of attributes by which the page
+                         is sorted.
+        :returns: An opaque marker for alarm_get_all.
         """
 
     @abc.abstractmethod
@@ -133,7 +159,9 @@ class Connection(object):
     def event_log_get_all(self, uuid=None, event_log_id=None,
                           entity_type_id=None, entity_instance_id=None,
                           severity=None, event_log_type=None, start=None,
-                          end=None, limit=None):
+                          end=None, limit=None, evtType="ALL",
+                          include_suppress=False, marker=None,
+                          sort_key=None, sort_dir=None, match=None):
         """Return a list of event_log for the given filters.
 
         :param uuid: The uuid of an event_log.
@@ -144,18 +172,43 @@ class Connection(object):
         :param alarm_type: The alarm_type of an event_log.
         :param start: The event_logs that occurred after start
         :param end: The event_logs that occurred before end
+        :param limit: Maximum number of event_log to return.
+        :param evtType: ALARM or LOG to return only alarms or logs.
+        :param include_suppress: Return the event_log of suppressed events
+                                 too.
+        :param marker: the marker of the last event_log of the previous
+                       page, from event_log_get_marker, or its uuid; we
+                       return the next result set.
+        :param sort_key: Attribute or list of attributes by which results
+                         should be sorted. Default: timestamp.
+        :param sort_dir: direction in which results should be sorted.
+                         (asc, desc)
+        :param match: How the filters match, by filter name: eq for the
+                      whole value, prefix for its beginning, contains for
+                      any part of it. Default: prefix for
+                      entity_instance_id, eq for the others.
         :returns:  event_log.
         """
 
     @abc.abstractmethod
-    def event_log_get_list(self, limit=None, marker=None,
-                           sort_key=None, sort_dir=None, evtType="ALL"):
-        """Return a list of event_log.
+    def event_log_get_marker(self, event_log, sort_key=None):
+        """Return the marker of the page of event_log that follows one.
 
-        :param limit: Maximum number of event_log to return.
-        :param marker: the last item of the previous page; we return the next
-                       result set.
-        :param sort_key: Attribute by which results should be sorted.
-        :param sort_dir: direction in which results should be sorted.
-                         (asc, desc)
+        :param event_log: The last event_log of a page.
+        :param sort_key: Attribute or list of attributes by which the page
+                         is sorted.
+        :returns: An opaque marker for event_log_get_all.
+        """
+
+    @abc.abstractmethod
+    def change_generation_get(self, name):
+        """Return the change generation of a resource.
+
+        The generation is bumped by the DB on every change to the tables
+        the resource is read from.
+
+        :param name: The resource, alarm or event_log.
+        :returns: The generation, or None if the DB does not maintain it
+                  or it was bumped by a change that may not be committed
+                  yet.
         """
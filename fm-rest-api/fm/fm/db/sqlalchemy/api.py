@@ -6,12 +6,17 @@
 
 """SQLAlchemy storage backend."""
 
+import base64
+import datetime
 import functools
 import sys
+import time
 
 import eventlet
 from oslo_log import log
 from oslo_config import cfg
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 
 from oslo_db import exception as db_exc
@@ -19,12 +24,16 @@ from oslo_db.sqlalchemy import enginefacade
 from oslo_db.sqlalchemy import orm
 from oslo_db.sqlalchemy import utils as db_utils
 
-from sqlalchemy import asc, desc, or_
+from sqlalchemy import and_, asc, desc, func, or_, text
+from sqlalchemy import DateTime
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm.exc import NoResultFound
 
 from fm.api import config
 from fm.common import constants
 from fm.common import exceptions
+from fm.common.i18n import _
 from fm.db import api
 from fm.db.sqlalchemy import models
 from fm import objects
@@ -34,6 +43,35 @@ CONF = cfg.CONF
 
 LOG = log.getLogger(__name__)
 
+# The default order of the alarm and event log lists
+ALARM_SORT_KEYS = ['severity', 'entity_instance_id']
+EVENT_LOG_SORT_KEYS = ['timestamp']
+
+# The filters of the alarm and event log lists that match the beginning of
+# the value by default, rather than the whole of it
+MATCH_DEFAULTS = {'entity_instance_id': 'prefix'}
+
+# The change generations are sequences in PostgreSQL, bumped outside of the
+# writers' transactions. A bumped generation is seen before the change is
+# committed, so it is only returned once it has not changed for
+# GENERATION_SETTLE_TIME seconds.
+GENERATION_SEQUENCES = {'alarm': 'change_generation_alarm',
+                        'event_log': 'change_generation_event_log'}
+GENERATION_SETTLE_TIME = 5
+# name -> (generation, time.monotonic() it was first read)
+_generations_seen = {}
+
+
+def _settled_generation(name, generation):
+    seen = _generations_seen.get(name)
+    now = time.monotonic()
+    if seen is None or seen[0] != generation:
+        _generations_seen[name] = (generation, now)
+        return None
+    if now - seen[1] < GENERATION_SETTLE_TIME:
+        return None
+    return generation
+
 
 def get_engine():
     return enginefacade.writer.get_engine()
@@ -59,6 +97,45 @@ def _session_for_write():
     return enginefacade.writer.using(_context)
 
 
+# Insert constructs supporting ON CONFLICT DO UPDATE, by dialect name
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def _alarm_upsert(session, insert, values):
+    """Insert an alarm, or update the alarm of the same alarm id and entity.
+
+    The insert conflicts on the unique index on (alarm_id,
+    entity_instance_id), so that concurrent raises of one alarm update a
+    single row.
+    """
+    table = models.Alarm.__table__
+    columns = dict((k, v) for k, v in values.items() if k in table.c)
+    if columns.get('id') is None:
+        columns.pop('id', None)
+    columns['created_at'] = timeutils.utcnow()
+    stmt = insert(table).values(**columns)
+    updates = dict((k, stmt.excluded[k]) for k in columns
+                   if k not in ('id', 'created_at'))
+    updates['updated_at'] = stmt.excluded.created_at
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=['alarm_id', 'entity_instance_id'], set_=updates))
+
+    # RETURNING is not available on every dialect, read the row id back
+    # within the same transaction
+    query = session.query(models.Alarm.id, models.Alarm.created_at)
+    query = query.filter_by(alarm_id=columns.get('alarm_id'),
+                            entity_instance_id=columns.get('entity_instance_id'))
+    row = query.one()
+    alarm = models.Alarm()
+    alarm.update(values)
+    alarm.id = row.id
+    alarm.created_at = row.created_at
+    return alarm
+
+
 def _paginate_query(model, limit=None, marker=None, sort_key=None,
                     sort_dir=None, query=None):
     if not query:
@@ -78,6 +155,194 @@ def _paginate_query(model, limit=None, marker=None, sort_key=None,
     return query.all()
 
 
+def _get_sort_keys(model, klass, sort_key, default_keys):
+    """Return the keys a keyset paginated query is sorted by.
+
+    The keys are columns of the model which are fields of its objects, so
+    that the marker of the page that follows an object can be made from it.
+    The id is always the last key, which makes the order total.
+    """
+    if not sort_key:
+        sort_keys = list(default_keys)
+    elif not isinstance(sort_key, list):
+        sort_keys = [sort_key]
+    else:
+        sort_keys = list(sort_key)
+
+    for key in sort_keys:
+        if key not in model.__table__.columns or key not in klass.fields:
+            raise exceptions.InvalidParameterValue(
+                err=_("Invalid sort key: %s") % key)
+    if 'id' not in sort_keys:
+        sort_keys.append('id')
+    return sort_keys
+
+
+def _encode_marker(item, sort_keys):
+    """Return the opaque marker of the page that follows item."""
+    values = []
+    for key in sort_keys:
+        value = item[key]
+        if isinstance(value, datetime.datetime):
+            value = timeutils.normalize_time(value).isoformat()
+        values.append(value)
+    marker = jsonutils.dump_as_bytes({'keys': sort_keys, 'values': values})
+    return base64.urlsafe_b64encode(marker).decode('ascii').rstrip('=')
+
+
+def _decode_marker(model, marker, sort_keys):
+    """Return the values of the sort keys at which the page starts.
+
+    The marker is either one made by _encode_marker, or the uuid of the
+    last item of the previous page.
+    """
+    columns = [getattr(model, key) for key in sort_keys]
+    if uuidutils.is_uuid_like(marker):
+        query = model_query(*columns).filter(model.uuid == marker)
+        values = query.first()
+        if values is None:
+            raise exceptions.InvalidParameterValue(
+                err=_("Invalid marker: %s") % marker)
+        return list(values)
+
+    try:
+        padding = '=' * (-len(marker) % 4)
+        decoded = jsonutils.loads(base64.urlsafe_b64decode(
+            str(marker + padding)))
+        keys = decoded['keys']
+        values = decoded['values']
+    except (TypeError, ValueError, KeyError):
+        keys = None
+    if keys != sort_keys or len(values) != len(sort_keys):
+        raise exceptions.InvalidParameterValue(
+            err=_("Invalid marker: %s") % marker)
+
+    for index, column in enumerate(model.__table__.columns[key]
+                                   for key in sort_keys):
+        if values[index] is not None and isinstance(column.type, DateTime):
+            try:
+                values[index] = timeutils.normalize_time(
+                    timeutils.parse_isotime(values[index]))
+            except ValueError:
+                raise exceptions.InvalidParameterValue(
+                    err=_("Invalid marker: %s") % marker)
+    return values
+
+
+def _keyset_after(model, sort_keys, sort_dir, values, nulls_last):
+    """Return the criterion of the rows that sort after the given values.
+
+    Returns None when no row does.
+    """
+    criteria = []
+    ties = []
+    for key, value in zip(sort_keys, values):
+        column = getattr(model, key)
+        nullable = model.__table__.columns[key].nullable
+        if value is None:
+            after = None if nulls_last else column.isnot(None)
+            tie = column.is_(None)
+        else:
+            after = column > value if sort_dir == 'asc' else column < value
+            if nulls_last and nullable:
+                after = or_(after, column.is_(None))
+            tie = column == value
+        if after is not None:
+            criteria.append(and_(*(ties + [after])))
+        ties.append(tie)
+    if not criteria:
+        return None
+    return or_(*criteria)
+
+
+def _keyset_paginate(model, query, sort_keys, sort_dir='asc',
+                     marker_values=None, limit=None):
+    """Sort a query, and return the page of it that starts after a marker.
+
+    The page is selected with a range of the sort keys rather than an
+    offset, so it costs the same however deep it is. The range of the first
+    sort key is a plain bound, which lets the DB start the scan of an index
+    on the sort keys at the marker. The rows with a NULL first sort key are
+    queried apart for the same reason, when the page reaches them.
+    """
+    columns = [getattr(model, key) for key in sort_keys]
+    order = asc if sort_dir == 'asc' else desc
+    query = query.order_by(*[order(column) for column in columns])
+
+    if marker_values is None:
+        queries = [query]
+    else:
+        # NULLs sort after all the values in PostgreSQL, and before them
+        # in the other DBs
+        nulls_last = ((get_engine().dialect.name == 'postgresql') !=
+                      (sort_dir == 'desc'))
+        first = columns[0]
+        value = marker_values[0]
+        after = _keyset_after(model, sort_keys[1:], sort_dir,
+                              marker_values[1:], nulls_last)
+        queries = []
+        if value is None:
+            if after is not None:
+                queries.append(query.filter(first.is_(None)).filter(after))
+            if not nulls_last:
+                queries.append(query.filter(first.isnot(None)))
+        else:
+            if sort_dir == 'asc':
+                bound = first >= value
+                criterion = first > value
+            else:
+                bound = first <= value
+                criterion = first < value
+            if after is not None:
+                criterion = or_(criterion, and_(first == value, after))
+            queries.append(query.filter(bound).filter(criterion))
+            if nulls_last and model.__table__.columns[sort_keys[0]].nullable:
+                queries.append(query.filter(first.is_(None)))
+
+    results = []
+    for query in queries:
+        if limit is not None:
+            if len(results) >= limit:
+                break
+            query = query.limit(limit - len(results))
+        results.extend(query.all())
+    return results
+
+
+def _add_match_filter(query, model, field, value, match=None):
+    """Filter a query on the value of a string column.
+
+    The filter matches the whole value (eq), its beginning (prefix) or any
+    part of it (contains), as given for the field by match, or by
+    MATCH_DEFAULTS. eq and prefix are served by an index of the column;
+    contains scans the table, unless PostgreSQL has a trigram index of it.
+    """
+    mode = (match or {}).get(field) or MATCH_DEFAULTS.get(field, 'eq')
+    if mode not in ('eq', 'prefix', 'contains'):
+        raise exceptions.InvalidParameterValue(
+            err=_("Invalid match of %s: %s") % (field, mode))
+    if value is None:
+        return query
+
+    column = getattr(model, field)
+    if mode == 'eq':
+        return query.filter(column == value)
+    pattern = value.replace('/', '//').replace('%', '/%').replace('_', '/_')
+    if mode == 'contains':
+        return query.filter(column.like('%' + pattern + '%', escape='/'))
+    if not value:
+        return query
+    if get_engine().dialect.name == 'sqlite':
+        # LIKE is case insensitive in SQLite, which keeps it from using an
+        # index of the column. The values that start with the prefix are a
+        # range of it in binary order instead.
+        upper = value[:-1] + chr(ord(value[-1]) + 1)
+        return query.filter(column >= value).filter(column < upper)
+    # The pattern is a constant, so that PostgreSQL can scan an index of
+    # the column with varchar_pattern_ops for it
+    return query.filter(column.like(pattern + '%', escape='/'))
+
+
 def db_session_cleanup(cls):
     """Class decorator that automatically adds session cleanup to all non-special methods."""
 
@@ -219,9 +484,12 @@ class Connection(api.Connection):
     def alarm_create(self, values):
         if not values.get('uuid'):
             values['uuid'] = uuidutils.generate_uuid()
-        alarm = models.Alarm()
-        alarm.update(values)
         with _session_for_write() as session:
+            insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+            if insert is not None:
+                return _alarm_upsert(session, insert, values)
+            alarm = models.Alarm()
+            alarm.update(values)
             try:
                 session.add(alarm)
                 session.flush()
@@ -230,11 +498,13 @@ class Connection(api.Connection):
             return alarm
 
     @objects.objectify(objects.alarm)
-    def alarm_get(self, uuid):
+    def alarm_get(self, uuid, include_masked=False):
         query = model_query(models.Alarm)
 
         if uuid:
             query = query.filter_by(uuid=uuid)
+        if not include_masked:
+            query = query.filter(models.Alarm.masked.isnot(True))
 
         query = add_alarm_filter_by_event_suppression(query, include_suppress=True)
         query = add_alarm_mgmt_affecting_by_event_suppression(query)
@@ -278,33 +548,30 @@ class Connection(api.Connection):
     @objects.objectify(objects.alarm)
     def alarm_get_all(self, uuid=None, alarm_id=None, entity_type_id=None,
                       entity_instance_id=None, severity=None, alarm_type=None,
-                      limit=None, include_suppress=False):
+                      limit=None, include_suppress=False, marker=None,
+                      sort_key=None, sort_dir=None, include_masked=False,
+                      match=None):
+        sort_keys = _get_sort_keys(models.Alarm, objects.alarm, sort_key,
+                                   ALARM_SORT_KEYS)
+        if marker is not None:
+            marker = _decode_marker(models.Alarm, marker, sort_keys)
         query = model_query(models.Alarm, read_deleted="no")
-        query = query.order_by(asc(models.Alarm.severity),
-                               asc(models.Alarm.entity_instance_id),
-                               asc(models.Alarm.id))
-        if uuid is not None:
-            query = query.filter(models.Alarm.uuid.contains(uuid))
-        if alarm_id is not None:
-            query = query.filter(models.Alarm.alarm_id.contains(alarm_id))
-        if entity_type_id is not None:
-            query = query.filter(models.Alarm.entity_type_id.contains(
-                entity_type_id))
-        if entity_instance_id is not None:
-            query = query.filter(models.Alarm.entity_instance_id.contains(
-                entity_instance_id))
-        if severity is not None:
-            query = query.filter(models.Alarm.severity.contains(severity))
-        if alarm_type is not None:
-            query = query.filter(models.Alarm.alarm_type.contains(alarm_type))
+        if not include_masked:
+            query = query.filter(models.Alarm.masked.isnot(True))
+        for field, value in (('uuid', uuid), ('alarm_id', alarm_id),
+                             ('entity_type_id', entity_type_id),
+                             ('entity_instance_id', entity_instance_id),
+                             ('severity', severity),
+                             ('alarm_type', alarm_type)):
+            query = _add_match_filter(query, models.Alarm, field, value,
+                                      match)
         query = add_alarm_filter_by_event_suppression(query, include_suppress)
         query = add_alarm_mgmt_affecting_by_event_suppression(query)
         query = add_alarm_degrade_affecting_by_event_suppression(query)
-        if limit is not None:
-            query = query.limit(limit)
         alarm_list = []
         try:
-            results = query.all()
+            results = _keyset_paginate(models.Alarm, query, sort_keys,
+                                       sort_dir or 'asc', marker, limit)
             for result in results:
                 alarm = result[0]
                 alarm.suppression_status = result[1]
@@ -316,17 +583,23 @@ class Connection(api.Connection):
                       "return an empty alarm list.")
         return alarm_list
 
-    @objects.objectify(objects.alarm)
-    def alarm_get_list(self, limit=None, marker=None,
-                       sort_key=None, sort_dir=None,
-                       include_suppress=False):
-        query = model_query(models.Alarm)
-        query = add_alarm_filter_by_event_suppression(query, include_suppress)
-        query = add_alarm_mgmt_affecting_by_event_suppression(query)
-        query = add_alarm_degrade_affecting_by_event_suppression(query)
-
-        return _paginate_query(models.Alarm, limit, marker,
-                               sort_key, sort_dir, query)
+    def alarm_get_summary(self, include_suppress=False):
+        query = model_query(models.Alarm.severity,
+                            func.count(models.Alarm.id))
+        query = query.join(models.EventSuppression,
+                           models.Alarm.alarm_id ==
+                           models.EventSuppression.alarm_id)
+        if not include_suppress:
+            query = query.filter(models.EventSuppression.suppression_status ==
+                                 constants.FM_UNSUPPRESSED)
+        query = query.filter(models.Alarm.masked.isnot(True))
+        query = query.group_by(models.Alarm.severity)
+        return dict(query.all())
+
+    def alarm_get_marker(self, alarm, sort_key=None):
+        sort_keys = _get_sort_keys(models.Alarm, objects.alarm, sort_key,
+                                   ALARM_SORT_KEYS)
+        return _encode_marker(alarm, sort_keys)
 
     def alarm_update(self, id, values):
         with _session_for_write() as session:
@@ -436,28 +709,23 @@ class Connection(api.Connection):
     def event_log_get_all(self, uuid=None, event_log_id=None,
                           entity_type_id=None, entity_instance_id=None,
                           severity=None, event_log_type=None, start=None,
-                          end=None, limit=None, evtType="ALL", include_suppress=False):
+                          end=None, limit=None, evtType="ALL", include_suppress=False,
+                          marker=None, sort_key=None, sort_dir=None,
+                          match=None):
+        sort_keys = _get_sort_keys(models.EventLog, objects.event_log,
+                                   sort_key, EVENT_LOG_SORT_KEYS)
+        if marker is not None:
+            marker = _decode_marker(models.EventLog, marker, sort_keys)
         query = model_query(models.EventLog, read_deleted="no")
-        query = query.order_by(desc(models.EventLog.timestamp))
-        if uuid is not None:
-            query = query.filter_by(uuid=uuid)
-
         query = self._addEventTypeToQuery(query, evtType)
 
-        if event_log_id is not None:
-            query = query.filter(models.EventLog.event_log_id.contains(
-                event_log_id))
-        if entity_type_id is not None:
-            query = query.filter(models.EventLog.entity_type_id.contains(
-                entity_type_id))
-        if entity_instance_id is not None:
-            query = query.filter(models.EventLog.entity_instance_id.contains(
-                entity_instance_id))
-        if severity is not None:
-            query = query.filter(models.EventLog.severity.contains(severity))
-
-        if event_log_type is not None:
-            query = query.filter_by(event_log_type=event_log_type)
+        for field, value in (('uuid', uuid), ('event_log_id', event_log_id),
+                             ('entity_type_id', entity_type_id),
+                             ('entity_instance_id', entity_instance_id),
+                             ('severity', severity),
+                             ('event_log_type', event_log_type)):
+            query = _add_match_filter(query, models.EventLog, field, value,
+                                      match)
         if start is not None:
             query = query.filter(models.EventLog.timestamp >= start)
         if end is not None:
@@ -465,12 +733,11 @@ class Connection(api.Connection):
         if include_suppress is not None:
             query = add_event_log_filter_by_event_suppression(query,
                                                               include_suppress)
-        if limit is not None:
-            query = query.limit(limit)
 
         hist_list = []
         try:
-            result = query.all()
+            result = _keyset_paginate(models.EventLog, query, sort_keys,
+                                      sort_dir or 'desc', marker, limit)
             for hist in result:
                 event = hist[0]
                 event.suppression_status = hist[1]
@@ -480,17 +747,10 @@ class Connection(api.Connection):
                       "return an empty event log list.")
         return hist_list
 
-    @objects.objectify(objects.event_log)
-    def event_log_get_list(self, limit=None, marker=None,
-                           sort_key=None, sort_dir=None, evtType="ALL",
-                           include_suppress=False):
-        query = model_query(models.EventLog)
-        query = self._addEventTypeToQuery(query, evtType)
-        query = add_event_log_filter_by_event_suppression(query,
-                                                          include_suppress)
-
-        return _paginate_query(models.EventLog, limit, marker,
-                               sort_key, sort_dir, query)
+    def event_log_get_marker(self, event_log, sort_key=None):
+        sort_keys = _get_sort_keys(models.EventLog, objects.event_log,
+                                   sort_key, EVENT_LOG_SORT_KEYS)
+        return _encode_marker(event_log, sort_keys)
 
     @objects.objectify(objects.event_suppression)
     def event_suppression_get(self, id):
@@ -537,3 +797,19 @@ class Connection(api.Connection):
             if count != 1:
                 raise exceptions.NotFound(id)
             return query.one()
+
+    def change_generation_get(self, name):
+        if get_engine().dialect.name == 'postgresql':
+            sequence = GENERATION_SEQUENCES.get(name)
+            if sequence is None:
+                return None
+            with _session_for_read() as session:
+                generation = session.execute(
+                    text('SELECT last_value FROM %s' % sequence)).scalar()
+            return _settled_generation(name, generation)
+
+        query = model_query(models.ChangeGeneration.generation)
+        result = query.filter_by(name=name).first()
+        if result is None:
+            return None
+        return result[0]
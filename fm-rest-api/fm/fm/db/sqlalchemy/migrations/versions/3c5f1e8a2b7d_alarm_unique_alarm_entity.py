@@ -0,0 +1,41 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""unique alarm per alarm id and entity
+
+Revision ID: 3c5f1e8a2b7d
+Revises: 105601e356f1
+Create Date: 2026-10-18 09:12:44.218304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5f1e8a2b7d'
+down_revision: Union[str, None] = '105601e356f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Concurrent raises of the same alarm could leave several rows of
+    # one alarm id and entity, keep the latest of them
+    op.execute(sa.text(
+        'DELETE FROM alarm WHERE alarm_id IS NOT NULL AND '
+        'entity_instance_id IS NOT NULL AND id NOT IN '
+        '(SELECT id FROM (SELECT MAX(id) AS id FROM alarm '
+        'GROUP BY alarm_id, entity_instance_id) AS latest)'))
+    # fmManager and alarm_create insert or update an alarm with a single
+    # statement that conflicts on this index
+    op.create_index('uix_alarm_alarm_id_entity_instance_id', 'alarm',
+                    ['alarm_id', 'entity_instance_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uix_alarm_alarm_id_entity_instance_id', table_name='alarm')
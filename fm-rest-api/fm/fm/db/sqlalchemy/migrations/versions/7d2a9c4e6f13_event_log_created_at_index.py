@@ -0,0 +1,33 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""event log index by age
+
+Revision ID: 7d2a9c4e6f13
+Revises: 3c5f1e8a2b7d
+Create Date: 2026-10-18 11:37:05.604127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a9c4e6f13'
+down_revision: Union[str, None] = '3c5f1e8a2b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # fmManager trims the oldest event logs in chunks once the table
+    # reaches event_log_max_size
+    op.create_index('ix_event_log_created_at_id', 'event_log',
+                    ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_event_log_created_at_id', table_name='event_log')
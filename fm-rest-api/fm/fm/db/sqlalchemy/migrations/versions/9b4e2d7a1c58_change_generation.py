@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""change generation of alarms and event logs
+
+Revision ID: 9b4e2d7a1c58
+Revises: 7d2a9c4e6f13
+Create Date: 2026-10-18 14:05:31.772419
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e2d7a1c58'
+down_revision: Union[str, None] = '7d2a9c4e6f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The generations bumped by a change to each table. The alarm and event log
+# lists are joined with event_suppression, so it bumps both.
+TRIGGERS = {
+    'alarm': ('alarm',),
+    'event_log': ('event_log',),
+    'event_suppression': ('alarm', 'event_log'),
+}
+
+
+def _trigger_name(table):
+    return '%s_change_generation' % table
+
+
+def upgrade() -> None:
+    change_generation = op.create_table(
+        'change_generation',
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.Column('name', sa.String(255), primary_key=True, nullable=False),
+        sa.Column('generation', sa.BigInteger(), nullable=False,
+                  server_default='0'),
+        mysql_engine='InnoDB',
+        mysql_charset='utf8',
+    )
+    op.bulk_insert(change_generation,
+                   [{'name': 'alarm', 'generation': 0},
+                    {'name': 'event_log', 'generation': 0}])
+
+    # The generations are bumped by triggers, in the transaction of the
+    # change, since fmManager writes the tables directly
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute(sa.text(
+            'CREATE FUNCTION change_generation_bump() RETURNS trigger AS $$ '
+            'BEGIN '
+            'UPDATE change_generation SET generation = generation + 1, '
+            'updated_at = now() WHERE name = ANY (TG_ARGV); '
+            'RETURN NULL; '
+            'END; $$ LANGUAGE plpgsql'))
+        for table, names in TRIGGERS.items():
+            op.execute(sa.text(
+                "CREATE TRIGGER %s AFTER INSERT OR UPDATE OR DELETE OR "
+                "TRUNCATE ON %s FOR EACH STATEMENT EXECUTE PROCEDURE "
+                "change_generation_bump(%s)" %
+                (_trigger_name(table), table,
+                 ', '.join("'%s'" % name for name in names))))
+    else:
+        for table, names in TRIGGERS.items():
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                op.execute(sa.text(
+                    "CREATE TRIGGER %s_%s AFTER %s ON %s FOR EACH ROW "
+                    "BEGIN UPDATE change_generation SET "
+                    "generation = generation + 1, "
+                    "updated_at = CURRENT_TIMESTAMP WHERE name IN (%s); END" %
+                    (_trigger_name(table), event.lower(), event, table,
+                     ', '.join("'%s'" % name for name in names))))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        for table in TRIGGERS:
+            op.execute(sa.text('DROP TRIGGER %s ON %s' %
+                               (_trigger_name(table), table)))
+        op.execute(sa.text('DROP FUNCTION change_generation_bump()'))
+    else:
+        for table in TRIGGERS:
+            for event in ('insert', 'update', 'delete'):
+                op.execute(sa.text('DROP TRIGGER %s_%s' %
+                                   (_trigger_name(table), event)))
+    op.drop_table('change_generation')
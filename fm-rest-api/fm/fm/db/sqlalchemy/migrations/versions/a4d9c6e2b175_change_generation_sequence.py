@@ -0,0 +1,79 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""sequences of the change generations
+
+Revision ID: a4d9c6e2b175
+Revises: f2c7e9b4a816
+Create Date: 2026-10-18 23:42:09.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d9c6e2b175'
+down_revision: Union[str, None] = 'f2c7e9b4a816'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAMES = ('alarm', 'event_log')
+
+
+def _sequence_name(name):
+    return 'change_generation_%s' % name
+
+
+def upgrade() -> None:
+    # The triggers updated the row of the generation in the transaction of
+    # the change, so every writer of the tables waited on that row until
+    # the other ones committed, and writers bumping both rows could
+    # deadlock. A sequence is bumped without any lock, outside of the
+    # transaction. The triggers themselves are kept, they call the function
+    # replaced here.
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    for name in NAMES:
+        sequence = _sequence_name(name)
+        op.execute(sa.text('CREATE SEQUENCE %s' % sequence))
+        # past the generation of the table, so it never goes back
+        op.execute(sa.text(
+            "SELECT setval('%s', (SELECT generation + 1 FROM "
+            "change_generation WHERE name = '%s'))" % (sequence, name)))
+    op.execute(sa.text(
+        'CREATE OR REPLACE FUNCTION change_generation_bump() '
+        'RETURNS trigger AS $$ '
+        'DECLARE name text; '
+        'BEGIN '
+        'FOREACH name IN ARRAY TG_ARGV LOOP '
+        "PERFORM nextval('change_generation_' || name); "
+        'END LOOP; '
+        'RETURN NULL; '
+        'END; $$ LANGUAGE plpgsql'))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    op.execute(sa.text(
+        'CREATE OR REPLACE FUNCTION change_generation_bump() '
+        'RETURNS trigger AS $$ '
+        'BEGIN '
+        'UPDATE change_generation SET generation = generation + 1, '
+        'updated_at = now() WHERE name = ANY (TG_ARGV); '
+        'RETURN NULL; '
+        'END; $$ LANGUAGE plpgsql'))
+    for name in NAMES:
+        sequence = _sequence_name(name)
+        op.execute(sa.text(
+            "UPDATE change_generation SET generation = "
+            "(SELECT last_value FROM %s) WHERE name = '%s'" %
+            (sequence, name)))
+        op.execute(sa.text('DROP SEQUENCE %s' % sequence))
@@ -0,0 +1,48 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""indexes of the fmManager alarm pages
+
+Revision ID: b8e3f1a6d249
+Revises: a4d9c6e2b175
+Create Date: 2026-10-19 00:31:52.160473
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e3f1a6d249'
+down_revision: Union[str, None] = 'a4d9c6e2b175'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # fmManager pages the alarms of an alarm id or of an entity instance id
+    # prefix by entity instance id and alarm id, compared in the "C"
+    # collation as its alarm cache does. Only indexes of that collation
+    # serve the order and the prefix match of those pages.
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    op.create_index('ix_alarm_entity_instance_id_alarm_id_c', 'alarm',
+                    [sa.text('entity_instance_id COLLATE "C"'),
+                     sa.text('alarm_id COLLATE "C"')])
+    op.create_index('ix_alarm_alarm_id_entity_instance_id_c', 'alarm',
+                    ['alarm_id', sa.text('entity_instance_id COLLATE "C"')])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_alarm_alarm_id_entity_instance_id_c',
+                  table_name='alarm')
+    op.drop_index('ix_alarm_entity_instance_id_alarm_id_c',
+                  table_name='alarm')
@@ -0,0 +1,34 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""event log index by timestamp
+
+Revision ID: c3a8f5d2e914
+Revises: 9b4e2d7a1c58
+Create Date: 2026-10-18 16:21:48.390562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a8f5d2e914'
+down_revision: Union[str, None] = '9b4e2d7a1c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The event log is listed by timestamp by default, and its pages
+    # start at the timestamp and id of the last event log of the previous
+    # page
+    op.create_index('ix_event_log_timestamp_id', 'event_log',
+                    ['timestamp', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_event_log_timestamp_id', table_name='event_log')
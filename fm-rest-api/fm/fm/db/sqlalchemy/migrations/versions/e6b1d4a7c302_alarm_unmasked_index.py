@@ -0,0 +1,38 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""index of unmasked alarms
+
+Revision ID: e6b1d4a7c302
+Revises: c3a8f5d2e914
+Create Date: 2026-10-18 18:42:10.583117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b1d4a7c302'
+down_revision: Union[str, None] = 'c3a8f5d2e914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The alarm list and summary leave out masked alarms, and the list is
+    # paged by severity and entity instance id by default. The predicates
+    # are the ones the queries are compiled with for each DB.
+    op.create_index('ix_alarm_unmasked_severity_entity_instance_id', 'alarm',
+                    ['severity', 'entity_instance_id', 'id'],
+                    postgresql_where=sa.text('masked IS NOT TRUE'),
+                    sqlite_where=sa.text('masked IS NOT 1'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_alarm_unmasked_severity_entity_instance_id',
+                  table_name='alarm')
@@ -0,0 +1,72 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""indexes of the entity instance id matches
+
+Revision ID: f2c7e9b4a816
+Revises: e6b1d4a7c302
+Create Date: 2026-10-18 21:16:47.305928
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from oslo_log import log
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7e9b4a816'
+down_revision: Union[str, None] = 'e6b1d4a7c302'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOG = log.getLogger(__name__)
+
+TABLES = ('alarm', 'event_log')
+
+
+def upgrade() -> None:
+    # The alarm and event log lists match the entity instance id on its
+    # beginning. The indexes of the column serve the LIKE of the match in
+    # the other DBs, but only an index with varchar_pattern_ops does in
+    # PostgreSQL, unless the DB has the C collation.
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.create_index('ix_%s_entity_instance_id_pattern' % table, table,
+                        ['entity_instance_id'],
+                        postgresql_ops={
+                            'entity_instance_id': 'varchar_pattern_ops'})
+
+    # A trigram index serves the matches on any part of the entity instance
+    # id. It is left out when the DB user may not create the pg_trgm
+    # extension, since those matches are only asked for explicitly.
+    savepoint = bind.begin_nested()
+    try:
+        op.execute(sa.text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    except sa.exc.DBAPIError as e:
+        savepoint.rollback()
+        LOG.warning("No trigram index of entity_instance_id: %s" % e)
+        return
+    savepoint.commit()
+    for table in TABLES:
+        op.create_index('ix_%s_entity_instance_id_trgm' % table, table,
+                        ['entity_instance_id'],
+                        postgresql_using='gin',
+                        postgresql_ops={
+                            'entity_instance_id': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.execute(sa.text('DROP INDEX IF EXISTS ix_%s_entity_instance_id_trgm'
+                           % table))
+        op.drop_index('ix_%s_entity_instance_id_pattern' % table,
+                      table_name=table)
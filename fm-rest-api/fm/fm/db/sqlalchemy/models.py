@@ -15,7 +15,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 #
-# Copyright (c) 2018 Wind River Systems, Inc.
+# Copyright (c) 2018, 2026 Wind River Systems, Inc.
 #
 # SPDX-License-Identifier: Apache-2.0
 #
@@ -25,9 +25,11 @@ import json
 from six.moves.urllib.parse import urlparse
 from oslo_config import cfg
 
-from sqlalchemy import Column, ForeignKey, Integer, Boolean
+from sqlalchemy import Column, ForeignKey, Integer, BigInteger, Boolean
 from sqlalchemy import String
 from sqlalchemy import DateTime
+from sqlalchemy import Index
+from sqlalchemy import text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.types import TypeDecorator, VARCHAR
 from oslo_db.sqlalchemy import models
@@ -89,6 +91,14 @@ Base = declarative_base(cls=FmBase)
 
 class Alarm(Base):
     __tablename__ = 'alarm'
+    __table_args__ = (
+        Index('uix_alarm_alarm_id_entity_instance_id',
+              'alarm_id', 'entity_instance_id', unique=True),
+        Index('ix_alarm_unmasked_severity_entity_instance_id',
+              'severity', 'entity_instance_id', 'id',
+              postgresql_where=text('masked IS NOT TRUE'),
+              sqlite_where=text('masked IS NOT 1')),
+    )
 
     id = Column(Integer, primary_key=True, nullable=False)
     uuid = Column(String(255), unique=True, index=True)
@@ -115,6 +125,10 @@ class Alarm(Base):
 
 class EventLog(Base):
     __tablename__ = 'event_log'
+    __table_args__ = (
+        Index('ix_event_log_created_at_id', 'created_at', 'id'),
+        Index('ix_event_log_timestamp_id', 'timestamp', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, nullable=False)
     uuid = Column(String(255), unique=True, index=True)
@@ -148,3 +162,10 @@ class EventSuppression(Base):
     set_for_deletion = Column('set_for_deletion', Boolean)
     mgmt_affecting = Column('mgmt_affecting', String(255))
     degrade_affecting = Column('degrade_affecting', String(255))
+
+
+class ChangeGeneration(Base):
+    __tablename__ = 'change_generation'
+
+    name = Column(String(255), primary_key=True, nullable=False)
+    generation = Column(BigInteger, nullable=False, default=0)
@@ -23,6 +23,7 @@ from oslo_config import cfg
 import pecan
 import pecan.testing
 
+from fm.api import hooks
 from fm.tests import base
 from fm.common import context as fm_context
 
@@ -50,6 +51,7 @@ class FunctionalTest(base.TestCase):
             'app': {
                 'root': 'fm.api.controllers.root.RootController',
                 'modules': ['fm.api'],
+                'hooks': [hooks.DBHook()],
                 'enable_acl': False
             },
         }
@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from fm.common import constants as fm_constants
+from fm.db.sqlalchemy import api as db_api
+from fm.db.sqlalchemy import models
+from fm.tests.api import base
+from fm.tests.db import utils
+
+SUPPRESSED_ALARM_ID = '200.001'
+
+
+class TestListAlarms(base.FunctionalTest):
+
+    def setUp(self):
+        super(TestListAlarms, self).setUp()
+        # The alarm list compares the severity of the alarms with these
+        utils.create_test_event_suppression(mgmt_affecting='warning',
+                                            degrade_affecting='critical')
+        utils.create_test_event_suppression(
+            alarm_id=SUPPRESSED_ALARM_ID,
+            suppression_status=fm_constants.FM_SUPPRESSED,
+            mgmt_affecting='warning', degrade_affecting='critical')
+        self.addCleanup(self._delete_all)
+
+        self.unsuppressed = set()
+        for index in range(4):
+            alarm = utils.create_test_alarm(
+                entity_instance_id='host=controller-%d' % index)
+            self.unsuppressed.add(alarm.uuid)
+            utils.create_test_alarm(
+                alarm_id=SUPPRESSED_ALARM_ID,
+                entity_instance_id='host=controller-%d' % index)
+
+    def _delete_all(self):
+        with db_api._session_for_write() as session:
+            for model in (models.Alarm, models.EventSuppression):
+                session.query(model).delete()
+
+    def _get_all_pages(self, path):
+        uuids = []
+        response = self.get_json(path)
+        while True:
+            uuids.extend(alarm['uuid'] for alarm in response['alarms'])
+            if not response.get('next'):
+                return uuids
+            # The next link is followed as given, with its host
+            response = self.app.get(response['next'],
+                                    headers={'Accept': 'application/json'}
+                                    ).json
+
+    def test_pages_leave_out_suppressed(self):
+        uuids = self._get_all_pages('/alarms?limit=2')
+        self.assertEqual(len(self.unsuppressed), len(uuids))
+        self.assertEqual(self.unsuppressed, set(uuids))
+
+    def test_pages_include_suppressed(self):
+        uuids = self._get_all_pages('/alarms?limit=2&include_suppress=True')
+        self.assertEqual(8, len(set(uuids)))
+        self.assertTrue(self.unsuppressed < set(uuids))
+
+    def test_next_link_without_include_suppress(self):
+        response = self.get_json('/alarms?limit=2')
+        # wsme takes any include_suppress value given for True
+        self.assertNotIn('include_suppress', response['next'])
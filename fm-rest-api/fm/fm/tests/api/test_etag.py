@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from fm.db.sqlalchemy import api as db_api
+from fm.db.sqlalchemy import models
+from fm.tests.api import base
+from fm.tests.db import utils
+
+
+class TestETag(base.FunctionalTest):
+
+    def setUp(self):
+        super(TestETag, self).setUp()
+        # The alarm list compares the severity of the alarms with these
+        utils.create_test_event_suppression(mgmt_affecting='warning',
+                                            degrade_affecting='critical')
+        self.addCleanup(self._delete_all)
+
+    def _delete_all(self):
+        with db_api._session_for_write() as session:
+            for model in (models.Alarm, models.EventLog,
+                          models.EventSuppression):
+                session.query(model).delete()
+
+    def _get(self, path, etag=None, status=200):
+        headers = {'Accept': 'application/json'}
+        if etag:
+            headers['If-None-Match'] = etag
+        return self.app.get(base.PATH_PREFIX + path, headers=headers,
+                            status=status)
+
+    def test_alarms_not_modified(self):
+        response = self._get('/alarms')
+        etag = response.etag
+        self.assertTrue(etag)
+        self.assertEqual([], response.json['alarms'])
+
+        response = self._get('/alarms', etag=etag, status=304)
+        self.assertEqual(etag, response.etag)
+        self.assertEqual(b'', response.body)
+
+        # The ETag is that of the request, not only of the alarms
+        response = self._get('/alarms?limit=1', etag=etag)
+        self.assertNotEqual(etag, response.etag)
+
+        utils.create_test_alarm()
+        response = self._get('/alarms', etag=etag)
+        self.assertNotEqual(etag, response.etag)
+        self.assertEqual(1, len(response.json['alarms']))
+        self._get('/alarms', etag=response.etag, status=304)
+
+    def test_event_log_not_modified(self):
+        response = self._get('/event_log')
+        etag = response.etag
+        self.assertTrue(etag)
+        self._get('/event_log', etag=etag, status=304)
+
+        utils.create_test_event_log()
+        response = self._get('/event_log', etag=etag)
+        self.assertNotEqual(etag, response.etag)
+        self.assertEqual(1, len(response.json['event_log']))
+
+    def test_other_resources_without_etag(self):
+        response = self.app.get(base.PATH_PREFIX + '/')
+        self.assertIsNone(response.etag)
@@ -19,6 +19,8 @@
 from oslo_config import cfg
 from oslo_config import fixture as config_fixture
 
+from fm.api import config
+
 CONF = cfg.CONF
 
 
@@ -32,4 +34,8 @@ class ConfFixture(config_fixture.Config):
         super(ConfFixture, self).setUp()
 
         self.conf.set_default('connection', "sqlite://", group='database')
+        self.register_opts(config.fm_opts)
+        # The collection controllers read the page size limit of the api
+        # options, which fm.cmd.api registers on start
+        self.register_opt(cfg.IntOpt('limit_max', default=2000), group='api')
         self.addCleanup(self.conf.reset)
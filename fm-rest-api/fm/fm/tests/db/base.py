@@ -19,6 +19,8 @@ import abc
 import six
 
 from fm.common import context
+from fm.db.sqlalchemy import api as db_api
+from fm.db.sqlalchemy import models
 from fm.tests import base
 
 INIT_VERSION = 0
@@ -30,3 +32,11 @@ class DbTestCase(base.TestCase):
     def setUp(self):
         super(DbTestCase, self).setUp()
         self.admin_context = context.make_context(is_admin=True)
+        # The in-memory DB is shared by the tests
+        self.addCleanup(self._delete_all)
+
+    def _delete_all(self):
+        with db_api._session_for_write() as session:
+            for model in (models.Alarm, models.EventLog,
+                          models.EventSuppression):
+                session.query(model).delete()
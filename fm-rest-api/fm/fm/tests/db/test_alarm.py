@@ -6,7 +6,16 @@
 
 """Tests for Alarm via the DB API"""
 
+import fixtures
+import mock
+
+from fm_api import constants
+
+from fm.common import constants as fm_constants
+from fm.common import exceptions
 from fm.db import api as dbapi
+from fm.db.sqlalchemy import api as sqlalchemy_api
+from fm.db.sqlalchemy import models
 from fm.tests.db import base
 from fm.tests.db import utils
 
@@ -22,3 +31,193 @@ class DbAlarmTestCase(base.DbTestCase):
         alarm = utils.get_test_alarm(uuid=uuid)
         alarm_exist = self.dbapi.alarm_create(alarm)
         self.assertEqual(uuid, alarm_exist.uuid)
+
+    def test_create_alarm_existing(self):
+        alarm = utils.get_test_alarm(uuid='1234567')
+        first = self.dbapi.alarm_create(alarm)
+        alarm = utils.get_test_alarm(
+            uuid='7654321', severity=constants.FM_ALARM_SEVERITY_MAJOR)
+        second = self.dbapi.alarm_create(alarm)
+        # The alarm raised again against the same entity updates its row
+        self.assertEqual(first.id, second.id)
+        self.assertEqual('7654321', second.uuid)
+        self.assertEqual(first.created_at, second.created_at)
+
+    def test_alarm_get_summary(self):
+        suppressed_id = constants.FM_ALARM_ID_VM_REBOOTING
+        utils.create_test_event_suppression()
+        utils.create_test_event_suppression(
+            alarm_id=suppressed_id,
+            suppression_status=fm_constants.FM_SUPPRESSED)
+        for index, severity in enumerate((
+                constants.FM_ALARM_SEVERITY_CRITICAL,
+                constants.FM_ALARM_SEVERITY_MAJOR,
+                constants.FM_ALARM_SEVERITY_MAJOR)):
+            utils.create_test_alarm(entity_instance_id='host=%d' % index,
+                                    severity=severity)
+        alarm = utils.get_test_alarm(entity_instance_id='host=masked',
+                                     severity=constants.FM_ALARM_SEVERITY_MINOR)
+        alarm['masked'] = True
+        self.dbapi.alarm_create(alarm)
+        utils.create_test_alarm(alarm_id=suppressed_id,
+                                severity=constants.FM_ALARM_SEVERITY_MINOR)
+
+        summary = self.dbapi.alarm_get_summary()
+        self.assertEqual({constants.FM_ALARM_SEVERITY_CRITICAL: 1,
+                          constants.FM_ALARM_SEVERITY_MAJOR: 2}, summary)
+        summary = self.dbapi.alarm_get_summary(include_suppress=True)
+        self.assertEqual({constants.FM_ALARM_SEVERITY_CRITICAL: 1,
+                          constants.FM_ALARM_SEVERITY_MAJOR: 2,
+                          constants.FM_ALARM_SEVERITY_MINOR: 1}, summary)
+
+    def test_change_generation(self):
+        alarm_generation = self.dbapi.change_generation_get('alarm')
+        event_log_generation = self.dbapi.change_generation_get('event_log')
+        self.assertIsNone(self.dbapi.change_generation_get('unknown'))
+
+        alarm = utils.create_test_alarm()
+        self.assertGreater(self.dbapi.change_generation_get('alarm'),
+                           alarm_generation)
+        self.assertEqual(event_log_generation,
+                         self.dbapi.change_generation_get('event_log'))
+
+        alarm_generation = self.dbapi.change_generation_get('alarm')
+        self.dbapi.alarm_destroy(alarm.uuid)
+        self.assertGreater(self.dbapi.change_generation_get('alarm'),
+                           alarm_generation)
+
+        # Both the alarms and the event logs are read with their suppression
+        alarm_generation = self.dbapi.change_generation_get('alarm')
+        utils.create_test_event_suppression(
+            alarm_id=constants.FM_ALARM_ID_FS_USAGE)
+        self.assertGreater(self.dbapi.change_generation_get('alarm'),
+                           alarm_generation)
+        self.assertGreater(self.dbapi.change_generation_get('event_log'),
+                           event_log_generation)
+
+    @mock.patch.object(sqlalchemy_api.time, 'monotonic')
+    def test_settled_generation(self, monotonic):
+        # A generation read from a sequence is only returned once no writer
+        # may still be about to commit the change that bumped it
+        self.useFixture(fixtures.MockPatchObject(
+            sqlalchemy_api, '_generations_seen', {}))
+        monotonic.return_value = 100
+        self.assertIsNone(sqlalchemy_api._settled_generation('alarm', 7))
+        monotonic.return_value = 100 + sqlalchemy_api.GENERATION_SETTLE_TIME
+        self.assertEqual(7, sqlalchemy_api._settled_generation('alarm', 7))
+        self.assertIsNone(sqlalchemy_api._settled_generation('event_log', 7))
+
+        self.assertIsNone(sqlalchemy_api._settled_generation('alarm', 8))
+        monotonic.return_value += 1
+        self.assertIsNone(sqlalchemy_api._settled_generation('alarm', 8))
+
+    def test_alarm_get_all_pages(self):
+        utils.create_test_event_suppression()
+        alarms = []
+        for index in range(5):
+            severity = (constants.FM_ALARM_SEVERITY_MAJOR if index % 2 else
+                        constants.FM_ALARM_SEVERITY_CRITICAL)
+            alarms.append(utils.create_test_alarm(
+                entity_instance_id='host=pages-%d' % index,
+                severity=severity))
+        # By severity, then entity instance id
+        expected = [alarms[index].uuid for index in (0, 2, 4, 1, 3)]
+
+        pages = []
+        marker = None
+        while True:
+            page = self.dbapi.alarm_get_all(entity_instance_id='host=pages',
+                                            limit=2, marker=marker)
+            pages.append([alarm.uuid for alarm in page])
+            if len(page) < 2:
+                break
+            marker = self.dbapi.alarm_get_marker(page[-1])
+        self.assertEqual([expected[0:2], expected[2:4], expected[4:]], pages)
+
+        page = self.dbapi.alarm_get_all(entity_instance_id='host=pages',
+                                        sort_key='id', sort_dir='desc',
+                                        marker=alarms[3].uuid)
+        self.assertEqual([alarms[2].uuid, alarms[1].uuid, alarms[0].uuid],
+                         [alarm.uuid for alarm in page])
+
+    def test_alarm_get_all_pages_masked(self):
+        utils.create_test_event_suppression()
+        unmasked = []
+        for index in range(12):
+            alarm = utils.get_test_alarm(
+                entity_instance_id='host=masked-%02d' % index)
+            # Most of the alarms are masked
+            alarm['masked'] = index % 4 != 0
+            alarm = self.dbapi.alarm_create(alarm)
+            if not alarm.masked:
+                unmasked.append(alarm.uuid)
+
+        pages = []
+        marker = None
+        while True:
+            page = self.dbapi.alarm_get_all(limit=2, marker=marker)
+            pages.append([alarm.uuid for alarm in page])
+            if len(page) < 2:
+                break
+            marker = self.dbapi.alarm_get_marker(page[-1])
+        # Every page is full until the last one
+        self.assertEqual([unmasked[0:2], unmasked[2:]], pages)
+
+        masked = self.dbapi.alarm_get_all(include_masked=True)
+        self.assertEqual(12, len(masked))
+        self.assertRaises(exceptions.AlarmNotFound, self.dbapi.alarm_get,
+                          masked[1].uuid)
+        alarm = self.dbapi.alarm_get(masked[1].uuid, include_masked=True)
+        self.assertTrue(alarm.masked)
+
+    def test_alarm_get_all_match(self):
+        utils.create_test_event_suppression()
+        for entity_instance_id in ('host=match-0', 'host=match-0.port=eth0',
+                                   'host=match-10', 'host=nomatch-0'):
+            utils.create_test_alarm(entity_instance_id=entity_instance_id)
+
+        def get_entity_instance_ids(value, **kwargs):
+            return sorted(alarm.entity_instance_id for alarm in
+                          self.dbapi.alarm_get_all(entity_instance_id=value,
+                                                   **kwargs))
+
+        # The entity instance id matches the entity and the ones under it
+        self.assertEqual(['host=match-0', 'host=match-0.port=eth0'],
+                         get_entity_instance_ids('host=match-0'))
+        self.assertEqual(['host=match-0'], get_entity_instance_ids(
+            'host=match-0', match={'entity_instance_id': 'eq'}))
+        self.assertEqual(['host=match-0', 'host=match-0.port=eth0',
+                          'host=nomatch-0'],
+                         get_entity_instance_ids(
+                             'match-0',
+                             match={'entity_instance_id': 'contains'}))
+        # The wildcards of LIKE are matched as they are
+        self.assertEqual([], get_entity_instance_ids(
+            'host=%-0', match={'entity_instance_id': 'contains'}))
+        self.assertEqual([], get_entity_instance_ids('host=match_0'))
+
+        # The other filters match the whole value by default
+        self.assertEqual([], self.dbapi.alarm_get_all(
+            alarm_id=constants.FM_ALARM_ID_VM_FAILED[:3]))
+        self.assertEqual(4, len(self.dbapi.alarm_get_all(
+            alarm_id=constants.FM_ALARM_ID_VM_FAILED[:3],
+            match={'alarm_id': 'prefix'})))
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          self.dbapi.alarm_get_all, alarm_id='700',
+                          match={'alarm_id': 'like'})
+
+    def test_alarm_match_query_plan(self):
+        for field in ('alarm_id', 'entity_instance_id', 'severity'):
+            for mode in ('eq', 'prefix', 'contains'):
+                with sqlalchemy_api._session_for_read() as session:
+                    query = sqlalchemy_api._add_match_filter(
+                        sqlalchemy_api.model_query(models.Alarm,
+                                                   session=session),
+                        models.Alarm, field, 'value', {field: mode})
+                    plan = ' '.join(utils.get_query_plan(query))
+                if mode == 'contains':
+                    self.assertIn('SCAN alarm', plan)
+                else:
+                    # The match is served by an index of the field
+                    self.assertRegex(plan, r'SEARCH alarm USING '
+                                     r'(COVERING )?INDEX \w+ \(%s[=>]' % field)
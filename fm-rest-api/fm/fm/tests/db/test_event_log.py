@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+
+"""Tests for Event Log via the DB API"""
+
+import datetime
+
+from fm.common import exceptions
+from fm.db import api as dbapi
+from fm.db.sqlalchemy import api as sqlalchemy_api
+from fm.db.sqlalchemy import models
+from fm.tests.db import base
+from fm.tests.db import utils
+
+
+class DbEventLogTestCase(base.DbTestCase):
+
+    def setUp(self):
+        super(DbEventLogTestCase, self).setUp()
+        self.dbapi = dbapi.get_instance()
+
+    def _create_event_logs(self, entity_instance_id, count):
+        start = datetime.datetime(2026, 1, 1)
+        event_logs = []
+        for index in range(count):
+            # Pairs of event logs share a timestamp, so that they are
+            # ordered by id
+            timestamp = start + datetime.timedelta(seconds=index // 2)
+            event_logs.append(utils.create_test_event_log(
+                entity_instance_id=entity_instance_id, timestamp=timestamp))
+        return event_logs
+
+    def _get_pages(self, limit, **kwargs):
+        pages = []
+        marker = None
+        while True:
+            page = self.dbapi.event_log_get_all(limit=limit, marker=marker,
+                                                **kwargs)
+            pages.append([event_log.uuid for event_log in page])
+            if len(page) < limit:
+                return pages
+            marker = self.dbapi.event_log_get_marker(
+                page[-1], kwargs.get('sort_key'))
+
+    def test_event_log_get_all_pages(self):
+        event_logs = self._create_event_logs('host=pages', 7)
+        # Another entity's event logs are filtered out of the pages
+        self._create_event_logs('host=other', 2)
+
+        pages = self._get_pages(3, entity_instance_id='host=pages')
+        expected = [event_log.uuid for event_log in reversed(event_logs)]
+        self.assertEqual([expected[0:3], expected[3:6], expected[6:]], pages)
+
+        pages = self._get_pages(4, entity_instance_id='host=pages',
+                                sort_key='timestamp', sort_dir='asc')
+        expected.reverse()
+        self.assertEqual([expected[0:4], expected[4:]], pages)
+
+    def test_event_log_get_all_pages_null_timestamp(self):
+        event_logs = self._create_event_logs('host=null', 3)
+        event_logs.extend(utils.create_test_event_log(
+            entity_instance_id='host=null') for index in range(3))
+
+        for sort_dir in ('asc', 'desc'):
+            uuids = [event_log.uuid for event_log in
+                     self.dbapi.event_log_get_all(
+                         entity_instance_id='host=null', sort_dir=sort_dir)]
+            self.assertEqual(sorted(event_log.uuid
+                                    for event_log in event_logs),
+                             sorted(uuids))
+            for limit in (1, 2, 4):
+                pages = self._get_pages(limit, entity_instance_id='host=null',
+                                        sort_dir=sort_dir)
+                self.assertEqual(uuids, sum(pages, []))
+
+    def test_event_log_get_all_uuid_marker(self):
+        event_logs = self._create_event_logs('host=uuid', 4)
+
+        page = self.dbapi.event_log_get_all(entity_instance_id='host=uuid',
+                                            marker=event_logs[2].uuid)
+        self.assertEqual([event_logs[1].uuid, event_logs[0].uuid],
+                         [event_log.uuid for event_log in page])
+
+    def test_event_log_get_all_invalid_marker(self):
+        event_log = self._create_event_logs('host=invalid', 1)[0]
+        marker = self.dbapi.event_log_get_marker(event_log)
+
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          self.dbapi.event_log_get_all, marker='invalid')
+        # A marker is only valid for the order it was made for
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          self.dbapi.event_log_get_all, marker=marker,
+                          sort_key='severity')
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          self.dbapi.event_log_get_all, sort_key='unknown')
+
+    def test_event_log_get_all_match(self):
+        for entity_instance_id in ('host=match-0', 'host=match-0.port=eth0',
+                                   'host=nomatch-0'):
+            utils.create_test_event_log(entity_instance_id=entity_instance_id)
+
+        def get_entity_instance_ids(value, **kwargs):
+            return sorted(event_log.entity_instance_id for event_log in
+                          self.dbapi.event_log_get_all(
+                              entity_instance_id=value, **kwargs))
+
+        self.assertEqual(['host=match-0', 'host=match-0.port=eth0'],
+                         get_entity_instance_ids('host=match-0'))
+        self.assertEqual(['host=match-0'], get_entity_instance_ids(
+            'host=match-0', match={'entity_instance_id': 'eq'}))
+        self.assertEqual(['host=match-0', 'host=match-0.port=eth0',
+                          'host=nomatch-0'],
+                         get_entity_instance_ids(
+                             'match-0',
+                             match={'entity_instance_id': 'contains'}))
+
+    def test_event_log_match_query_plan(self):
+        for field in ('event_log_id', 'entity_instance_id', 'event_log_type'):
+            for mode in ('eq', 'prefix', 'contains'):
+                with sqlalchemy_api._session_for_read() as session:
+                    query = sqlalchemy_api._add_match_filter(
+                        sqlalchemy_api.model_query(models.EventLog,
+                                                   session=session),
+                        models.EventLog, field, 'value', {field: mode})
+                    plan = ' '.join(utils.get_query_plan(query))
+                if mode == 'contains':
+                    self.assertIn('SCAN event_log', plan)
+                else:
+                    # The match is served by an index of the field
+                    self.assertRegex(plan, r'SEARCH event_log USING '
+                                     r'(COVERING )?INDEX \w+ \(%s[=>]' % field)
@@ -16,7 +16,10 @@
 
 """Fault test utilities."""
 
+from fm.common import constants as fm_constants
 from fm.db import api as db_api
+from fm.db.sqlalchemy import api as db_sqlalchemy_api
+from fm.db.sqlalchemy import models
 from fm_api import constants
 
 
@@ -50,3 +53,62 @@ def create_test_alarm(**kw):
     # Let DB generate ID if it isn't specified explicitly
     dbapi = db_api.get_instance()
     return dbapi.alarm_create(alarm)
+
+
+def create_test_event_suppression(**kw):
+    """Create test event suppression entry in DB and return its DB object.
+    :param kw: kwargs with overriding values for its attributes.
+    :returns: Test event suppression DB object.
+    """
+    event_suppression = models.EventSuppression(
+        alarm_id=kw.get('alarm_id', constants.FM_ALARM_ID_VM_FAILED),
+        description=kw.get('description', "Unknown"),
+        suppression_status=kw.get('suppression_status',
+                                  fm_constants.FM_UNSUPPRESSED),
+        set_for_deletion=False,
+        mgmt_affecting=kw.get('mgmt_affecting', 'warning'),
+        degrade_affecting=kw.get('degrade_affecting', 'True'))
+    with db_sqlalchemy_api._session_for_write() as session:
+        session.add(event_suppression)
+    return event_suppression
+
+
+def get_test_event_log(**kw):
+    event_log = {
+        'uuid': kw.get('uuid'),
+        'event_log_id': kw.get('event_log_id', constants.FM_ALARM_ID_VM_FAILED),
+        'state': kw.get('state', constants.FM_ALARM_STATE_LOG),
+        'entity_type_id': kw.get('entity_type_id', constants.FM_ENTITY_TYPE_INSTANCE),
+        'entity_instance_id': kw.get('entity_instance_id',
+                                     constants.FM_ENTITY_TYPE_INSTANCE + '=' +
+                                     'a4e4cdb7-2ee6-4818-84c8-5310fcd67b5d'),
+        'timestamp': kw.get('timestamp'),
+        'severity': kw.get('severity', constants.FM_ALARM_SEVERITY_CRITICAL),
+        'reason_text': kw.get('reason_text', "Unknown"),
+        'event_log_type': kw.get('event_log_type', constants.FM_ALARM_TYPE_5),
+        'probable_cause': kw.get('probable_cause', constants.ALARM_PROBABLE_CAUSE_8),
+        'proposed_repair_action': None,
+        'service_affecting': False,
+        'suppression': False
+    }
+    return event_log
+
+
+def create_test_event_log(**kw):
+    """Create test event log entry in DB and return its DB object.
+    :param kw: kwargs with overriding values for event log's attributes.
+    :returns: Test event log DB object.
+    """
+    event_log = get_test_event_log(**kw)
+    dbapi = db_api.get_instance()
+    return dbapi.event_log_create(event_log)
+
+
+def get_query_plan(query):
+    """Return the plan of an SQLite query, as one line per step."""
+    engine = db_sqlalchemy_api.get_engine()
+    statement = query.statement.compile(
+        dialect=engine.dialect, compile_kwargs={'literal_binds': True})
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN %s' % statement)
+        return [row[-1] for row in rows]